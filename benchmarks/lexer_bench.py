@@ -0,0 +1,62 @@
+"""
+Lexer benchmark.
+
+Compares the table-driven Lexer with the character-at-a-time LegacyLexer on a
+large input built by repeating the example programs.
+
+Usage:
+    python -m benchmarks.lexer_bench [--lines N] [--repeat R]
+"""
+import argparse
+import glob
+import os
+import time
+
+from src.lexer import Lexer
+from src.legacy_lexer import LegacyLexer
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "src", "examples")
+
+def build_source(lines: int) -> str:
+    """Build a source text of at least `lines` lines out of the example programs."""
+    chunks = []
+    for path in sorted(glob.glob(os.path.join(EXAMPLES_DIR, "*.lunf"))):
+        with open(path, "r", encoding="utf-8") as f:
+            chunks.append(f.read().rstrip("\n") + "\n")
+    sample = "".join(chunks)
+    sample_lines = sample.count("\n")
+    return sample * (lines // sample_lines + 1)
+
+def best_time(lexer_cls, source: str, repeat: int) -> tuple:
+    """Lex `source` `repeat` times and return the best wall time and the token count."""
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens, error = lexer_cls("<bench>", source).make_tokens()
+        elapsed = time.perf_counter() - start
+        if error:
+            raise RuntimeError(error.as_string())
+        best = min(best, elapsed)
+        count = len(tokens)
+    return best, count
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Lunfardo lexers.")
+    parser.add_argument("--lines", type=int, default=50_000, help="Approximate number of source lines.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs per lexer (best is reported).")
+    args = parser.parse_args()
+
+    source = build_source(args.lines)
+    print(f"Fuente: {source.count(chr(10))} lineas, {len(source)} caracteres")
+
+    results = {}
+    for lexer_cls in (LegacyLexer, Lexer):
+        elapsed, count = best_time(lexer_cls, source, args.repeat)
+        results[lexer_cls.__name__] = elapsed
+        print(f"{lexer_cls.__name__:<12} {elapsed * 1000:9.1f} ms  {count / elapsed:12,.0f} tokens/s")
+
+    print(f"Aceleracion: {results['LegacyLexer'] / results['Lexer']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Benchmark suite.
+
+Runs a set of representative Lunfardo workloads and measures, for each one,
+the time spent lexing, parsing and executing it (best of several runs) and
+the peak memory allocated while doing all three. The results can be saved as
+JSON and compared against a previous run, failing when a measure got slower
+(or bigger) than a threshold.
+
+The workloads are the programs in `benchmarks/workloads`, plus a chain of
+modules that import each other (written to a temporary directory) and a large
+source built from the examples, which is only lexed and parsed.
+
+Usage:
+    python -m benchmarks.suite [--repeat R] [--only NAME ...] [--output results.json]
+                               [--baseline baseline.json] [--threshold 0.1]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.lexer import Lexer
+from src.lunfardo_parser import Parser
+from src.lunfardo import Lunfardo
+from src.context import Context
+from src.interpreter import Interpreter
+from benchmarks.lexer_bench import build_source
+
+WORKLOADS_DIR = os.path.join(os.path.dirname(__file__), "workloads")
+METRICS = ("lex", "parse", "execute", "peak_memory")
+
+class Workload:
+    """A Lunfardo program to benchmark."""
+
+    __slots__ = ("name", "fn", "text", "cwd", "execute")
+
+    def __init__(self, name: str, fn: str, text: str, cwd: str, execute: bool = True) -> None:
+        """
+        Initialize a Workload.
+
+        Args:
+            name (str): The name the results are stored under.
+            fn (str): The filename of the program.
+            text (str): The source of the program.
+            cwd (str): The directory its imports are relative to.
+            execute (bool, optional): Whether to run the program, or only lex and parse it.
+        """
+        self.name = name
+        self.fn = fn
+        self.text = text
+        self.cwd = cwd
+        self.execute = execute
+
+def write_import_chain(directory: str, depth: int) -> str:
+    """
+    Write a chain of `depth` modules, each one importing the next, and a
+    program that imports the first one.
+
+    Returns:
+        str: The path of the program.
+    """
+    for i in range(depth):
+        lines = [f"importar modulo_{i + 1}\n\n"] if i + 1 < depth else []
+        lines.append(f"laburo valor_{i}(x)\n    devolver x + {i}\nchau\n")
+        with open(os.path.join(directory, f"modulo_{i}.lunf"), "w", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    path = os.path.join(directory, "importes.lunf")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("importar modulo_0\n\nvalor_0(1)\n")
+    return path
+
+def load_workloads(tmp_dir: str, import_depth: int = 30, source_lines: int = 20_000) -> list:
+    """Build the list of workloads, writing the generated ones to `tmp_dir`."""
+    workloads = []
+    for path in sorted(glob.glob(os.path.join(WORKLOADS_DIR, "*.lunf"))):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        name = os.path.splitext(os.path.basename(path))[0]
+        workloads.append(Workload(name, path, text, WORKLOADS_DIR))
+
+    path = write_import_chain(tmp_dir, import_depth)
+    with open(path, "r", encoding="utf-8") as f:
+        workloads.append(Workload("importes", path, f.read(), tmp_dir))
+
+    workloads.append(Workload("fuente_grande", "<fuente_grande>", build_source(source_lines), tmp_dir, execute=False))
+    return workloads
+
+def lex(workload: Workload) -> list:
+    tokens, error = Lexer(workload.fn, workload.text).make_tokens()
+    if error:
+        raise RuntimeError(error.as_string())
+    return tokens
+
+def parse(tokens: list):
+    ast, _ = Parser(tokens).parse()
+    if ast.error:
+        raise RuntimeError(ast.error.as_string())
+    return ast.node
+
+def execute(workload: Workload, node) -> None:
+    """Run a parsed workload in a fresh global environment, discarding what it prints."""
+    lunfardo = Lunfardo()
+    context = Context(workload.fn, cwd=workload.cwd)
+    context.symbol_table = lunfardo.global_symbol_table
+    context.modules = lunfardo.modules
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = Interpreter().visit(node, context)
+    if result.error:
+        raise RuntimeError(result.error.as_string())
+
+def best_time(func, *args, repeat: int) -> float:
+    """Call `func(*args)` `repeat` times and return the best wall time."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def measure(workload: Workload, repeat: int = 3) -> dict:
+    """
+    Measure a workload.
+
+    Returns:
+        dict: The best lex, parse and execute times, in seconds (execute is None
+            for workloads that are not run), and the peak memory of one full
+            run, in bytes.
+    """
+    tokens = lex(workload)
+    node = parse(tokens)
+    result = {
+        "lex": best_time(lex, workload, repeat=repeat),
+        "parse": best_time(parse, tokens, repeat=repeat),
+        "execute": best_time(execute, workload, node, repeat=repeat) if workload.execute else None,
+    }
+
+    # Tracing allocations slows everything down, so memory is measured on its own run.
+    tracemalloc.start()
+    try:
+        node = parse(lex(workload))
+        if workload.execute:
+            execute(workload, node)
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return result
+
+def compare(results: dict, baseline: dict, threshold: float, min_time: float) -> list:
+    """
+    Compare results against a baseline.
+
+    Args:
+        results (dict): The results, as saved by this suite.
+        baseline (dict): The baseline, in the same format.
+        threshold (float): The relative increase that counts as a regression (0.1 is 10%).
+        min_time (float): Times below this, in seconds, are too noisy to compare.
+
+    Returns:
+        list: A (workload, metric, baseline, new, change, regressed) tuple for
+            every measure found in both.
+    """
+    rows = []
+    for name, measures in results["workloads"].items():
+        base_measures = baseline.get("workloads", {}).get(name)
+        if base_measures is None:
+            continue
+
+        for metric in METRICS:
+            old, new = base_measures.get(metric), measures.get(metric)
+            if not old or new is None:
+                continue
+            if metric != "peak_memory" and old < min_time and new < min_time:
+                continue
+
+            change = new / old - 1
+            rows.append((name, metric, old, new, change, change > threshold))
+
+    return rows
+
+def format_measure(metric: str, value) -> str:
+    if value is None:
+        return "-"
+    if metric == "peak_memory":
+        return f"{value / 1024:.0f} KiB"
+    return f"{value * 1000:.2f} ms"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Lunfardo lexer, parser and interpreter.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs per measure (best is reported).")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="Only run these workloads.")
+    parser.add_argument("--output", metavar="PATH", help="Save the results as JSON.")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against the results of a previous run.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative increase counted as a regression (default: 0.10).")
+    parser.add_argument("--min-time", type=float, default=0.005, help="Seconds below which times are not compared (default: 0.005).")
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(12025)
+
+    results = {
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "workloads": {},
+    }
+
+    print(f"{'workload':<16} {'lex':>11} {'parse':>11} {'execute':>11} {'peak':>11}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for workload in load_workloads(tmp_dir):
+            if args.only and workload.name not in args.only:
+                continue
+
+            measures = measure(workload, args.repeat)
+            results["workloads"][workload.name] = measures
+            print(f"{workload.name:<16} " + " ".join(f"{format_measure(metric, measures[metric]):>11}" for metric in METRICS))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        rows = compare(results, baseline, args.threshold, args.min_time)
+        print(f"\nComparacion con {args.baseline} (umbral {args.threshold:.0%}):")
+        for name, metric, old, new, change, regressed in rows:
+            mark = "  REGRESION" if regressed else ""
+            print(f"{name:<16} {metric:<12} {format_measure(metric, old):>11} -> {format_measure(metric, new):>11} {change:+8.1%}{mark}")
+
+        regressions = sum(row[-1] for row in rows)
+        if regressions:
+            print(f"{regressions} regresion(es) por encima del umbral.")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Batch execution for the Lunfardo programming language.
+
+Runs many independent scripts on a pool of worker processes. Every worker
+builds its global environment once (the builtins and any preloaded modules)
+and runs each script in a fresh Lunfardo restored from it, so jobs pay
+neither the interpreter startup nor each other's definitions. What a script
+prints, the bardo it ended with and how long it took come back as one record
+per script, which the command line writes as JSON lines.
+
+Usage:
+    python -m src.batch [--jobs N] [--output results.jsonl] [--preload MODULE ...]
+                        [--max-steps N] [--max-time S] [--max-depth N] [--max-memory MIB]
+                        SCRIPT_OR_DIRECTORY ...
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from .lunfardo import Lunfardo
+from .budget import Budget
+
+# The global environment every job of this worker starts from, and the
+# limits of each job, set up by `init_worker`.
+_snapshot = None
+_limits: Dict = {}
+
+def init_worker(preload: Sequence[str], limits: Dict) -> None:
+    """
+    Build the global environment of a worker process.
+
+    Args:
+        preload (list): The builtin modules to import into it.
+        limits (dict): The Budget arguments of each job.
+    """
+    global _snapshot, _limits
+    lunfardo = Lunfardo()
+    lunfardo.preload(*preload)
+    _snapshot = lunfardo.snapshot()
+    _limits = limits
+
+def error_record(error) -> Dict:
+    """
+    The fields of a bardo, as stored in a result record.
+    """
+    pos = error.pos_start
+    return {
+        'name': getattr(error, 'name', None),
+        'type': error.error_name.strip(),
+        'details': error.details,
+        'file': str(pos.fn) if pos else None,
+        'line': pos.ln + 1 if pos else None,
+    }
+
+def run_script(path: str) -> Dict:
+    """
+    Run a script in a fresh global environment. Called in the worker processes.
+
+    Args:
+        path (str): The path of the script.
+
+    Returns:
+        dict: The result record: the script, whether it ran without a bardo,
+            what it printed, the bardo (None if it ran fine), the seconds it
+            took and the worker it ran on.
+    """
+    start = perf_counter()
+    output = io.StringIO()
+    error = None
+    try:
+        with open(path, 'r', encoding = 'utf-8') as f:
+            text = f.read()
+        budget = Budget(**_limits) if _limits else None
+        with redirect_stdout(output):
+            _, bardo, _ = Lunfardo(_snapshot).execute(path, text, cwd = os.path.dirname(os.path.abspath(path)), budget = budget)
+        if bardo:
+            error = error_record(bardo)
+    except SystemExit:
+        # 'renuncio()' ends the script, not the worker.
+        pass
+    except Exception as e:
+        error = {'name': 'interno', 'type': type(e).__name__, 'details': str(e), 'file': path, 'line': None}
+
+    return {
+        'script': path,
+        'ok': error is None,
+        'output': output.getvalue(),
+        'error': error,
+        'elapsed': perf_counter() - start,
+        'worker': os.getpid(),
+    }
+
+class BatchRunner:
+    """
+    A pool of warm worker processes that run Lunfardo scripts.
+    """
+
+    def __init__(self, processes: Optional[int] = None, preload: Sequence[str] = (), max_jobs_per_worker: Optional[int] = None, start_method: Optional[str] = None, **limits) -> None:
+        """
+        Initialize a BatchRunner. The workers start with `start()` (or `with`).
+
+        Args:
+            processes (int, optional): The number of workers. Defaults to the number of CPUs.
+            preload (list, optional): Builtin modules every script starts with (e.g. "lacompu").
+            max_jobs_per_worker (int, optional): Replace a worker after it ran this many
+                scripts. By default workers live as long as the pool.
+            start_method (str, optional): The multiprocessing start method ("fork", "spawn", ...).
+            limits: The Budget arguments (max_steps, max_time, max_depth, max_memory)
+                of every script.
+
+        Raises:
+            ValueError: If the limits are not valid Budget arguments.
+        """
+        Budget(**limits)
+        self.processes = processes or os.cpu_count() or 1
+        self.preload = tuple(preload)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.limits = limits
+        self._context = multiprocessing.get_context(start_method)
+        self._pool = None
+
+    def start(self) -> "BatchRunner":
+        """
+        Start the worker processes.
+        """
+        if self._pool is None:
+            self._pool = self._context.Pool(
+                self.processes,
+                initializer = init_worker,
+                initargs = (self.preload, self.limits),
+                maxtasksperchild = self.max_jobs_per_worker,
+            )
+        return self
+
+    def close(self) -> None:
+        """
+        Stop the worker processes, once they finish the scripts they are running.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> "BatchRunner":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        if exc[0] is not None and self._pool is not None:
+            self._pool.terminate()
+        self.close()
+
+    def run(self, paths: Iterable[str], chunksize: int = 4) -> Iterator[Dict]:
+        """
+        Run scripts across the workers.
+
+        Args:
+            paths (iterable): The paths of the scripts.
+            chunksize (int, optional): How many scripts are sent to a worker at a time.
+
+        Returns:
+            iterator: The result record of every script (see `run_script`), in the
+                order they finish.
+        """
+        self.start()
+        return self._pool.imap_unordered(run_script, [str(path) for path in paths], chunksize)
+
+def find_scripts(paths: Iterable[str]) -> List[str]:
+    """
+    Expand the directories among `paths` into the .lunf files under them.
+    """
+    scripts = []
+    for path in paths:
+        if os.path.isdir(path):
+            scripts.extend(sorted(str(script) for script in Path(path).rglob('*.lunf')))
+        else:
+            scripts.append(path)
+    return scripts
+
+def add_limit_arguments(parser: argparse.ArgumentParser, what: str) -> None:
+    """
+    Add the --max-* options of the Budget of each `what` (script, program) to a parser.
+    """
+    parser.add_argument("--max-steps", type = int, metavar = "N", help = f"Stop each {what} after evaluating N nodes.")
+    parser.add_argument("--max-time", type = float, metavar = "SECONDS", help = f"Stop each {what} after running for SECONDS.")
+    parser.add_argument("--max-depth", type = int, metavar = "N", help = f"Stop each {what} when its calls nest more than N deep.")
+    parser.add_argument("--max-memory", type = float, metavar = "MIB", help = f"Fail each {what} whose values hold more than MIB mebibytes.")
+
+def limits_from_args(args: argparse.Namespace) -> Dict:
+    """
+    The Budget arguments given with the options of `add_limit_arguments`.
+    """
+    limits = {
+        'max_steps': args.max_steps,
+        'max_time': args.max_time,
+        'max_depth': args.max_depth,
+        'max_memory': int(args.max_memory * 1024 * 1024) if args.max_memory is not None else None,
+    }
+    return {name: value for name, value in limits.items() if value is not None}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "Run many Lunfardo scripts on a pool of worker processes.")
+    parser.add_argument("paths", nargs = "+", metavar = "SCRIPT_OR_DIRECTORY", help = "Scripts to run; directories are searched for .lunf files.")
+    parser.add_argument("--jobs", "-j", type = int, help = "Number of worker processes (default: number of CPUs).")
+    parser.add_argument("--output", "-o", metavar = "PATH", help = "Write the result records to this file instead of stdout.")
+    parser.add_argument("--preload", nargs = "+", default = [], metavar = "MODULE", help = "Builtin modules every script starts with.")
+    parser.add_argument("--max-jobs-per-worker", type = int, metavar = "N", help = "Replace each worker after it ran N scripts.")
+    add_limit_arguments(parser, "script")
+    args = parser.parse_args()
+    limits = limits_from_args(args)
+
+    try:
+        runner = BatchRunner(args.jobs, args.preload, args.max_jobs_per_worker, **limits)
+    except ValueError as e:
+        parser.error(str(e))
+
+    scripts = find_scripts(args.paths)
+    start = perf_counter()
+    failed = 0
+    out = open(args.output, 'w', encoding = 'utf-8') if args.output else sys.stdout
+    try:
+        with runner:
+            for record in runner.run(scripts):
+                failed += not record['ok']
+                out.write(json.dumps(record, ensure_ascii = False) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"{len(scripts)} scripts, {failed} con bardo, en {perf_counter() - start:.2f} s", file = sys.stderr)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
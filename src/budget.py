@@ -0,0 +1,125 @@
+"""
+Execution budgets for the Lunfardo programming language.
+
+A Budget bounds a run of untrusted code: how many nodes it may evaluate, how
+long it may take, how deep its calls may nest and how much memory its values
+may hold. The interpreter counts every node it visits against the budget and
+checks the limits every few hundred nodes, so a run without a budget pays
+nothing and a run with one pays a counter increment per node. The memory
+limit is kept by a MemoryTracker (see src.memory), which the budget enters
+with itself.
+
+The budget of a run is found through `current_budget`, so the interpreters
+started while it runs (e.g. to run an imported module) share it.
+"""
+
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+from .errors.errors import BudgetExceededBardo
+from .memory import MemoryTracker
+
+# How many nodes are evaluated between two checks of the limits.
+CHECK_INTERVAL = 256
+
+current_budget: ContextVar[Optional["Budget"]] = ContextVar("current_budget", default = None)
+
+class Budget:
+    """
+    The limits of a run, and how much of them has been used.
+    """
+
+    __slots__ = ('max_steps', 'max_time', 'max_depth', 'memory', 'steps', 'next_check', 'deadline', '_tokens')
+
+    def __init__(self, max_steps: Optional[int] = None, max_time: Optional[float] = None, max_depth: Optional[int] = None, max_memory: Optional[int] = None) -> None:
+        """
+        Initialize a Budget. Every limit is optional.
+
+        Args:
+            max_steps (int, optional): The maximum number of nodes to evaluate.
+            max_time (float, optional): The maximum wall time, in seconds, counted
+                from the start of the run.
+            max_depth (int, optional): The maximum number of nested calls. Calls never
+                nest deeper than the interpreter's own limit (1000).
+            max_memory (int, optional): The maximum number of bytes the values of the
+                run may hold (see src.memory). Going over it is a HeapLimitBardo,
+                which, unlike the other limits, the program can catch.
+
+        Raises:
+            ValueError: If a limit is not positive.
+        """
+        for name, limit in (('max_steps', max_steps), ('max_time', max_time), ('max_depth', max_depth), ('max_memory', max_memory)):
+            if limit is not None and limit <= 0:
+                raise ValueError(f'{name} must be positive, got {limit}.')
+
+        self.max_steps = max_steps
+        self.max_time = max_time
+        self.max_depth = max_depth
+        self.memory = MemoryTracker(max_memory) if max_memory is not None else None
+        self.steps = 0
+        self.next_check = min(CHECK_INTERVAL, max_steps + 1) if max_steps is not None else CHECK_INTERVAL
+        self.deadline = None
+        self._tokens = []
+
+    def __enter__(self) -> "Budget":
+        """
+        Make this the budget of the code run in the block, starting its clock
+        on the first use.
+        """
+        if self.deadline is None and self.max_time is not None:
+            self.deadline = perf_counter() + self.max_time
+
+        if self.memory is not None:
+            self.memory.__enter__()
+        self._tokens.append(current_budget.set(self))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        current_budget.reset(self._tokens.pop())
+        if self.memory is not None:
+            self.memory.__exit__(*exc)
+
+    def check(self, node, context) -> Optional[BudgetExceededBardo]:
+        """
+        Check the step and time limits. Called by the interpreter when the step
+        count reaches `next_check`.
+
+        Args:
+            node (Node): The node about to be evaluated.
+            context (Context): The context it is evaluated in.
+
+        Returns:
+            BudgetExceededBardo: The error to stop the run with, or None if the run
+                is still within its budget.
+        """
+        steps = self.steps
+        if self.max_steps is not None and steps > self.max_steps:
+            return BudgetExceededBardo(node.pos_start, node.pos_end, f'se evaluaron más de {self.max_steps} pasos', context)
+
+        if self.deadline is not None and perf_counter() > self.deadline:
+            # Keep failing on every node from now on.
+            self.next_check = steps + 1
+            return BudgetExceededBardo(node.pos_start, node.pos_end, f'se pasó de {self.max_time:g} segundos', context)
+
+        next_check = steps + CHECK_INTERVAL
+        if self.max_steps is not None:
+            next_check = min(next_check, self.max_steps + 1)
+        self.next_check = next_check
+        return None
+
+    def check_depth(self, depth: int, value, context) -> Optional[BudgetExceededBardo]:
+        """
+        Check the call depth limit before a call.
+
+        Args:
+            depth (int): The depth the call would run at.
+            value (BaseLaburo): The laburo, curro or method being called.
+            context (Context): The context it is called from.
+
+        Returns:
+            BudgetExceededBardo: The error to stop the run with, or None.
+        """
+        if self.max_depth is not None and depth > self.max_depth:
+            return BudgetExceededBardo(value.pos_start, value.pos_end, f'más de {self.max_depth} llamadas anidadas', context)
+
+        return None
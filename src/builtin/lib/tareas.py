@@ -0,0 +1,149 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from src.rtresult import RTResult
+from src.interpreter import Interpreter
+from src.errors import InvalidTypeBardo
+from src.lunfardo_types import Boloodean, Coso
+from src.lunfardo_types.laburo import BaseLaburo
+from src.lunfardo_types.value import Value
+from src import parallel
+
+# The threads the tasks that cannot go to another process run on, started on first use.
+_threads = None
+
+def _thread_pool() -> ThreadPoolExecutor:
+    global _threads
+    if _threads is None:
+        _threads = ThreadPoolExecutor(thread_name_prefix = 'tarea')
+    return _threads
+
+class Job:
+    """
+    A call running on a thread or a worker process, shared by the copies of its Tarea.
+    """
+
+    __slots__ = ('name', 'future', 'in_process', 'result')
+
+    def __init__(self, name, future = None, in_process = False, result = None) -> None:
+        """
+        Initialize a Job.
+
+        Args:
+            name (str): The name of the laburo or curro called.
+            future (Future, optional): The call, if it is running.
+            in_process (bool, optional): True if it runs in a worker process.
+            result (RTResult, optional): The result of the call, if it already ran.
+        """
+        self.name = name
+        self.future = future
+        self.in_process = in_process
+        self.result = result
+
+    def done(self) -> bool:
+        return self.result is not None or self.future.done()
+
+    def wait(self, context) -> RTResult:
+        """
+        Wait for the call to finish. What a call in a worker process printed is
+        written the first time it is waited for.
+
+        Args:
+            context (Context): The context that waits, for the bardo of the call.
+
+        Returns:
+            RTResult: The result of the call.
+        """
+        if self.result is None:
+            outcome = self.future.result()
+            if self.in_process:
+                from src.embedding import to_lunfardo
+                output, kind, item = outcome
+                if output:
+                    sys.stdout.write(output)
+                if kind == 'bardo':
+                    item.context = context
+                    self.result = RTResult().failure(item)
+                else:
+                    self.result = RTResult().success(to_lunfardo(item))
+            else:
+                self.result = outcome
+        return self.result
+
+class Tarea(Value):
+    """
+    A laburo or curro call started with 'lanzar'.
+    """
+
+    def __init__(self, job: Job) -> None:
+        super().__init__()
+        self.job = job
+
+    def copy(self):
+        copy = Tarea(self.job)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+    def is_true(self):
+        return True
+
+    def __str__(self):
+        state = 'terminada' if self.job.done() else 'corriendo'
+        return f"<tarea {self.job.name} ({state})>"
+
+    def __repr__(self):
+        return self.__str__()
+
+# Facade
+class Tareas:
+
+    def submit(self, work: BaseLaburo, args: list, context) -> Tarea:
+        """
+        Start a call. Laburos whose code, arguments and the values they read can
+        be sent to another process run on the worker processes of 'para
+        paralelo'; curros, and the laburos that cannot, run on a thread. When
+        the run has a Budget or a MemoryTracker the call runs right away, here.
+        """
+        name = work.name
+        if parallel.must_run_here():
+            return Tarea(Job(name, result = Interpreter().call(work, args, context)))
+
+        if parallel.worker_count() > 1:
+            payload = parallel.pack_call(work, args, context)
+            if payload is not None:
+                return Tarea(Job(name, parallel.get_executor().submit(parallel.run_call, payload), in_process = True))
+
+        return Tarea(Job(name, _thread_pool().submit(Interpreter().call, work, args, context)))
+
+# Adapter functions
+def submit_adapter(facade, work, args, exec_ctx):
+    if not isinstance(work, BaseLaburo):
+        return RTResult().failure(InvalidTypeBardo(work.pos_start, work.pos_end, "lo que se lanza tiene que ser un laburo", exec_ctx))
+    if not isinstance(args, Coso):
+        return RTResult().failure(InvalidTypeBardo(args.pos_start, args.pos_end, "los argumentos tienen que ir en un coso", exec_ctx))
+
+    return RTResult().success(facade.submit(work, list(args.elements), exec_ctx))
+
+def result_adapter(facade, tarea, exec_ctx):
+    if not isinstance(tarea, Tarea):
+        return RTResult().failure(InvalidTypeBardo(tarea.pos_start, tarea.pos_end, "solo se puede esperar una tarea", exec_ctx))
+
+    return tarea.job.wait(exec_ctx)
+
+def gather_adapter(facade, tareas, exec_ctx):
+    if not isinstance(tareas, Coso) or not all(isinstance(tarea, Tarea) for tarea in tareas.elements):
+        return RTResult().failure(InvalidTypeBardo(tareas.pos_start, tareas.pos_end, "esperar_todos espera un coso de tareas", exec_ctx))
+
+    res = RTResult()
+    values = []
+    for tarea in tareas.elements:
+        values.append(res.register(tarea.job.wait(exec_ctx)))
+        if res.should_return():
+            return res
+    return res.success(Coso(values))
+
+def done_adapter(facade, tarea, exec_ctx):
+    if not isinstance(tarea, Tarea):
+        return RTResult().failure(InvalidTypeBardo(tarea.pos_start, tarea.pos_end, "solo se puede preguntar por una tarea", exec_ctx))
+
+    return RTResult().success(Boloodean.posta if tarea.job.done() else Boloodean.trucho)
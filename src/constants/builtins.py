@@ -1,4 +1,5 @@
 BUILTINS = [
     "gualichos",
-    "lacompu"
+    "lacompu",
+    "tareas"
 ]
\ No newline at end of file
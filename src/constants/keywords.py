@@ -16,6 +16,7 @@ KEYWORDS = [
     'nuevo', # new class instance
     'chau', # end
     'devolver', # return
+    'producir', # yield
     'continuar', # continue
     'rajar', # break
     'importar', # import
@@ -56,6 +56,19 @@ class Context:
         """
         return self.parent
     
+    def copy(self) -> "Context":
+        """
+        Create a copy of this context.
+
+        The copy gets its own symbol table (a shallow copy of this one) and its own
+        modules mapping, so names defined in it do not leak back into this context.
+        """
+        copy = Context(self.display_name, self.parent, self.parent_entry_pos, self.cwd, self.file)
+        if self.symbol_table is not None:
+            copy.symbol_table = self.symbol_table.copy()
+        copy.modules = self.modules.copy()
+        return copy
+
     def add_module(self, module: Dict) -> None:
         """
         Add a module to this context.
@@ -0,0 +1,201 @@
+"""
+Embedding API for the Lunfardo programming language.
+
+Lets a Python program parse Lunfardo code once and run it many times, each
+run in a fresh global environment with its own inputs:
+
+    from src.embedding import compile
+
+    regla = compile("poneleque total = precio * cantidad\\ntotal > 100")
+    for registro in registros:
+        resultado = regla.run(globals = {"precio": registro.precio, "cantidad": registro.cantidad})
+        if resultado.ok and resultado.to_python():
+            ...
+
+Python values passed in are converted to Lunfardo values (numbers, strings,
+booleans, None, lists and dicts), and the results can be converted back.
+"""
+
+from typing import Any, Dict, Optional
+from .lunfardo import Lunfardo, GlobalSnapshot
+from .interpreter import Interpreter
+from .budget import Budget
+from .lunfardo_types import Numero, Boloodean, Nada, Chamuyo, Coso, Mataburros
+from .lunfardo_types.value import Value
+
+class CompileError(ValueError):
+    """
+    Raised by `compile` when the code does not lex or parse.
+    """
+
+    def __init__(self, error) -> None:
+        super().__init__(error.as_string())
+        self.error = error
+
+def to_lunfardo(value: Any) -> Value:
+    """
+    Convert a Python value to a Lunfardo value. Lunfardo values are returned as is.
+
+    Raises:
+        TypeError: If the value has no Lunfardo equivalent.
+    """
+    if isinstance(value, Value):
+        return value
+    if value is None:
+        return Nada.nada
+    if isinstance(value, bool):
+        return Boloodean.posta if value else Boloodean.trucho
+    if isinstance(value, (int, float)):
+        return Numero(value)
+    if isinstance(value, str):
+        return Chamuyo(value)
+    if isinstance(value, (list, tuple)):
+        return Coso([to_lunfardo(element) for element in value])
+    if isinstance(value, dict):
+        mataburros = Mataburros(size = max(16, len(value) * 2))
+        for key, element in value.items():
+            mataburros.set_pair(to_lunfardo(key), to_lunfardo(element))
+        return mataburros
+
+    raise TypeError(f"{type(value).__name__} values cannot be passed to Lunfardo.")
+
+def to_python(value: Value) -> Any:
+    """
+    Convert a Lunfardo value to a Python value. Laburos, chetos and their
+    instances are returned as is.
+    """
+    if isinstance(value, Nada):
+        return None
+    if isinstance(value, (Numero, Boloodean, Chamuyo)):
+        return value.value
+    if isinstance(value, Coso):
+        return [to_python(element) for element in value.elements]
+    if isinstance(value, Mataburros):
+        return {to_python(key): to_python(element) for bucket in value.buckets for key, element in bucket}
+
+    return value
+
+class ExecutionResult:
+    """
+    The outcome of a run of a Program.
+    """
+
+    __slots__ = ('value', 'error', 'globals')
+
+    def __init__(self, value: Value, error, symbols: Dict[str, Value]) -> None:
+        """
+        Initialize an ExecutionResult.
+
+        Args:
+            value (Value): The value of the last statement (nada if the run failed).
+            error (RTError): The bardo the run ended with, or None.
+            symbols (dict): The global names after the run, by name.
+        """
+        self.value = value
+        self.error = error
+        self.globals = symbols
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_python(self) -> Any:
+        """
+        The value of the last statement, as a Python value.
+        """
+        return to_python(self.value)
+
+    def __getitem__(self, name: str) -> Any:
+        """
+        A global name defined by the run (or passed to it), as a Python value.
+
+        Raises:
+            KeyError: If the name is not defined.
+        """
+        return to_python(self.globals[name])
+
+    def __repr__(self) -> str:
+        if self.error:
+            return f"ExecutionResult(error={self.error.error_name.strip()!r})"
+        return f"ExecutionResult({self.value!r})"
+
+class Program:
+    """
+    Parsed Lunfardo code, ready to run any number of times.
+    """
+
+    __slots__ = ('fn', 'node', 'cwd', 'snapshot')
+
+    def __init__(self, fn: str, node, cwd: Optional[str] = None, snapshot: Optional[GlobalSnapshot] = None) -> None:
+        """
+        Initialize a Program. Use `compile` to create one from source.
+
+        Args:
+            fn (str): The name of the program, shown in its bardos.
+            node (Node): Its AST (None for a program without statements).
+            cwd (str, optional): The directory its imports are relative to.
+            snapshot (GlobalSnapshot, optional): The global environment every run
+                starts from. Defaults to the builtins-only environment.
+        """
+        self.fn = fn
+        self.node = node
+        self.cwd = cwd
+        self.snapshot = snapshot
+
+    def run(self, globals: Optional[Dict[str, Any]] = None, budget: Optional[Budget] = None, interpreter_cls: Interpreter = Interpreter) -> ExecutionResult:
+        """
+        Run the program in a fresh copy of its global environment.
+
+        Args:
+            globals (dict, optional): Names to define before running, by name. Python
+                values are converted with `to_lunfardo`.
+            budget (Budget, optional): The limits of the run. A budget keeps count
+                across runs, so give every run its own.
+            interpreter_cls (type, optional): The interpreter to run the code with.
+
+        Returns:
+            ExecutionResult: The value of the last statement, the bardo and the globals.
+
+        Raises:
+            TypeError: If a global has no Lunfardo equivalent.
+        """
+        lunfardo = Lunfardo(self.snapshot)
+        symbol_table = lunfardo.global_symbol_table
+        for name, value in (globals or {}).items():
+            symbol_table.set(name, to_lunfardo(value))
+
+        value = None
+        error = None
+        if self.node is not None:
+            value, error, _ = lunfardo.run(self.fn, self.node, cwd = self.cwd, interpreter_cls = interpreter_cls, budget = budget)
+
+        if error or value is None:
+            value = Nada.nada
+        elif isinstance(value, Coso):
+            # The value of a program is the list of the values of its statements.
+            value = value.elements[-1] if value.elements else Nada.nada
+
+        return ExecutionResult(value, error, symbol_table.symbols)
+
+def compile(source: str, fn: str = "<programa>", cwd: Optional[str] = None, snapshot: Optional[GlobalSnapshot] = None) -> Program:
+    """
+    Lex and parse Lunfardo code into a Program.
+
+    Args:
+        source (str): The Lunfardo code.
+        fn (str, optional): The name of the program, shown in its bardos.
+        cwd (str, optional): The directory its imports are relative to.
+        snapshot (GlobalSnapshot, optional): The global environment every run
+            starts from (e.g. `Lunfardo.snapshot()` after preloading modules).
+
+    Returns:
+        Program: The parsed program.
+
+    Raises:
+        CompileError: If the code does not lex or parse.
+    """
+    node, error = Lunfardo.parse(fn, source)
+    if error:
+        raise CompileError(error)
+
+    return Program(fn, node, cwd, snapshot)
@@ -133,4 +133,37 @@ class FileNotFoundBardo(RTError):
     def __init__(self, pos_start, pos_end, details, context):
         super().__init__(pos_start, pos_end, f"Uy que rompimo! No pudimos abrir el archivo '{details}'\n El archivo no existe.", context)
         self.error_name = "[Archivo no encontrado]"
-        self.name = "archivo_no_encontrado"
\ No newline at end of file
+        self.name = "archivo_no_encontrado"
+
+class HeapLimitBardo(RTError):
+    """
+    The values of the run hold more memory than the limit of its MemoryTracker.
+    """
+
+    def __init__(self, pos_start, pos_end, details, context):
+        super().__init__(pos_start, pos_end, f'Nos quedamos sin memoria, {details}', context)
+        self.error_name = "[Límite de memoria]"
+        self.name = "limite_de_memoria"
+
+class BudgetExceededBardo(RTError):
+    """
+    The run went over one of the limits of its Budget. Its name is not one
+    'sibardea' accepts, so the program cannot catch it and keep going.
+    """
+
+    def __init__(self, pos_start, pos_end, details, context):
+        super().__init__(pos_start, pos_end, f'Hasta acá llegamos, se terminó el presupuesto: {details}', context)
+        self.error_name = "[Presupuesto agotado]"
+        self.name = "presupuesto_agotado"
+
+class ParallelBardo(RTError):
+    """
+    A 'para paralelo' whose body cannot run in parallel, e.g. because it writes
+    to variables of the enclosing scope or uses values that cannot be sent to
+    the worker processes.
+    """
+
+    def __init__(self, pos_start, pos_end, details, context):
+        super().__init__(pos_start, pos_end, f'Esto no se puede repartir entre los procesos: {details}', context)
+        self.error_name = "[Bardo de paralelo]"
+        self.name = "bardo_de_paralelo"
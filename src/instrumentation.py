@@ -0,0 +1,223 @@
+"""
+Execution counters for the Lunfardo programming language.
+
+The InstrumentedInterpreter counts how many times each kind of AST node is
+evaluated and how long it takes, how many times each binary operator runs, and
+how many values of each type are created. It tells which parts of the
+interpreter a workload actually exercises, and so which optimizations matter
+for it.
+
+Nothing is counted unless the InstrumentedInterpreter is used: the base
+Interpreter and the value types are not changed, and the allocation counter
+is only installed on `Value.__init__` while an instrumented run is going on.
+"""
+
+import atexit
+import json
+import sys
+from collections import Counter
+from time import perf_counter
+from typing import Dict, Optional
+from .constants.tokens import TT_KEYWORD
+from .interpreter import Interpreter
+from .context import Context
+from .rtresult import RTResult
+from .nodes import BinOpNode
+from .lunfardo_types.value import Value
+
+class NodeStats:
+    """
+    The counters of one node type or operator.
+    """
+
+    __slots__ = ('count', 'cumulative', 'own')
+
+    def __init__(self) -> None:
+        self.count = 0
+        # Time spent evaluating the node, with and without its children. The
+        # cumulative time only counts the outermost of nested nodes of a type.
+        self.cumulative = 0.0
+        self.own = 0.0
+
+    def add(self, elapsed: float, own: float, outermost: bool) -> None:
+        """
+        Count one evaluation.
+
+        Args:
+            elapsed (float): Seconds it took, with its children.
+            own (float): Seconds it took, without its children.
+            outermost (bool): Whether no other evaluation of the same type encloses it.
+        """
+        self.count += 1
+        self.own += own
+        if outermost:
+            self.cumulative += elapsed
+
+    def as_dict(self) -> Dict:
+        return {'count': self.count, 'cumulative': self.cumulative, 'own': self.own}
+
+class Instrumentation:
+    """
+    The counters of the instrumented runs of a program.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: Dict[str, NodeStats] = {}
+        self.operators: Dict[str, NodeStats] = {}
+        self.allocations = Counter()
+
+    @staticmethod
+    def stats(table: Dict[str, NodeStats], name: str) -> NodeStats:
+        """
+        The counters of a node type or operator, created on first use.
+        """
+        stats = table.get(name)
+        if stats is None:
+            stats = table[name] = NodeStats()
+
+        return stats
+
+    def report(self, limit: Optional[int] = None) -> str:
+        """
+        Render the counters as tables, from the most to the least expensive.
+
+        Args:
+            limit (int, optional): The maximum number of rows of each table.
+
+        Returns:
+            str: The tables, with times in milliseconds.
+        """
+        lines = []
+        for title, table in (('node', self.nodes), ('operator', self.operators)):
+            header = f"{'count':>10} {'cum ms':>11} {'own ms':>11} {'own ns/eval':>12}  {title}"
+            lines += [header, '-' * len(header)]
+            rows = sorted(table.items(), key = lambda item: item[1].own, reverse = True)[:limit]
+            for name, stats in rows:
+                per_eval = stats.own / stats.count * 1e9 if stats.count else 0.0
+                lines.append(
+                    f"{stats.count:>10} {stats.cumulative * 1000:>11.3f} {stats.own * 1000:>11.3f} "
+                    f"{per_eval:>12.0f}  {name}"
+                )
+            lines.append('')
+
+        header = f"{'count':>10}  value type"
+        lines += [header, '-' * len(header)]
+        for name, count in self.allocations.most_common(limit):
+            lines.append(f"{count:>10}  {name}")
+
+        return '\n'.join(lines)
+
+    def as_dict(self) -> Dict:
+        """
+        The counters as a JSON-serializable dict, with times in seconds.
+        """
+        return {
+            'nodes': {name: stats.as_dict() for name, stats in self.nodes.items()},
+            'operators': {name: stats.as_dict() for name, stats in self.operators.items()},
+            'allocations': dict(self.allocations),
+        }
+
+    def save(self, path) -> None:
+        """
+        Write the counters to a JSON file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, 'w', encoding = 'utf-8') as f:
+            json.dump(self.as_dict(), f, indent = 2)
+            f.write('\n')
+
+    def dump(self, path = None) -> None:
+        """
+        Print the counters to stderr and, if a path is given, save them as JSON.
+        """
+        print(self.report(), file = sys.stderr)
+        if path:
+            self.save(path)
+
+    def dump_at_exit(self, path = None) -> None:
+        """
+        Dump the counters when the process exits (see `dump`).
+        """
+        atexit.register(self.dump, path)
+
+# The instrumentations counting value allocations right now, and the
+# `Value.__init__` that was replaced to count them.
+_counting = []
+_value_init = Value.__init__
+
+def _counting_init(self) -> None:
+    name = type(self).__name__
+    for instrumentation in _counting:
+        instrumentation.allocations[name] += 1
+    _value_init(self)
+
+def count_allocations(instrumentation: Instrumentation) -> None:
+    """
+    Start counting the values created, of any type, into an Instrumentation.
+    """
+    _counting.append(instrumentation)
+    Value.__init__ = _counting_init
+
+def stop_counting_allocations(instrumentation: Instrumentation) -> None:
+    """
+    Stop counting the values created into an Instrumentation.
+    """
+    _counting.remove(instrumentation)
+    if not _counting:
+        Value.__init__ = _value_init
+
+class InstrumentedInterpreter(Interpreter):
+    """
+    An interpreter that keeps the execution counters of the program in an Instrumentation.
+    """
+
+    def __init__(self, instrumentation: Optional[Instrumentation] = None):
+        super().__init__()
+        self.instrumentation = instrumentation or Instrumentation()
+        # [start, time spent in children] of every node being evaluated, and
+        # how many of each type are nested.
+        self._stack = []
+        self._active = Counter()
+
+    def visit(self, node, context: Context) -> RTResult:
+        stack = self._stack
+        if not stack:
+            count_allocations(self.instrumentation)
+
+        name = type(node).__name__
+        operator = self.operator(node) if type(node) is BinOpNode else None
+        active = self._active
+        active[name] += 1
+        if operator:
+            active[operator] += 1
+
+        frame = [perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            return super().visit(node, context)
+        finally:
+            elapsed = perf_counter() - frame[0]
+            own = elapsed - frame[1]
+            stack.pop()
+
+            instrumentation = self.instrumentation
+            active[name] -= 1
+            instrumentation.stats(instrumentation.nodes, name).add(elapsed, own, not active[name])
+            if operator:
+                active[operator] -= 1
+                instrumentation.stats(instrumentation.operators, operator).add(elapsed, own, not active[operator])
+
+            if stack:
+                stack[-1][1] += elapsed
+            else:
+                stop_counting_allocations(instrumentation)
+
+    @staticmethod
+    def operator(node: BinOpNode) -> str:
+        """
+        The name of the operator of a binary operation ('PLUS', 'EE', 'y', ...).
+        """
+        op_tok = node.op_tok
+        return op_tok.value if op_tok.type == TT_KEYWORD else op_tok.type
@@ -1,8 +1,10 @@
 from .rtresult import RTResult
 from .constants.tokens import *
 from .lunfardo_types import Numero, Nada
-from .errors.errors import RTError, MaxRecursionBardo, UndefinedVarBardo, InvalidTypeBardo, AttributeBardo
+from .errors.errors import RTError, MaxRecursionBardo, UndefinedVarBardo, InvalidTypeBardo, AttributeBardo, HeapLimitBardo
 from .context import Context
+from .budget import current_budget
+from .memory import current_memory, HeapLimitExceeded
 from .nodes import *
 from typing import Union, NoReturn
 
@@ -10,7 +12,8 @@ LunfardoNode = Union[NumeroNode, ChamuyoNode, CosoNode, MataburrosNode, PoneleQu
                      PoneleQueAssignNode, BinOpNode, UnaryOpNode, SiNode, ParaNode,
                      MientrasNode, LaburoDefNode, ChetoDefNode, MethodCallNode,
                      InstanceNode, InstanceVarAssignNode, InstanceVarAccessNode,
-                     CallNode, DevolverNode, ContinuarNode, RajarNode, ImportarNode]
+                     CallNode, DevolverNode, ProducirNode, ContinuarNode, RajarNode, ImportarNode,
+                     ParaEnNode]
 
 class Interpreter:
     """
@@ -24,9 +27,10 @@ class Interpreter:
     """
 
     def __init__(self):
-        self._recursion_depth = 0
-        self._max_recursion_depth = 1000
-        self._current_function_name = None
+        self._call_depth = 0
+        self._max_call_depth = 1000
+        # The Budget of the run this interpreter belongs to, if it is limited.
+        self.budget = current_budget.get()
 
     def visit(self, node: LunfardoNode, context: Context) -> RTResult:
         """
@@ -39,9 +43,20 @@ class Interpreter:
         Returns:
             The result of evaluating the node.
         """
+        budget = self.budget
+        if budget is not None:
+            budget.steps += 1
+            if budget.steps >= budget.next_check:
+                error = budget.check(node, context)
+                if error:
+                    return RTResult().failure(error)
+
         method_name = f'visit_{type(node).__name__}'
         method = getattr(self, method_name, self.no_visit_method)
-        return method(node, context)
+        try:
+            return method(node, context)
+        except HeapLimitExceeded as exceeded:
+            return RTResult().failure(HeapLimitBardo(node.pos_start, node.pos_end, str(exceeded), context))
     
     def no_visit_method(self, node: LunfardoNode, context: Context) -> NoReturn:
         """
@@ -378,11 +393,21 @@ class Interpreter:
 
         i = start_value.value
 
+        if node.parallel:
+            # Imported here so the worker pool is only set up by programs that use it.
+            from .parallel import run_parallel
+            return run_parallel(self, node, context, i, end_value.value, step_value.value)
+
         if step_value.value >= 0:
             condition = lambda: i < end_value.value
         else:
             condition = lambda: i > end_value.value
 
+        # The results are charged to the memory tracker of the run, if it has
+        # one, as they accumulate.
+        result = Coso(elements)
+        memory = current_memory.get()
+
         while condition():
             context.symbol_table.set(node.var_name_tok.value, Numero(i))
             i += step_value.value
@@ -397,11 +422,14 @@ class Interpreter:
             if res.loop_should_break:
                 break
 
-            elements.append(value)
+            if not node.should_return_null:
+                elements.append(value)
+                if memory is not None:
+                    memory.track(result)
             
         return res.success(
             Nada.nada if node.should_return_null else
-            Coso(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+            result.set_context(context).set_pos(node.pos_start, node.pos_end)
         )
     
     def visit_MientrasNode(self, node: MientrasNode, context: Context) -> RTResult:
@@ -421,11 +449,14 @@ class Interpreter:
 
         Note:
             - Supports break and continue statements within the loop.
-            - Accumulates results of each iteration in a list if not returning Nada.
+            - Accumulates results of each iteration in a list if not returning Nada
+              (a loop with a block body does not keep them).
         """
         from .lunfardo_types import Coso
         res = RTResult()
         elements = []
+        result = Coso(elements)
+        memory = current_memory.get()
 
         while True:
             condition = res.register(self.visit(node.condition_node, context))
@@ -446,13 +477,265 @@ class Interpreter:
             if res.loop_should_break:
                 break
 
-            elements.append(value)
+            if not node.should_return_null:
+                elements.append(value)
+                if memory is not None:
+                    memory.track(result)
         
         return res.success(
             Nada.nada if node.should_return_null else
-            Coso(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+            result.set_context(context).set_pos(node.pos_start, node.pos_end)
         )
     
+    def visit_ParaEnNode(self, node: ParaEnNode, context: Context) -> RTResult:
+        """
+        Evaluate a ParaEnNode (for each loop) in the AST.
+
+        Goes through the elements of a coso, the characters of a chamuyo, the
+        keys of a mataburros or the values of a generador, one at a time.
+
+        Args:
+            node: The ParaEnNode to evaluate.
+            context: The current execution context.
+
+        Returns:
+            RTResult: A runtime result containing either Nada.nada if should_return_null
+                    is True, or a Coso (list) of the values of the iterations.
+        """
+        from .lunfardo_types import Coso
+        res = RTResult()
+
+        iterable = res.register(self.visit(node.iterable_node, context))
+        if res.should_return():
+            return res
+
+        next_item = self.stepper(iterable, context)
+        if next_item is None:
+            return res.failure(InvalidTypeBardo(
+                node.iterable_node.pos_start,
+                node.iterable_node.pos_end,
+                "'para ... en' recorre un coso, un chamuyo, un mataburros o un generador",
+                context
+            ))
+
+        elements = []
+        result = Coso(elements)
+        memory = current_memory.get()
+
+        while True:
+            item = res.register(next_item())
+            if res.should_return():
+                return res
+            if item is None:
+                break
+
+            context.symbol_table.set(node.var_name_tok.value, item)
+            value = res.register(self.visit(node.body_node, context))
+            if res.should_return() and res.loop_should_continue is False and res.loop_should_break is False:
+                return res
+
+            if res.loop_should_continue:
+                continue
+
+            if res.loop_should_break:
+                break
+
+            if not node.should_return_null:
+                elements.append(value)
+                if memory is not None:
+                    memory.track(result)
+
+        return res.success(
+            Nada.nada if node.should_return_null else
+            result.set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+
+    @staticmethod
+    def stepper(iterable, context: Context):
+        """
+        Return a function that gives the next element of a coso, chamuyo,
+        mataburros or generador each time it is called.
+
+        Args:
+            iterable (Value): The value to go through.
+            context (Context): The context that goes through it.
+
+        Returns:
+            callable: A function returning an RTResult with the next element (None
+                after the last one), or None if the value cannot be gone through.
+        """
+        from .lunfardo_types import Coso, Chamuyo, Mataburros, Generador
+        if isinstance(iterable, Generador):
+            return lambda: iterable.advance(context)
+
+        if isinstance(iterable, Coso):
+            items = iter(iterable.elements)
+        elif isinstance(iterable, Chamuyo):
+            items = (Chamuyo(char) for char in iterable.value)
+        elif isinstance(iterable, Mataburros):
+            items = (key for bucket in iterable.buckets for key, _ in bucket)
+        else:
+            return None
+
+        return lambda: RTResult().success(next(items, None))
+
+    def visit_ProducirNode(self, node: ProducirNode, context: Context) -> RTResult:
+        """
+        Evaluate a ProducirNode (yield) outside the body of a generador laburo:
+        at the top level of a program or in a method. (In a laburo, 'producir'
+        makes the laburo a generador, and `generate` runs it.)
+        """
+        return RTResult().failure(InvalidTypeBardo(
+            node.pos_start,
+            node.pos_end,
+            "'producir' solo va adentro de un laburo",
+            context
+        ))
+
+    def generate(self, node: LunfardoNode, context: Context):
+        """
+        Run a node of the body of a generador laburo.
+
+        This is a Python generator: it yields the value of every 'producir' it
+        runs into, suspending the laburo there until the next value is asked
+        for, and returns the RTResult of the node. The statements that can have
+        a 'producir' in them (blocks, 'si', loops and 'proba') are run by the
+        `generate_*` methods; any other node is visited as usual.
+
+        Args:
+            node: The node to run.
+            context: The execution context of the laburo.
+        """
+        method = getattr(self, f'generate_{type(node).__name__}', None)
+        if method is None:
+            return self.visit(node, context)
+        return (yield from method(node, context))
+
+    def generate_ProducirNode(self, node: ProducirNode, context: Context):
+        res = RTResult()
+        value = Nada.nada
+        if node.node_to_produce:
+            value = res.register(self.visit(node.node_to_produce, context))
+            if res.should_return():
+                return res
+
+        yield value
+        return res.success(Nada.nada)
+
+    def generate_CosoNode(self, node: CosoNode, context: Context):
+        res = RTResult()
+        for element_node in node.element_nodes:
+            res.register((yield from self.generate(element_node, context)))
+            if res.should_return():
+                return res
+        return res.success(Nada.nada)
+
+    def generate_SiNode(self, node: SiNode, context: Context):
+        res = RTResult()
+        for condition, expr, _ in node.cases:
+            condition_value = res.register(self.visit(condition, context))
+            if res.should_return():
+                return res
+
+            if condition_value.is_true():
+                res.register((yield from self.generate(expr, context)))
+                if res.should_return():
+                    return res
+                return res.success(Nada.nada)
+
+        if node.else_case:
+            expr, _ = node.else_case
+            res.register((yield from self.generate(expr, context)))
+            if res.should_return():
+                return res
+
+        return res.success(Nada.nada)
+
+    def generate_ParaNode(self, node: ParaNode, context: Context):
+        res = RTResult()
+        if node.parallel:
+            # A 'para paralelo' cannot 'producir' (see src.parallel).
+            return self.visit(node, context)
+
+        start_value = res.register(self.visit(node.start_value_node, context))
+        if res.should_return():
+            return res
+
+        end_value = res.register(self.visit(node.end_value_node, context))
+        if res.should_return():
+            return res
+
+        step_value = Numero(1)
+        if node.step_value_node:
+            step_value = res.register(self.visit(node.step_value_node, context))
+            if res.should_return():
+                return res
+
+        i = start_value.value
+        while i < end_value.value if step_value.value >= 0 else i > end_value.value:
+            context.symbol_table.set(node.var_name_tok.value, Numero(i))
+            i += step_value.value
+
+            res.register((yield from self.generate(node.body_node, context)))
+            if res.should_return() and res.loop_should_continue is False and res.loop_should_break is False:
+                return res
+            if res.loop_should_break:
+                break
+
+        return res.success(Nada.nada)
+
+    def generate_ParaEnNode(self, node: ParaEnNode, context: Context):
+        res = RTResult()
+        iterable = res.register(self.visit(node.iterable_node, context))
+        if res.should_return():
+            return res
+
+        next_item = self.stepper(iterable, context)
+        if next_item is None:
+            return self.visit(node, context)
+
+        while True:
+            item = res.register(next_item())
+            if res.should_return():
+                return res
+            if item is None:
+                break
+
+            context.symbol_table.set(node.var_name_tok.value, item)
+            res.register((yield from self.generate(node.body_node, context)))
+            if res.should_return() and res.loop_should_continue is False and res.loop_should_break is False:
+                return res
+            if res.loop_should_break:
+                break
+
+        return res.success(Nada.nada)
+
+    def generate_MientrasNode(self, node: MientrasNode, context: Context):
+        res = RTResult()
+        while True:
+            condition = res.register(self.visit(node.condition_node, context))
+            if res.should_return():
+                return res
+            if not condition.is_true():
+                break
+
+            res.register((yield from self.generate(node.body_node, context)))
+            if res.should_return() and res.loop_should_continue is False and res.loop_should_break is False:
+                return res
+            if res.loop_should_break:
+                break
+
+        return res.success(Nada.nada)
+
+    def generate_ProbaSiBardeaNode(self, node: ProbaSiBardeaNode, context: Context):
+        res = RTResult()
+        res.register((yield from self.generate(node.try_body_node, context)))
+        if res.error is not None and res.error.name == node.bardo_name:
+            res.register((yield from self.generate(node.except_body_node, context)))
+        if res.should_return():
+            return res
+        return res.success(Nada.nada)
+
     def visit_LaburoDefNode(self, node: LaburoDefNode, context: Context) -> RTResult:
         """
         Visit and interpret a LaburoDefNode (function definition node) in the Lunfardo language.
@@ -488,7 +771,7 @@ class Interpreter:
             else:
                 arg_values.append(None)
 
-        func_value = Laburo(func_name, body_node, arg_names, arg_values, node.should_auto_return).set_pos(node.pos_start, node.pos_end)
+        func_value = Laburo(func_name, body_node, arg_names, arg_values, node.should_auto_return, node.is_generator).set_pos(node.pos_start, node.pos_end)
         func_value.is_method = node.is_method
 
         if not node.is_method:
@@ -604,44 +887,55 @@ class Interpreter:
         
         value_to_call = value_to_call.copy().set_pos(node.pos_start, node.pos_end)
 
-        # Check for recursion
-        function_name = None
-        if hasattr(value_to_call, 'name'):
-            function_name = value_to_call.name
-
-        if function_name == self._current_function_name:
-            self._recursion_depth += 1
-            if self._recursion_depth > self._max_recursion_depth:
-                return res.failure(MaxRecursionBardo(
-                    node.pos_start,
-                    node.pos_end,
-                    f"(Recursión máxima alcanzada: {self._max_recursion_depth})",
-                    context
-                ))
-            
         for arg_node in node.arg_nodes:
             args.append(res.register(self.visit(arg_node, context)))
             if res.should_return():
                 return res
 
-        # Store the current function name before execution
-        previous_function_name = self._current_function_name
-        if hasattr(value_to_call, 'name'):
-            self._current_function_name = value_to_call.name
-
-        return_value = res.register(value_to_call.execute(args, context, self))
+        return_value = res.register(self.call(value_to_call, args, context))
         if res.should_return():
             return res
         
-        # Restore the previous function name and decrement recursion depth
-        self._current_function_name = previous_function_name
-        if function_name == previous_function_name:
-            self._recursion_depth -= 1
-        
         return_value = return_value.set_pos(node.pos_start, node.pos_end).set_context(context)
         
         return res.success(return_value)
     
+    def call(self, value, args: list, context: Context) -> RTResult:
+        """
+        Execute a laburo, curro or method with its arguments already evaluated.
+
+        Every call the program makes goes through here (method calls from
+        `Cheto.call_method`), so this is where the call depth is limited, and
+        subclasses can override it to observe the calls.
+
+        Args:
+            value (BaseLaburo): The laburo, curro or method to execute.
+            args (list): The values of the arguments.
+            context (Context): The context the call is made from.
+
+        Returns:
+            RTResult: The result of the call.
+        """
+        depth = self._call_depth + 1
+        if depth > self._max_call_depth:
+            return RTResult().failure(MaxRecursionBardo(
+                value.pos_start,
+                value.pos_end,
+                f"(Recursión máxima alcanzada: {self._max_call_depth})",
+                context
+            ))
+
+        if self.budget is not None:
+            error = self.budget.check_depth(depth, value, context)
+            if error:
+                return RTResult().failure(error)
+
+        self._call_depth = depth
+        try:
+            return value.execute(args, context, self)
+        finally:
+            self._call_depth = depth - 1
+
     def visit_MethodCallNode(self, node: MethodCallNode, context: Context) -> RTResult:
         """
         Visit and interpret a MethodCallNode (object method call node) in the Lunfardo language.
@@ -1102,7 +1396,7 @@ class Interpreter:
             return res
         
         module.value += ".lunf"
-        import_value = res.register(ejecutar_func.execute([module], context, self))
+        import_value = res.register(self.call(ejecutar_func, [module], context))
         if res.should_return():
             return res
         
@@ -1144,7 +1438,8 @@ class Interpreter:
             ZeroDivisionBardo,
             InvalidKeyBardo,
             InvalidIndexBardo,
-            FileNotFoundBardo
+            FileNotFoundBardo,
+            HeapLimitBardo
         )
 
         AVAILABLE_BARDOS = {
@@ -1156,7 +1451,8 @@ class Interpreter:
             'division_por_cero': ZeroDivisionBardo,
             'bardo_de_clave': InvalidKeyBardo,
             'bardo_de_indice': InvalidIndexBardo,
-            'archivo_no_encontrado': FileNotFoundBardo
+            'archivo_no_encontrado': FileNotFoundBardo,
+            'limite_de_memoria': HeapLimitBardo
         }
         
         bardo_msg = res.register(self.visit(node.bardo_msg_node, context))
@@ -1190,7 +1486,7 @@ class Interpreter:
         Returns:
             RTResult: Success or failure based on the library handling.
         """
-        from library_registry import get_library_handler
+        from .library_registry import get_library_handler
         
         res = RTResult()
         handler = get_library_handler(lib_name)
@@ -4,12 +4,65 @@ Lexer module for the Lunfardo programming language.
 This module contains the Lexer class, which is responsible for tokenizing
 the input source code into a sequence of tokens that can be processed by
 the parser.
+
+The lexer is table-driven: a single compiled regular expression recognizes
+every kind of token, and line and column numbers are derived from the match
+offsets only when an error needs them.
 """
 
+import re
+import sys
 from .constants import *
-from .lunfardo_token import Position, Token
+from .lunfardo_token import Position, Source, Token
 from .errors.errors import IllegalCharBardo, ExpectedCharBardo
-from typing import Tuple, List
+from typing import Iterator, Tuple, List
+
+OPERATORS = {
+    '->': TT_ARROW,
+    '==': TT_EE,
+    '!=': TT_NE,
+    '<=': TT_LTE,
+    '>=': TT_GTE,
+    '+': TT_PLUS,
+    '-': TT_MINUS,
+    '*': TT_MUL,
+    '/': TT_DIV,
+    '^': TT_POW,
+    '(': TT_LPAREN,
+    ')': TT_RPAREN,
+    '[': TT_LSQUARE,
+    ']': TT_RSQUARE,
+    '{': TT_LCURLY,
+    '}': TT_RCURLY,
+    ',': TT_COMMA,
+    ':': TT_COLON,
+    '.': TT_DOT,
+    '=': TT_EQ,
+    '<': TT_LT,
+    '>': TT_GT,
+}
+
+ESCAPE_CHARACTERS = {
+    'n': '\n',
+    't': '\t'
+}
+
+# Longest operators first, so '==' wins over '='.
+_OPERATORS_PATTERN = '|'.join(re.escape(op) for op in sorted(OPERATORS, key=len, reverse=True))
+
+TOKEN_REGEX = re.compile(rf'''
+    (?P<WHITESPACE>[ \t]+)
+  | (?P<COMMENT>\#[^\n]*\n?)
+  | (?P<NEWLINE>[;\n])
+  | (?P<NUMBER>[{DIGITS}]+(?:\.[{DIGITS}]*)?)
+  | (?P<NAME>[{LETTERS}][{LETTERS_DIGITS}_]*)
+  | (?P<STRING>"(?:[^"\\]|\\.)*")
+  | (?P<OPERATOR>{_OPERATORS_PATTERN})
+''', re.VERBOSE | re.DOTALL)
+
+ESCAPE_REGEX = re.compile(r'\\(.)', re.DOTALL)
+
+KEYWORDS_SET = frozenset(KEYWORDS)
 
 class Lexer:
     """
@@ -19,318 +72,174 @@ class Lexer:
     which represent the smallest units of meaning in the language.
     """
 
-    def __init__(self, fn, text) -> None:
+    def __init__(self, fn, text, chunks = None, first_line = 0) -> None:
         """
         Initialize the Lexer with a filename and input text.
 
         Args:
             fn (str): The name of the file being processed.
             text (str): The source code to be tokenized.
+            chunks (Iterable[str], optional): More source code, read lazily once
+                `text` has been consumed (e.g. the lines of a pipe).
+            first_line (int, optional): Line number of the first line of `text`, when
+                it is a fragment of a larger document. Defaults to 0.
         """
         self.fn = fn
         self.text = text
-        self.pos = Position(-1, 0, -1, fn, text)
-        self.current_char = None
-        self.advance()
+        self.chunks = chunks
+        self.source = Source(fn, text, first_line)
+        self.error = None
 
-    def advance(self) -> None:
-        """
-        Advance the lexer's position to the next character in the input.
-        """
-        self.pos = self.pos.copy()
-        self.pos.advance(self.current_char)
-        self.current_char = self.text[self.pos.idx] if self.pos.idx < len(self.text) else None
-
-    def make_tokens(self) -> Tuple[List[Token], IllegalCharBardo | None]:
+    def make_tokens(self) -> Tuple[List[Token], IllegalCharBardo | ExpectedCharBardo | None]:
         """
         Generate a list of tokens from the input text.
 
         Returns:
             tuple: A tuple containing a list of tokens and an error (if any).
         """
-        tokens = []
-
-        while self.current_char is not None:
-            if self.current_char in ' \t':
-                self.advance()
-
-            elif self.current_char == '#':
-                self.skip_comment()
-                self.advance()
-
-            elif self.current_char in ';\n':
-                tokens.append(Token(TT_NEWLINE, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char in DIGITS:
-                tokens.append(self.make_number())
-            
-            elif self.current_char in LETTERS:
-                tokens.append(self.make_identifier())
-            
-            elif self.current_char == '"':
-                tok, error = self.make_string()
-                if error:
-                    return [], error
-                tokens.append(tok)
-            
-            elif self.current_char == '+':
-                tokens.append(Token(TT_PLUS, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == '-':
-                tokens.append(self.make_minus_or_arrow())
-            
-            elif self.current_char == '*':
-                tokens.append(Token(TT_MUL, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == '/':
-                tokens.append(Token(TT_DIV, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == '^':
-                tokens.append(Token(TT_POW, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == '(':
-                tokens.append(Token(TT_LPAREN, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == ')':
-                tokens.append(Token(TT_RPAREN, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == '[':
-                tokens.append(Token(TT_LSQUARE, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == ']':
-                tokens.append(Token(TT_RSQUARE, pos_start = self.pos))
-                self.advance()
-
-            elif self.current_char == '{':
-                tokens.append(Token(TT_LCURLY, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == '}':
-                tokens.append(Token(TT_RCURLY, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == ',':
-                tokens.append(Token(TT_COMMA, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == ':':
-                tokens.append(Token(TT_COLON, pos_start = self.pos))
-                self.advance()
-
-            elif self.current_char == '.':
-                tokens.append(Token(TT_DOT, pos_start = self.pos))
-                self.advance()
-            
-            elif self.current_char == '!':
-                tok, error = self.make_not_equals()
-                if error:
-                    return [], error
-                tokens.append(tok)
-
-            elif self.current_char == '=':
-                tokens.append(self.make_equals())
-
-            elif self.current_char == '<':
-                tokens.append(self.make_less_than())
-            
-            elif self.current_char == '>':
-                tokens.append(self.make_greater_than())
-
-            else:
-                pos_start = self.pos.copy()
-                char = self.current_char
-                self.advance()
-                return [], IllegalCharBardo(pos_start, self.pos, "'" + char + "'")
+        tokens = list(self.iter_tokens())
+        if self.error:
+            return [], self.error
 
-        tokens.append(Token(TT_EOF, pos_start = self.pos))
         return tokens, None
-    
-    def make_number(self) -> Token:
-        """
-        Parse and create a number token (integer or float).
 
-        Returns:
-            Token: An INT or FLOAT token.
+    def iter_tokens(self) -> Iterator[Token]:
         """
-        num_str = ''
-        dot_count = 0
-        pos_start = self.pos.copy()
-        
-        while self.current_char is not None and self.current_char in DIGITS + '.':
-            if self.current_char == '.':
-                if dot_count == 1:
-                    break
-                
-                dot_count += 1
-                num_str += '.'
-            
-            else:
-                num_str += self.current_char
-            
-            self.advance()
-            
-        if dot_count == 0:
-            return Token(TT_INT, int(num_str), pos_start, self.pos)
-        
-        return Token(TT_FLOAT, float(num_str), pos_start, self.pos)
-    
-    def make_string(self) -> Token:
-        """
-        Parse and create a string token.
+        Generate the tokens of the input text one at a time.
 
-        Returns:
-            Token: A STRING token.
+        Only the part of the input that has not been tokenized yet is kept in
+        the lexer's buffer, and more chunks are read only when the buffer runs
+        out. If the input is not valid, `self.error` is set and an EOF token is
+        yielded at the position of the error.
+
+        Yields:
+            Token: The tokens of the input, ending with an EOF token.
         """
-        string = ''
-        pos_start = self.pos.copy()
-        escape_char = False
-        doublequotes_counter = 1
-        self.advance()
-
-        # Empty string
-        if self.current_char == '"':
-            self.advance()
-            return Token(TT_STRING, string, pos_start, self.pos), None
-
-        escape_characters = {
-            'n': '\n',
-            't': '\t'
-        }
-
-        while self.current_char is not None and (self.current_char != '"' or escape_char):
-            if escape_char:
-                string += escape_characters.get(self.current_char, self.current_char)
-                escape_char	= False
-            else:
-                if self.current_char == '\\':
-                    escape_char = True
+        source = self.source
+        match = TOKEN_REGEX.match
+        span = Token.span
+        chunks = iter(self.chunks) if self.chunks is not None else None
+
+        buffer = self.text
+        length = len(buffer)
+        base = 0
+        idx = 0
+        skipped_newline = False
+
+        while True:
+            if idx < length:
+                m = match(buffer, idx)
+                if m:
+                    end = m.end()
+                    kind = m.lastgroup
                 else:
-                    string += self.current_char
-            self.advance()
-            
-            if self.current_char == '"':
-                doublequotes_counter += 1
-
-        self.advance()
-
-        if doublequotes_counter < 2:
-            return None, ExpectedCharBardo(pos_start, self.pos, 'Se esperaba \'"\'')
-        
-        return Token(TT_STRING, string, pos_start, self.pos), None
-    
-    def make_identifier(self) -> Token:
-        """
-        Parse and create an identifier or keyword token.
+                    # Only an open string or a '!' can still become valid with more input.
+                    end = length if buffer[idx] in '"!' else idx
+                    kind = None
+
+                # A token that reaches the end of the buffer might continue in the next chunk.
+                complete = chunks is None or (
+                    end < length or kind == 'NEWLINE' or kind == 'STRING' or
+                    (kind == 'COMMENT' and buffer[end - 1] == '\n')
+                )
+            else:
+                complete = False
 
-        Returns:
-            Token: An IDENTIFIER or KEYWORD token.
-        """
-        id_str = ''
-        pos_start = self.pos.copy()
+            if not complete:
+                if chunks is None:
+                    break
 
-        while self.current_char is not None and self.current_char in LETTERS_DIGITS + '_':
-            id_str += self.current_char
-            self.advance()
+                chunk = next(chunks, None)
+                if chunk is None:
+                    chunks = None
+                elif chunk:
+                    source.extend(chunk)
+                    base += idx
+                    buffer = buffer[idx:] + chunk
+                    length = len(buffer)
+                    idx = 0
+                continue
+
+            if m is None:
+                self.error = self.make_error(base + idx)
+                yield span(TT_EOF, None, base + idx, base + idx + 1, source)
+                return
+
+            start = base + idx
+            if kind == 'WHITESPACE':
+                pass
+
+            elif kind == 'NAME':
+                # Interned, so every occurrence of a name shares one string.
+                value = sys.intern(m.group())
+                yield span(TT_KEYWORD if value in KEYWORDS_SET else TT_IDENTIFIER, value, start, base + end, source)
+
+            elif kind == 'OPERATOR':
+                yield span(OPERATORS[m.group()], None, start, base + end, source)
+
+            elif kind == 'NEWLINE':
+                yield span(TT_NEWLINE, None, start, base + end, source)
+
+            elif kind == 'NUMBER':
+                value = m.group()
+                if '.' in value:
+                    yield span(TT_FLOAT, float(value), start, base + end, source)
+                else:
+                    yield span(TT_INT, int(value), start, base + end, source)
 
-        tok_type = TT_KEYWORD if id_str in KEYWORDS else TT_IDENTIFIER
-        return Token(tok_type, id_str, pos_start, self.pos)
-    
-    def make_not_equals(self) -> Tuple[Token | None, ExpectedCharBardo | None]:
-        """
-        Parse and create a not-equals token.
+            elif kind == 'STRING':
+                value = buffer[idx + 1:end - 1]
+                if '\\' in value:
+                    value = ESCAPE_REGEX.sub(self.unescape, value)
+                yield span(TT_STRING, value, start, base + end, source)
 
-        Returns:
-            tuple: A tuple containing the NE token and an error (if any).
-        """
-        pos_start = self.pos.copy()
-        self.advance()
-
-        if self.current_char == '=':
-            self.advance()
-            return Token(TT_NE, pos_start = pos_start, pos_end = self.pos), None
-        
-        self.advance()
-        return None, ExpectedCharBardo(pos_start, self.pos, "'=' (después de '!')")
-    
-    def make_equals(self) -> Token:
-        """
-        Parse and create an equals or double-equals token.
+            elif kind == 'COMMENT':
+                skipped_newline = buffer[end - 1] != '\n'
 
-        Returns:
-            Token: An EQ or EE token.
-        """
-        tok_type = TT_EQ
-        pos_start = self.pos.copy()
-        self.advance()
+            idx = end
 
-        if self.current_char == '=':
-            self.advance()
-            tok_type = TT_EE
+        # A comment at the end of the input also skips the (missing) newline.
+        eof_idx = base + length + skipped_newline
+        yield span(TT_EOF, None, eof_idx, eof_idx + 1, source)
 
-        return Token(tok_type, pos_start = pos_start, pos_end = self.pos)
-    
-    def make_less_than(self) -> Token:
+    @staticmethod
+    def unescape(m: re.Match) -> str:
         """
-        Parse and create a less-than or less-than-or-equal token.
-
-        Returns:
-            Token: An LT or LTE token.
+        Replace an escape sequence found inside a string by the character it represents.
         """
-        tok_type = TT_LT
-        pos_start = self.pos.copy()
-        self.advance()
-
-        if self.current_char == '=':
-            self.advance()
-            tok_type = TT_LTE
+        char = m.group(1)
+        return ESCAPE_CHARACTERS.get(char, char)
 
-        return Token(tok_type, pos_start = pos_start, pos_end = self.pos)
-    
-    def make_greater_than(self) -> Token:
+    def position_at(self, idx: int) -> Position:
         """
-        Parse and create a greater-than or greater-than-or-equal token.
+        Build the Position of an index in the input text.
+
+        Args:
+            idx (int): Index in the source text.
 
         Returns:
-            Token: A GT or GTE token.
+            Position: The position, with its line and column numbers.
         """
-        tok_type = TT_GT
-        pos_start = self.pos.copy()
-        self.advance()
+        return Position(idx, self.source)
 
-        if self.current_char == '=':
-            self.advance()
-            tok_type = TT_GTE
-
-        return Token(tok_type, pos_start = pos_start, pos_end = self.pos)
-    
-    def make_minus_or_arrow(self) -> Token:
+    def make_error(self, idx: int) -> IllegalCharBardo | ExpectedCharBardo:
         """
-        Parse and create a minus or arrow token.
+        Build the error for the input that no token matches at the given index.
+
+        Args:
+            idx (int): Index of the first character that could not be tokenized.
 
         Returns:
-            Token: A MINUS or ARROW token
+            Bardo: An ExpectedCharBardo for unclosed strings and lone '!', an IllegalCharBardo otherwise.
         """
-        tok_type = TT_MINUS
-        pos_start = self.pos.copy()
-        self.advance()
-
-        if self.current_char == '>':
-            self.advance()
-            tok_type = TT_ARROW
+        text = self.source.text
+        char = text[idx]
+        pos_start = self.position_at(idx)
 
-        return Token(tok_type, pos_start = pos_start, pos_end = self.pos)
+        if char == '"':
+            return ExpectedCharBardo(pos_start, self.position_at(len(text) + 1), 'Se esperaba \'"\'')
 
-    
-    def skip_comment(self) -> None:
-        self.advance()
+        if char == '!':
+            return ExpectedCharBardo(pos_start, self.position_at(idx + 2), "'=' (después de '!')")
 
-        while self.current_char not in ('\n', None):
-            self.advance()
\ No newline at end of file
+        return IllegalCharBardo(pos_start, self.position_at(idx + 1), "'" + char + "'")
@@ -97,6 +97,33 @@ def init_lacompu(module_context, node, context):
     
     return res.success(Nada.nada)
 
+def init_tareas(module_context, node, context):
+    res = RTResult()
+
+    try:
+        from builtin.lib.tareas import Tareas, submit_adapter, result_adapter, gather_adapter, done_adapter
+
+        wrapper_instance = Tareas()
+        from lunfardo_types import Curro
+        tareas_functions = {
+            "submit": lambda exec_ctx: submit_adapter(wrapper_instance, exec_ctx.symbol_table.get("trabajo"), exec_ctx.symbol_table.get("argumentos"), exec_ctx),
+            "result": lambda exec_ctx: result_adapter(wrapper_instance, exec_ctx.symbol_table.get("tarea"), exec_ctx),
+            "gather": lambda exec_ctx: gather_adapter(wrapper_instance, exec_ctx.symbol_table.get("tareas"), exec_ctx),
+            "done": lambda exec_ctx: done_adapter(wrapper_instance, exec_ctx.symbol_table.get("tarea"), exec_ctx),
+        }
+
+        for name, func in tareas_functions.items():
+            curro_instance = Curro(name, func)
+            module_context.symbol_table.set(name, curro_instance)
+
+    except ImportError as e:
+        return res.failure(RTError(node.pos_start, node.pos_end, f"Bardo al importar la librería 'tareas': {str(e)}", context))
+    except AttributeError:
+        return res.failure(RTError(node.pos_start, node.pos_end, "Bardo en la librería 'tareas'", context))
+
+    return res.success(Nada.nada)
+
 
 register_library_handler("gualichos", init_gualichos)
 register_library_handler("lacompu", init_lacompu)
+register_library_handler("tareas", init_tareas)
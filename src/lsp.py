@@ -0,0 +1,532 @@
+"""
+Language server for the Lunfardo programming language.
+
+Speaks the Language Server Protocol (JSON-RPC over stdin/stdout) and answers
+go-to-definition and find-references for 'laburo' and 'cheto' names, and
+reports syntax errors as diagnostics. Every open document is a Session, so an
+edit only lexes and parses the statements it touches again, and the symbols
+of every statement are cached until the statement changes.
+
+Usage:
+    python -m src.lsp
+"""
+
+import json
+import sys
+from bisect import bisect_right
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from .lunfardo import Lunfardo
+from .lunfardo_token import Token
+from .nodes import *
+from .session import Segment, Session
+
+# Kinds of symbol. Methods are looked up separately, since 'obj.nombre()'
+# can only refer to a method.
+NAME = "name"
+METHOD = "method"
+
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+class Symbol:
+    """
+    An occurrence of a 'laburo', 'cheto' or method name in a document.
+    """
+
+    __slots__ = ('name', 'kind', 'is_definition', 'tok')
+
+    def __init__(self, name, kind, is_definition, tok) -> None:
+        """
+        Initialize a Symbol.
+
+        Args:
+            name (str): The name.
+            kind (str): NAME, or METHOD for the names of methods.
+            is_definition (bool): Whether this occurrence defines the name.
+            tok (Token): The token of the name.
+        """
+        self.name = name
+        self.kind = kind
+        self.is_definition = is_definition
+        self.tok = tok
+
+    def __repr__(self) -> str:
+        return f'Symbol({self.name!r}, {self.kind!r}, {self.is_definition})'
+
+def collect_symbols(node, symbols: List[Symbol]) -> None:
+    """
+    Append the symbols of a node and its children to a list, in source order.
+
+    Args:
+        node (Node): The node to walk.
+        symbols (list): The list to add the symbols to.
+    """
+    if isinstance(node, LaburoDefNode):
+        if node.var_name_tok is not None:
+            kind = METHOD if node.is_method else NAME
+            symbols.append(Symbol(node.var_name_tok.value, kind, True, node.var_name_tok))
+    elif isinstance(node, ChetoDefNode):
+        symbols.append(Symbol(node.var_name_tok.value, NAME, True, node.var_name_tok))
+        if node.parent_class is not None:
+            symbols.append(Symbol(node.parent_class.value, NAME, False, node.parent_class))
+    elif isinstance(node, PoneleQueAccessNode):
+        symbols.append(Symbol(node.var_name_tok.value, NAME, False, node.var_name_tok))
+    elif isinstance(node, InstanceNode):
+        symbols.append(Symbol(node.class_name_tok.value, NAME, False, node.class_name_tok))
+    elif isinstance(node, MethodCallNode):
+        symbols.append(Symbol(node.method_name_tok.value, METHOD, False, node.method_name_tok))
+
+    for slot in type(node).__slots__:
+        collect_children(getattr(node, slot), symbols)
+
+def collect_children(value, symbols: List[Symbol]) -> None:
+    """
+    Collect the symbols of the nodes found in the value of a node's field.
+    """
+    if isinstance(value, Node):
+        collect_symbols(value, symbols)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            collect_children(item, symbols)
+    elif isinstance(value, dict):
+        for item in value.values():
+            collect_children(item, symbols)
+
+def path_to_uri(path) -> str:
+    return Path(path).resolve().as_uri()
+
+def uri_to_path(uri: str) -> Path:
+    return Path(unquote(urlparse(uri).path))
+
+class Document:
+    """
+    A Lunfardo file known to the server, either open in the editor or read from disk.
+    """
+
+    def __init__(self, uri: str, text: str, lunfardo: Lunfardo, version = None) -> None:
+        """
+        Initialize a Document.
+
+        Args:
+            uri (str): The URI of the file.
+            text (str): The text of the file.
+            lunfardo (Lunfardo): The instance the document's session is created with.
+            version (int, optional): The version of the text, as numbered by the editor.
+        """
+        self.uri = uri
+        self.version = version
+        self.session = Session(lunfardo, fn = str(uri_to_path(uri)))
+        self.segment_symbols: Dict[Segment, List[Symbol]] = {}
+        self._symbols: Dict[Tuple[str, str], List[Symbol]] = {}
+        self._dirty = True
+        self._first_lines = None
+        self.session.set_text(text)
+
+    def edit(self, start: dict, end: dict, text: str) -> None:
+        """
+        Replace a range of the document, given as LSP positions.
+
+        Args:
+            start (dict): The first position to replace ({"line", "character"}).
+            end (dict): The position right after the last one to replace.
+            text (str): The text to put in the range.
+        """
+        self.session.edit(self.offset_at(start), self.offset_at(end), text)
+        self._dirty = True
+        self._first_lines = None
+
+    def set_text(self, text: str) -> None:
+        """
+        Replace the whole document.
+        """
+        self.session.set_text(text)
+        self._dirty = True
+        self._first_lines = None
+
+    def offset_at(self, position: dict) -> int:
+        """
+        Convert an LSP position to an offset in the document.
+
+        Args:
+            position (dict): The position ({"line", "character"}, both zero-based).
+
+        Returns:
+            int: The offset, clamped to the document.
+        """
+        segments = self.session.segments
+        offsets = self.session.offsets
+        if not segments:
+            return 0
+
+        if self._first_lines is None:
+            self._first_lines = [segment.source.first_line for segment in segments]
+
+        line = position["line"]
+        idx = max(bisect_right(self._first_lines, line) - 1, 0)
+        text = segments[idx].text
+        line_start = 0
+        for _ in range(line - self._first_lines[idx]):
+            line_start = text.find('\n', line_start) + 1
+            if line_start == 0:
+                return offsets[idx + 1]
+
+        line_end = text.find('\n', line_start)
+        if line_end == -1:
+            line_end = len(text)
+        return offsets[idx] + min(line_start + position["character"], line_end)
+
+    def segment_at(self, position: dict) -> Tuple[Optional[Segment], int]:
+        """
+        Find the segment at an LSP position.
+
+        Returns:
+            tuple: The segment (or None) and the offset of the position in its text.
+        """
+        offset = self.offset_at(position)
+        offsets = self.session.offsets
+        idx = bisect_right(offsets, offset) - 1
+        if idx >= len(self.session.segments):
+            return None, 0
+        return self.session.segments[idx], offset - offsets[idx]
+
+    def symbols(self) -> Dict[Tuple[str, str], List[Symbol]]:
+        """
+        The symbols of the document by (name, kind).
+
+        Only the segments added since the last call are walked, and only the
+        symbols of the segments removed since then are dropped.
+        """
+        if self._dirty:
+            symbols = self._symbols
+            segment_symbols = self.segment_symbols
+            current = set(self.session.segments)
+
+            for segment in segment_symbols.keys() - current:
+                for symbol in segment_symbols.pop(segment):
+                    symbols[(symbol.name, symbol.kind)].remove(symbol)
+
+            for segment in current - segment_symbols.keys():
+                found = []
+                for node in segment.nodes:
+                    collect_symbols(node, found)
+                segment_symbols[segment] = found
+                for symbol in found:
+                    symbols.setdefault((symbol.name, symbol.kind), []).append(symbol)
+
+            self._dirty = False
+
+        return self._symbols
+
+    def find(self, name: str, kind: str) -> List[Symbol]:
+        """
+        The occurrences of a name in the document, in source order.
+        """
+        found = self.symbols().get((name, kind), ())
+        return sorted(found, key = lambda symbol: (symbol.tok.pos_start.ln, symbol.tok.pos_start.col))
+
+    def symbol_at(self, position: dict) -> Optional[Symbol]:
+        """
+        Find the symbol under an LSP position.
+        """
+        segment, offset = self.segment_at(position)
+        if segment is None:
+            return None
+
+        self.symbols()
+        for symbol in self.segment_symbols.get(segment, ()):
+            if symbol.tok.start <= offset <= symbol.tok.end:
+                return symbol
+
+        return None
+
+    def diagnostics(self) -> List[dict]:
+        """
+        The syntax errors of the document, as LSP diagnostics.
+        """
+        return [
+            {
+                "range": location_range(error.pos_start, error.pos_end),
+                "severity": 1,
+                "source": "lunfardo",
+                "message": f'{error.error_name.strip()}: {error.details}',
+            }
+            for error in self.session.diagnostics()
+        ]
+
+def location_range(pos_start, pos_end) -> dict:
+    return {
+        "start": {"line": pos_start.ln, "character": pos_start.col},
+        "end": {"line": pos_end.ln, "character": pos_end.col},
+    }
+
+class LanguageServer:
+    """
+    Handles the LSP messages sent by an editor.
+
+    Every message is dispatched to the `handle_<method>` method with the same
+    name as its LSP method ('/' replaced by '_'), if there is one.
+    """
+
+    def __init__(self, output: Optional[BinaryIO] = None) -> None:
+        """
+        Initialize a LanguageServer.
+
+        Args:
+            output (BinaryIO, optional): Where to write the notifications sent to the editor
+                (e.g. diagnostics). Defaults to stdout.
+        """
+        self.output = output if output is not None else sys.stdout.buffer
+        self.lunfardo = Lunfardo()
+        self.documents: Dict[str, Document] = {}
+        self.workspace_documents: Dict[str, Document] = {}
+        self.root = None
+        self.workspace_indexed = False
+        self.shutdown_requested = False
+        self.exited = False
+
+    # MARK: Transport
+    def serve(self, stream: BinaryIO) -> int:
+        """
+        Read messages from a stream and answer them until the editor exits.
+
+        Args:
+            stream (BinaryIO): The stream to read from (usually stdin).
+
+        Returns:
+            int: The exit code of the server.
+        """
+        while not self.exited:
+            message = read_message(stream)
+            if message is None:
+                break
+
+            response = self.handle(message)
+            if response is not None:
+                write_message(self.output, response)
+
+        return 0 if self.shutdown_requested else 1
+
+    def handle(self, message: dict) -> Optional[dict]:
+        """
+        Handle one message.
+
+        Args:
+            message (dict): The JSON-RPC request or notification.
+
+        Returns:
+            dict | None: The response for a request, None for a notification.
+        """
+        method = message.get("method", "")
+        handler = getattr(self, "handle_" + method.replace("/", "_"), None)
+        is_request = "id" in message
+
+        if handler is None:
+            if not is_request:
+                return None
+            return {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": METHOD_NOT_FOUND, "message": f'Method not found: {method}'},
+            }
+
+        try:
+            result = handler(message.get("params") or {})
+        except Exception as e:
+            # A bug in one request must not take the whole server down.
+            if not is_request:
+                return None
+            return {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": INTERNAL_ERROR, "message": f'{type(e).__name__}: {e}'},
+            }
+
+        if not is_request:
+            return None
+        return {"jsonrpc": "2.0", "id": message["id"], "result": result}
+
+    def notify(self, method: str, params: dict) -> None:
+        write_message(self.output, {"jsonrpc": "2.0", "method": method, "params": params})
+
+    # MARK: Lifecycle
+    def handle_initialize(self, params: dict) -> dict:
+        root_uri = params.get("rootUri")
+        if root_uri:
+            self.root = uri_to_path(root_uri)
+        elif params.get("rootPath"):
+            self.root = Path(params["rootPath"])
+
+        return {
+            "capabilities": {
+                "textDocumentSync": {"openClose": True, "change": 2, "save": True},
+                "definitionProvider": True,
+                "referencesProvider": True,
+            },
+            "serverInfo": {"name": "lunfardo"},
+        }
+
+    def handle_initialized(self, params: dict) -> None:
+        return None
+
+    def handle_shutdown(self, params: dict) -> None:
+        self.shutdown_requested = True
+        return None
+
+    def handle_exit(self, params: dict) -> None:
+        self.exited = True
+        return None
+
+    # MARK: Documents
+    def handle_textDocument_didOpen(self, params: dict) -> None:
+        item = params["textDocument"]
+        document = Document(item["uri"], item["text"], self.lunfardo, item.get("version"))
+        self.documents[item["uri"]] = document
+        self.workspace_documents.pop(item["uri"], None)
+        self.publish_diagnostics(document)
+
+    def handle_textDocument_didChange(self, params: dict) -> None:
+        item = params["textDocument"]
+        document = self.documents.get(item["uri"])
+        if document is None:
+            return
+
+        for change in params["contentChanges"]:
+            if "range" in change:
+                document.edit(change["range"]["start"], change["range"]["end"], change["text"])
+            else:
+                document.set_text(change["text"])
+
+        document.version = item.get("version")
+        self.publish_diagnostics(document)
+
+    def handle_textDocument_didClose(self, params: dict) -> None:
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        # The file on disk may not have the changes made in the editor.
+        self.workspace_indexed = False
+        self.notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def handle_textDocument_didSave(self, params: dict) -> None:
+        return None
+
+    def handle_workspace_didChangeWatchedFiles(self, params: dict) -> None:
+        for change in params.get("changes", ()):
+            self.workspace_documents.pop(change["uri"], None)
+        self.workspace_indexed = False
+
+    def publish_diagnostics(self, document: Document) -> None:
+        params = {"uri": document.uri, "diagnostics": document.diagnostics()}
+        if document.version is not None:
+            params["version"] = document.version
+        self.notify("textDocument/publishDiagnostics", params)
+
+    def all_documents(self) -> List[Document]:
+        """
+        The open documents, followed by the other Lunfardo files of the workspace.
+
+        The files of the workspace are read and parsed the first time they are
+        needed, and again only after they change on disk.
+        """
+        if not self.workspace_indexed and self.root is not None and self.root.is_dir():
+            for path in sorted(self.root.rglob("*.lunf")):
+                uri = path_to_uri(path)
+                if uri in self.documents or uri in self.workspace_documents:
+                    continue
+                try:
+                    text = path.read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    continue
+                self.workspace_documents[uri] = Document(uri, text, self.lunfardo)
+        self.workspace_indexed = True
+
+        return [*self.documents.values(), *self.workspace_documents.values()]
+
+    # MARK: Navigation
+    def find_symbol(self, params: dict) -> Tuple[Optional[Document], Optional[Symbol]]:
+        document = self.documents.get(params["textDocument"]["uri"])
+        if document is None:
+            return None, None
+        return document, document.symbol_at(params["position"])
+
+    def handle_textDocument_definition(self, params: dict) -> List[dict]:
+        document, symbol = self.find_symbol(params)
+        if symbol is None:
+            return []
+
+        # Definitions in the same document come first.
+        documents = [document, *(other for other in self.all_documents() if other is not document)]
+        return [
+            location(other.uri, found.tok)
+            for other in documents
+            for found in other.find(symbol.name, symbol.kind)
+            if found.is_definition
+        ]
+
+    def handle_textDocument_references(self, params: dict) -> List[dict]:
+        document, symbol = self.find_symbol(params)
+        if symbol is None:
+            return []
+
+        include_declaration = params.get("context", {}).get("includeDeclaration", True)
+        found_symbols = [
+            (other, found)
+            for other in self.all_documents()
+            for found in other.find(symbol.name, symbol.kind)
+        ]
+
+        # Only 'laburo' and 'cheto' names (and methods) have references.
+        if not any(found.is_definition for _, found in found_symbols):
+            return []
+
+        return [
+            location(other.uri, found.tok)
+            for other, found in found_symbols
+            if include_declaration or not found.is_definition
+        ]
+
+def location(uri: str, tok: Token) -> dict:
+    return {"uri": uri, "range": location_range(tok.pos_start, tok.pos_end)}
+
+def read_message(stream: BinaryIO) -> Optional[dict]:
+    """
+    Read one JSON-RPC message, with its Content-Length header.
+
+    Returns:
+        dict | None: The message, or None at the end of the stream.
+    """
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+
+        line = line.strip()
+        if not line:
+            if length is not None:
+                break
+            continue
+
+        name, _, value = line.decode("ascii").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+
+    return json.loads(stream.read(length).decode("utf-8"))
+
+def write_message(stream: BinaryIO, message: dict) -> None:
+    """
+    Write one JSON-RPC message, with its Content-Length header.
+    """
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    stream.flush()
+
+def main() -> None:
+    """Run the language server over stdin and stdout."""
+    sys.setrecursionlimit(12025)
+    server = LanguageServer(sys.stdout.buffer)
+    sys.exit(server.serve(sys.stdin.buffer))
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,9 @@ This module contains the global symbol table setup, execution function,
 and the main REPL (Read-Eval-Print Loop) for the Lunfardo interpreter.
 """
 import sys
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Iterable, Optional, Tuple
 from os import getcwd
 from .lexer import Lexer
 from .lunfardo_parser import Parser
@@ -14,12 +15,112 @@ from .lunfardo_types import Curro, Boloodean, Nada
 from .interpreter import Interpreter
 from .symbol_table import SymbolTable
 from .context import Context
+from .session import Session
+from .budget import Budget
+
+BUILTIN_DIR = Path(__file__).parent / "builtin"
+
+class GlobalSnapshot:
+    """
+    A frozen copy of an initialized global environment.
+
+    Holds the global symbols and the modules imported into the global scope,
+    so new Lunfardo instances can be created from it without running the
+    setup (or the module imports) again.
+    """
+
+    def __init__(self, symbols: Dict, modules: Dict) -> None:
+        """
+        Initialize a GlobalSnapshot.
+
+        Args:
+            symbols (dict): The global symbols, by name.
+            modules (dict): The modules imported into the global scope, by name.
+        """
+        self.symbols = symbols
+        self.modules = modules
 
 class Lunfardo:
 
-    def __init__(self) -> None:
+    _default_snapshot: Optional[GlobalSnapshot] = None
+
+    def __init__(self, snapshot: Optional[GlobalSnapshot] = None) -> None:
+        """
+        Initialize a Lunfardo instance.
+
+        Args:
+            snapshot (GlobalSnapshot, optional): The global environment to start from.
+                Defaults to the builtins-only environment, which is built once per process.
+        """
+        self.restore(snapshot or Lunfardo.default_snapshot())
+
+    @classmethod
+    def default_snapshot(cls) -> GlobalSnapshot:
+        """
+        Return the snapshot of the builtins-only global environment, building it on first use.
+        """
+        if cls._default_snapshot is None:
+            lunfardo = cls.__new__(cls)
+            lunfardo.global_symbol_table = SymbolTable()
+            lunfardo.modules = {}
+            lunfardo._setup_global_symbol_table()
+            cls._default_snapshot = lunfardo.snapshot()
+        return cls._default_snapshot
+
+    def snapshot(self) -> GlobalSnapshot:
+        """
+        Capture the current global environment, including the preloaded modules.
+
+        Returns:
+            GlobalSnapshot: A snapshot that can be passed to Lunfardo() or restore().
+        """
+        return GlobalSnapshot(
+            self.global_symbol_table.symbols.copy(),
+            {name: Lunfardo._fork_module(module) for name, module in self.modules.items()}
+        )
+
+    def restore(self, snapshot: GlobalSnapshot) -> None:
+        """
+        Replace the global environment of this instance with a copy of a snapshot.
+
+        Args:
+            snapshot (GlobalSnapshot): The snapshot to restore.
+        """
         self.global_symbol_table = SymbolTable()
-        self._setup_global_symbol_table()
+        self.global_symbol_table.symbols = snapshot.symbols.copy()
+        self.modules = {name: Lunfardo._fork_module(module) for name, module in snapshot.modules.items()}
+
+    def fork(self) -> "Lunfardo":
+        """
+        Create a new Lunfardo instance with a copy of this instance's global environment.
+
+        Names defined or imported in the fork do not affect this instance, and vice versa.
+        """
+        return Lunfardo(self.snapshot())
+
+    def preload(self, *module_names: Iterable[str]) -> None:
+        """
+        Import builtin modules into the global environment, so they are part of every snapshot.
+
+        Args:
+            module_names (str): The names of the modules to import (e.g. "lacompu").
+
+        Raises:
+            ValueError: If any of the imports fails.
+        """
+        for module_name in module_names:
+            _, error, _ = self.execute("<precarga>", f"importar {module_name}", cwd=BUILTIN_DIR)
+            if error:
+                raise ValueError(error.as_string())
+
+    @staticmethod
+    def _fork_module(module):
+        """
+        Copy an imported module, giving it its own context and symbol table.
+        """
+        if module.context is None:
+            return module
+        return module.copy().set_context(module.context.copy())
 
     def _setup_global_symbol_table(self) -> None:
         self.global_symbol_table.set("nada", Nada.nada)
@@ -51,27 +152,48 @@ class Lunfardo:
         self.global_symbol_table.set("linpiavidrios", Curro.limpiavidrios)
         self.global_symbol_table.set("winpiavidrios", Curro.limpiavidrios)
         self.global_symbol_table.set("longitud", Curro.longitud)
+        # Generador related
+        self.global_symbol_table.set("siguiente", Curro.siguiente)
+        self.global_symbol_table.set("juntar", Curro.juntar)
         self.global_symbol_table.set("ejecutar", Curro.ejecutar)
         self.global_symbol_table.set("renuncio", Curro.renuncio)
         self.global_symbol_table.set("contexto", Curro.contexto_global)
         self.global_symbol_table.set("asciiAchamu", Curro.asciiAchamu)
 
-    def execute(self, fn: str, text: str, cwd: str = None, file_path: str = None, parent_context: Context = None, interpreter_cls: Interpreter = Interpreter) -> Tuple:
+    def execute(self, fn: str, text: str, cwd: str = None, file_path: str = None, parent_context: Context = None, interpreter_cls: Interpreter = Interpreter, budget: Optional[Budget] = None) -> Tuple:
         """
         Execute Lunfardo code.
 
         Args:
             fn (str): The filename or source identifier.
             text (str): The Lunfardo code to execute.
+            interpreter_cls (type, optional): The interpreter to run the code with.
+            budget (Budget, optional): The limits of the run. Modules imported by the
+                code run within the same budget.
 
         Returns:
-            tuple: A tuple containing the execution result and any error encountered.
+            tuple: A tuple containing the execution result, any error encountered and
+                the interpreter (None if the code did not get to run).
         """
-        # Increase Python's recursion limit to avoid hitting the recursion limit prematurely
-        # 12025 is the maximum number of recursive calls that can be made in the Lunfardo's interpreter at maximum 
-        # Lunfardo's recursive calls (1000) at the moment.
-        sys.setrecursionlimit(12025)
+        node, error = self.parse(fn, text)
+        if error or node is None:
+            return None, error, None
+
+        return self.run(fn, node, cwd, file_path, parent_context, interpreter_cls, budget)
 
+    @staticmethod
+    def parse(fn: str, text: str) -> Tuple:
+        """
+        Lex and parse Lunfardo code, without running it.
+
+        Args:
+            fn (str): The filename or source identifier.
+            text (str): The Lunfardo code.
+
+        Returns:
+            tuple: The AST of the code (None if it has no statements, or on error)
+                and any error encountered.
+        """
         lexer = Lexer(fn, text)
         tokens, error = lexer.make_tokens()
         if error:
@@ -88,47 +210,150 @@ class Lunfardo:
         if ast.error:
             return None, ast.error
 
-        # Run
-        interpreter = interpreter_cls()
-        context = Context(fn, cwd = cwd, file = file_path)
-        context.symbol_table = self.global_symbol_table
-        if parent_context:
-            context.parent = parent_context
-        
-        result = interpreter.visit(ast.node, context)
+        return ast.node, None
+
+    def run(self, fn: str, node, cwd: str = None, file_path: str = None, parent_context: Context = None, interpreter_cls: Interpreter = Interpreter, budget: Optional[Budget] = None) -> Tuple:
+        """
+        Run parsed Lunfardo code (see `parse`) in this instance's global environment.
+
+        The AST is not changed by running it, so it can be run again, in this or
+        another instance.
+
+        Args:
+            fn (str): The filename or source identifier.
+            node (Node): The AST of the code.
+            interpreter_cls (type, optional): The interpreter to run the code with.
+            budget (Budget, optional): The limits of the run.
+
+        Returns:
+            tuple: A tuple containing the execution result, any error encountered and
+                the interpreter.
+        """
+        # Increase Python's recursion limit to avoid hitting the recursion limit prematurely
+        # 12025 is the maximum number of recursive calls that can be made in the Lunfardo's interpreter at maximum 
+        # Lunfardo's recursive calls (1000) at the moment.
+        sys.setrecursionlimit(12025)
+
+        with budget or nullcontext():
+            interpreter = interpreter_cls()
+            context = Context(fn, cwd = cwd, file = file_path)
+            context.symbol_table = self.global_symbol_table
+            context.modules = self.modules
+            if parent_context:
+                context.parent = parent_context
+
+            result = interpreter.visit(node, context)
 
         return result.value, result.error, interpreter
 
-    def execute_file(self, script_path: str) -> None:
-        """Execute a Lunfardo file."""
+    def execute_stream(self, fn: str, chunks: Iterable[str], cwd: str = None, file_path: str = None, parent_context: Context = None, interpreter_cls: Interpreter = Interpreter, budget: Optional[Budget] = None) -> Tuple:
+        """
+        Execute Lunfardo code as it is read, one top-level statement at a time.
+
+        The source is lexed and parsed lazily, and each top-level statement runs
+        as soon as it has been parsed, so only the tokens of the statement being
+        parsed are kept in memory. Unlike `execute`, the statements before a
+        lexing or syntax error have already run when the error is reported.
+
+        Args:
+            fn (str): The filename or source identifier.
+            chunks (Iterable[str]): The Lunfardo code, in chunks (e.g. an open file, line by line).
+            budget (Budget, optional): The limits of the run, shared by all the statements.
+
+        Returns:
+            tuple: A tuple containing the value of the last statement, any error encountered and the interpreter.
+        """
+        sys.setrecursionlimit(12025)
+
+        lexer = Lexer(fn, "", chunks)
+        parser = Parser(lexer.iter_tokens())
+
+        with budget or nullcontext():
+            interpreter = interpreter_cls()
+            context = Context(fn, cwd = cwd, file = file_path)
+            context.symbol_table = self.global_symbol_table
+            context.modules = self.modules
+            if parent_context:
+                context.parent = parent_context
+
+            value = None
+            for res in parser.iter_statements():
+                if lexer.error:
+                    return None, lexer.error, interpreter
+
+                if res.error:
+                    return None, res.error, interpreter
+
+                result = interpreter.visit(res.node, context)
+                if result.error:
+                    return None, result.error, interpreter
+
+                value = result.value
+                if result.should_return():
+                    break
+
+        return value, lexer.error, interpreter
+
+    def execute_file(self, script_path: str, interpreter_cls: Interpreter = Interpreter, budget: Optional[Budget] = None) -> Optional[Interpreter]:
+        """Execute a Lunfardo file, returning the interpreter it ran with."""
         try:
             with open(script_path, "r", encoding="utf-8") as f:
                 code = f.read()
             file_path = Path(script_path)
-            _, error, _ = self.execute(fn=file_path, text=code, cwd=file_path.parent)
+            _, error, interpreter = self.execute(fn=file_path, text=code, cwd=file_path.parent, interpreter_cls=interpreter_cls, budget=budget)
 
             if error:
                 print(error.as_string())
 
+            return interpreter
+
         except FileNotFoundError:
             print(f"Error: File '{script_path}' not found.")
+            return None
+
+    def execute_stream_file(self, stream, fn, interpreter_cls: Interpreter = Interpreter, budget: Optional[Budget] = None) -> None:
+        """Execute Lunfardo code from an open text stream, statement by statement."""
+        cwd = fn.parent if isinstance(fn, Path) else getcwd()
+        _, error, _ = self.execute_stream(fn=fn, chunks=stream, cwd=cwd, interpreter_cls=interpreter_cls, budget=budget)
+
+        if error:
+            print(error.as_string())
+
+    def run_repl(self, interpreter_cls: Interpreter = Interpreter) -> None:
+        """
+        Run the Lunfardo REPL (Read-Eval-Print Loop).
 
-    def run_repl(self) -> None:
-        """Run the Lunfardo REPL (Read-Eval-Print Loop)."""
+        The lines typed are added to a Session, so a statement that spans several
+        lines (e.g. a 'laburo') runs once its last line has been typed.
+        """
         default_color = "\x1b[;;m"
+        session = Session(self, fn="<stdin>", cwd=getcwd(), interpreter_cls=interpreter_cls)
         while True:
+            prompt = "........ > " if session.incomplete else "Lunfardo > "
             try:
-                text = input(f"{default_color}Lunfardo > ")
+                text = input(f"{default_color}{prompt}")
             except KeyboardInterrupt:
+                if session.incomplete:
+                    session.discard_pending()
+                    print()
+                    continue
+                print("\nExiting REPL.")
+                break
+            except EOFError:
                 print("\nExiting REPL.")
                 break
 
-            if text.strip() == "":
+            if text.strip() == "" and not session.incomplete:
+                continue
+
+            session.append(text + "\n")
+            if session.incomplete:
                 continue
 
-            result, error, _ = self.execute(fn="<stdin>", text=text, cwd=getcwd())
+            values, error = session.run()
+            for value in values:
+                print(repr(value))
 
             if error:
                 print(error.as_string())
-            elif result:
-                print(repr(result.elements[0]) if len(result.elements) == 1 else repr(result))
\ No newline at end of file
+                session.discard_pending()
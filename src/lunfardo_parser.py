@@ -10,8 +10,9 @@ from errors.errors import NotHashableBardo
 from .constants.tokens import *
 from .nodes import *
 from .errors import InvalidSyntaxBardo, InvalidTypeBardo, Bardo
-from .lunfardo_token import Token
-from typing import Union, Self, Optional, Tuple, Callable
+from .lunfardo_token import Token, TokenStream
+from collections import Counter
+from typing import Union, Self, Optional, Tuple, Iterator, Callable, Dict
 
 LunfardoNode = Union[
     NumeroNode,
@@ -41,6 +42,69 @@ LunfardoNode = Union[
     BardeaNode
 ]
 
+LOGIC_PRECEDENCE = 1
+COMPARISON_PRECEDENCE = 2
+ARITH_PRECEDENCE = 3
+TERM_PRECEDENCE = 4
+POW_PRECEDENCE = 5
+
+BINARY_PRECEDENCE = {
+    TT_EE: COMPARISON_PRECEDENCE,
+    TT_NE: COMPARISON_PRECEDENCE,
+    TT_LT: COMPARISON_PRECEDENCE,
+    TT_GT: COMPARISON_PRECEDENCE,
+    TT_LTE: COMPARISON_PRECEDENCE,
+    TT_GTE: COMPARISON_PRECEDENCE,
+    TT_PLUS: ARITH_PRECEDENCE,
+    TT_MINUS: ARITH_PRECEDENCE,
+    TT_MUL: TERM_PRECEDENCE,
+    TT_DIV: TERM_PRECEDENCE,
+    TT_POW: POW_PRECEDENCE,
+}
+
+KEYWORD_PRECEDENCE = {
+    "y": LOGIC_PRECEDENCE,
+    "o": LOGIC_PRECEDENCE,
+}
+
+BLOCK_END_KEYWORDS = frozenset(("chau", "osi", "sino", "sibardea"))
+
+EXPR_START_TOKENS = frozenset((
+    TT_INT, TT_FLOAT, TT_STRING, TT_IDENTIFIER,
+    TT_PLUS, TT_MINUS, TT_LPAREN, TT_LSQUARE, TT_LCURLY,
+))
+
+EXPR_START_KEYWORDS = frozenset((
+    "poneleque", "truchar", "si", "para", "mientras", "laburo",
+    "cheto", "nuevo", "importar", "proba", "bardea",
+))
+
+SIMPLE_OPERAND_NODES = {
+    TT_INT: NumeroNode,
+    TT_FLOAT: NumeroNode,
+    TT_STRING: ChamuyoNode,
+    TT_IDENTIFIER: PoneleQueAccessNode,
+}
+
+# Rules whose results are cached when the parser memoizes.
+MEMOIZED_RULES = ("statements", "statement", "expr", "binary_expr", "call", "atom")
+
+def produces(node: Node) -> bool:
+    """
+    Check whether a laburo body has a 'producir' (not counting the laburos defined in it).
+
+    Args:
+        node (Node): The body of the laburo.
+
+    Returns:
+        bool: True if calling the laburo makes a generador.
+    """
+    if isinstance(node, ProducirNode):
+        return True
+    if isinstance(node, LaburoDefNode):
+        return False
+    return any(produces(child) for child in node.children())
+
 # MARK: Parser
 class Parser:
     """
@@ -50,49 +114,111 @@ class Parser:
     representing the structure and meaning of the Lunfardo code.
     """
 
-    def __init__(self, tokens) -> None:
+    def __init__(self, tokens, memoize: bool = False) -> None:
         """
         Initialize the Parser with a list of tokens.
 
         Args:
-            tokens (list): A list of Token objects to be parsed.
+            tokens (list | Iterable[Token] | TokenStream): The Token objects to be parsed.
+                Anything other than a list is read lazily, as the parser needs it.
+            memoize (bool, optional): Cache the result of every rule in MEMOIZED_RULES
+                by token index (packrat parsing), so parsing the same tokens again with
+                the same rule is O(1). Defaults to False.
         """
-        self.tokens = tokens
+        self.tokens = tokens if isinstance(tokens, TokenStream) else TokenStream(tokens)
         self.tok_idx = -1
-        self.except_keyword_seen = False
+        self.memo = None
+
+        if memoize:
+            self.memo = {}
+            self.memo_hits = Counter()
+            self.memo_misses = Counter()
+            self.memo_hit_lines = Counter()
+
+            # Instance attributes shadow the rules, so the recursive calls between
+            # rules go through the cache too, and a parser that does not memoize
+            # pays nothing for it.
+            for rule_name in MEMOIZED_RULES:
+                setattr(self, rule_name, self.memoized(rule_name, getattr(self, rule_name)))
+
         self.advance()
 
-    def advance(self) -> Token:
+    def memoized(self, rule_name: str, rule: Callable) -> Callable:
         """
-        Advance to the next token in the token list.
+        Wrap a parser rule so its results are cached by (rule, arguments, token index).
+
+        Args:
+            rule_name (str): The name of the rule.
+            rule (Callable): The bound rule method.
 
         Returns:
-            Token: The current token after advancing.
+            Callable: The rule, with the cache in front of it.
         """
-        self.tok_idx += 1
-        self.update_current_tok()
-        return self.current_tok
+        memo = self.memo
+
+        def memoized_rule(*args) -> "ParseResult":
+            key = (rule_name, args, self.tok_idx)
+            entry = memo.get(key)
+
+            if entry is not None:
+                res, end_idx, end_tok = entry
+                self.memo_hits[rule_name] += 1
+                self.memo_hit_lines[(rule_name, self.current_tok.pos_start.ln + 1)] += 1
+                self.tok_idx = end_idx
+                self.current_tok = end_tok
+                return res.copy()
 
-    def reverse(self, amount: int = 1) -> Token:
+            self.memo_misses[rule_name] += 1
+            res = rule(*args)
+            memo[key] = (res.copy(), self.tok_idx, self.current_tok)
+            return res
+
+        return memoized_rule
+
+    def memo_report(self) -> Dict:
         """
-        Move the token index backwards by the specified amount.
+        Summarize how the memo table was used.
 
-        Args:
-            amount (int): The number of tokens to move backwards. Defaults to 1.
+        Returns:
+            dict: The hits (re-parses avoided) and misses of every rule, and the
+                source lines where re-parses were avoided the most, as
+                (rule, line, hits) tuples.
+        """
+        if self.memo is None:
+            return {}
+
+        return {
+            "rules": {
+                rule_name: {"hits": self.memo_hits[rule_name], "misses": self.memo_misses[rule_name]}
+                for rule_name in MEMOIZED_RULES
+            },
+            "hit_lines": [
+                (rule_name, line, hits)
+                for (rule_name, line), hits in self.memo_hit_lines.most_common(10)
+            ],
+        }
+
+    def advance(self) -> Token:
+        """
+        Advance to the next token in the token list.
 
         Returns:
-            Token: The current token after reversing.
+            Token: The current token after advancing.
         """
-        self.tok_idx -= amount
-        self.update_current_tok()
+        self.tok_idx += 1
+        tok = self.tokens.get(self.tok_idx)
+        if tok is not None:
+            self.current_tok = tok
         return self.current_tok
 
     def update_current_tok(self) -> None:
         """
         Update the current token based on the current token index.
         """
-        if self.tok_idx >= 0 and self.tok_idx < len(self.tokens):
-            self.current_tok = self.tokens[self.tok_idx]
+        if self.tok_idx >= 0:
+            tok = self.tokens.get(self.tok_idx)
+            if tok is not None:
+                self.current_tok = tok
 
     def peek_next_token(self, quantity: int = 1) -> Optional[Token]:
         """
@@ -101,9 +227,7 @@ class Parser:
         Returns:
             Optional[Token]: The next token if it exists, None otherwise.
         """
-        if self.tok_idx + quantity < len(self.tokens):
-            return self.tokens[self.tok_idx + quantity]
-        return None
+        return self.tokens.get(self.tok_idx + quantity)
 
     def parse(self) -> Tuple[Optional["ParseResult"], bool]:
         """
@@ -118,79 +242,120 @@ class Parser:
         res = self.statements()
         if not res.error and self.current_tok.type != TT_EOF:
             return (
-                res.failure(
-                    InvalidSyntaxBardo(
-                        self.current_tok.pos_start,
-                        self.current_tok.pos_end,
-                        "Se esperaba '+', '-', '*', '/', '^', '==', '!=', '<', '>', '<=', '>=', 'y' ó 'o'",
-                    )
-                ),
+                res.failure(self.expected_operator_error()),
                 False,
             )
         return res, False
 
+    def expected_operator_error(self) -> InvalidSyntaxBardo:
+        """
+        Build the error for a token that cannot follow a complete statement.
+
+        Returns:
+            InvalidSyntaxBardo: The error, at the current token.
+        """
+        return InvalidSyntaxBardo(
+            self.current_tok.pos_start,
+            self.current_tok.pos_end,
+            "Se esperaba '+', '-', '*', '/', '^', '==', '!=', '<', '>', '<=', '>=', 'y' ó 'o'",
+        )
+
+    def iter_statements(self) -> Iterator["ParseResult"]:
+        """
+        Parse the top-level statements one at a time.
+
+        Each statement is yielded as soon as it is parsed, and the tokens before
+        it are released from the token stream, so only the tokens of the current
+        statement are kept in memory.
+
+        Yields:
+            ParseResult: The result of parsing each statement. Parsing stops after
+                the first result with an error.
+        """
+        while True:
+            while self.current_tok.type == TT_NEWLINE:
+                self.advance()
+
+            if self.current_tok.type == TT_EOF:
+                return
+
+            res = ParseResult()
+            if self.at_block_end():
+                res.failure(self.expected_operator_error())
+            else:
+                res.success(res.register(self.statement()))
+
+            if not res.error and self.current_tok.type not in (TT_NEWLINE, TT_EOF):
+                res.failure(self.expected_operator_error())
+
+            if res.error:
+                yield res
+                return
+
+            self.tokens.release(self.tok_idx)
+            if self.memo is not None:
+                self.memo.clear()
+            yield res
+
     # MARK: Parser.statements
+    def at_block_end(self) -> bool:
+        """
+        Check whether the current token ends a block of statements.
+
+        Returns:
+            bool: True for EOF and the keywords in BLOCK_END_KEYWORDS.
+        """
+        tok = self.current_tok
+        return tok.type == TT_EOF or (tok.type == TT_KEYWORD and tok.value in BLOCK_END_KEYWORDS)
+
+    def starts_expr(self) -> bool:
+        """
+        Check whether the current token can start an expression.
+
+        Returns:
+            bool: True if the current token is in the FIRST set of 'expr'.
+        """
+        tok = self.current_tok
+        if tok.type == TT_KEYWORD:
+            return tok.value in EXPR_START_KEYWORDS
+
+        return tok.type in EXPR_START_TOKENS
+
     def statements(self) -> "ParseResult":
         """
         Parse a sequence of statements.
 
+        The sequence ends, without consuming it, at the first token that ends a
+        block ('chau', 'osi', 'sino', 'sibardea' or EOF) or at a statement that
+        is not followed by a new line.
+
         Returns:
             ParseResult: The result of parsing the statements.
         """
         res = ParseResult()
         statements = []
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
         while self.current_tok.type == TT_NEWLINE:
             res.register_advance()
             self.advance()
 
-        res.reset_no_result()
-        statement = res.register(self.statement())
-        if res.error:
-            return res
-
-        statements.append(statement)
+        while not self.at_block_end():
+            statement = res.register(self.statement())
+            if res.error:
+                return res
 
-        more_statements = True
+            statements.append(statement)
 
-        while True:
-            nl_count = 0
+            if self.current_tok.type != TT_NEWLINE:
+                break
 
             while self.current_tok.type == TT_NEWLINE:
                 res.register_advance()
                 self.advance()
-                nl_count += 1
-
-            if self.current_tok.matches(TT_KEYWORD, "sibardea"):
-                more_statements = False
-                self.except_keyword_seen = True
-
-            if nl_count == 0:
-                more_statements = False
-
-            if not more_statements:
-                break
-            
-            # TODO si el statement no encuentra nodos válidos porque hay un "chau" como siguiente token, no debería devolver un error de invalidsyntaxerror,
-            # sino que debería identificar que terminó el body y que no hay más statements, y luego seguir con el proceso normal.
-            res.reset_no_result()
-            stmnt = self.statement()
-            error_or_statement = res.try_register(stmnt)
-
-            if isinstance(error_or_statement, Bardo):
-                return res.failure(error_or_statement)
-
-            if res.no_result:
-                self.reverse(res.to_reverse_count)
-                more_statements = False
-                continue
-
-            if error_or_statement:
-                statements.append(error_or_statement)
 
         return res.success(
-            CosoNode(statements, pos_start, self.current_tok.pos_end.copy())
+            CosoNode(statements, pos_start, self.current_tok.pos_end)
         )
 
     def statement(self) -> "ParseResult":
@@ -198,25 +363,40 @@ class Parser:
         Parse a single statement in the Lunfardo language.
 
         This method handles various types of statements including 'devolver' (return),
-        'continuar' (continue), 'rajar' (break), and expressions.
+        'producir' (yield), 'continuar' (continue), 'rajar' (break), and expressions.
 
         Returns:
             ParseResult: The result of parsing the statement.
         """
         res = ParseResult()
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
         if self.current_tok.matches(TT_KEYWORD, "devolver"):
             res.register_advance()
             self.advance()
 
-            expr = res.try_register(self.expr())
+            expr = None
+            if self.starts_expr():
+                expr = res.register(self.expr())
+                if res.error:
+                    return res
+
+            return res.success(
+                DevolverNode(expr, pos_start, self.current_tok.pos_end)
+            )
+
+        if self.current_tok.matches(TT_KEYWORD, "producir"):
+            res.register_advance()
+            self.advance()
 
-            if not expr:
-                self.reverse(res.to_reverse_count)
+            expr = None
+            if self.starts_expr():
+                expr = res.register(self.expr())
+                if res.error:
+                    return res
 
             return res.success(
-                DevolverNode(expr, pos_start, self.current_tok.pos_end.copy())
+                ProducirNode(expr, pos_start, self.current_tok.pos_end)
             )
 
         if self.current_tok.matches(TT_KEYWORD, "continuar"):
@@ -224,29 +404,22 @@ class Parser:
             self.advance()
 
             return res.success(
-                ContinuarNode(pos_start, self.current_tok.pos_end.copy())
+                ContinuarNode(pos_start, self.current_tok.pos_end)
             )
 
         if self.current_tok.matches(TT_KEYWORD, "rajar"):
             res.register_advance()
             self.advance()
 
-            return res.success(RajarNode(pos_start, self.current_tok.pos_end.copy()))
+            return res.success(RajarNode(pos_start, self.current_tok.pos_end))
 
-        if self.current_tok.matches(TT_KEYWORD, "chau") or \
-        self.current_tok.matches(TT_KEYWORD, "osi") or \
-        self.current_tok.matches(TT_KEYWORD, "sino") or \
-        self.current_tok.type == TT_EOF:
-            res.no_result = True
-            return res.success(None)
-        
         expr = res.register(self.expr())
         if res.error:
             return res.failure(
                 InvalidSyntaxBardo(
                     self.current_tok.pos_start,
                     self.current_tok.pos_end,
-                    "Se esperaba 'devolver', 'continuar', 'rajar', 'poneleque', 'si', 'para', 'mientras', 'laburo', numero, identificador, '+', '-', '(', '[' ó 'truchar'",
+                    "Se esperaba 'devolver', 'producir', 'continuar', 'rajar', 'poneleque', 'si', 'para', 'mientras', 'laburo', numero, identificador, '+', '-', '(', '[' ó 'truchar'",
                 )
             )
 
@@ -526,114 +699,143 @@ class Parser:
             )
         )
 
-    def power(self) -> "ParseResult":
+    def simple_operand(self, left_prec: Optional[int] = None) -> Optional[LunfardoNode]:
         """
-        Parse a power expression in the Lunfardo language.
+        Parse a number, a string or a variable access that is a whole operand.
+
+        These are the most common operands, so the operator parser handles them
+        without going through `call` and `atom`. The token is only taken as a
+        whole operand if it is not followed by a call, a dot or, when it is the
+        right operand of an operator, by an operator that binds tighter.
 
-        This method handles expressions involving the power operator ('^').
-        It uses the binary operation parsing method with the power token
-        and calls the 'factor' method for the right-hand side of the operation.
+        Args:
+            left_prec (int, optional): The precedence of the operator on the left
+                of the operand, if any.
 
         Returns:
-            ParseResult: The result of parsing the power expression.
+            Optional[LunfardoNode]: The node of the operand, or None (without
+                consuming any token) if the operand is not that simple.
         """
-        return self.bin_op(self.call, (TT_POW,), self.factor)
+        tok = self.current_tok
+        node_class = SIMPLE_OPERAND_NODES.get(tok.type)
+        if node_class is None:
+            return None
+
+        next_tok = self.tokens.get(self.tok_idx + 1)
+        if next_tok is None:
+            return None
+
+        if next_tok.type == TT_KEYWORD:
+            next_prec = KEYWORD_PRECEDENCE.get(next_tok.value)
+        else:
+            next_prec = BINARY_PRECEDENCE.get(next_tok.type)
+            if next_prec is None and (next_tok.type == TT_LPAREN or next_tok.type == TT_DOT):
+                return None
+
+        if left_prec is not None and next_prec is not None and (
+            next_prec > left_prec or next_prec == POW_PRECEDENCE
+        ):
+            return None
 
-    # MARK: power | factor
-    def factor(self) -> "ParseResult":
+        self.advance()
+        return node_class(tok)
+
+    # MARK: Parser.binary_expr
+    def binary_expr(self, min_prec: int = LOGIC_PRECEDENCE) -> "ParseResult":
         """
-        Parse a factor in the Lunfardo language.
+        Parse an operator expression in the Lunfardo language.
+
+        This is a precedence-climbing (Pratt) parser driven by BINARY_PRECEDENCE
+        and KEYWORD_PRECEDENCE. It only consumes operators that bind at least as
+        tight as `min_prec`, so calling it with a given precedence parses the same
+        as the grammar rule of that level:
+
+        - LOGIC_PRECEDENCE: comp-expr ((KEYWORD:Y|KEYWORD:O) comp-expr)*
+        - COMPARISON_PRECEDENCE: comp-expr
+        - ARITH_PRECEDENCE: arith-expr
+        - TERM_PRECEDENCE: term
+        - POW_PRECEDENCE: factor
 
-        This method handles unary operations ('+' or '-') applied to factors,
-        as well as power expressions. It processes the following grammar rule:
-        factor : (PLUS|MINUS) factor | power
+        All operators are left associative except '^', which is right associative.
+        The unary '+' and '-' bind looser than '^' and tighter than everything
+        else, and 'truchar' takes a whole comparison as its operand.
+
+        Args:
+            min_prec (int): The lowest precedence of the operators to consume.
 
         Returns:
-            ParseResult: The result of parsing the factor.
+            ParseResult: The result of parsing the expression, containing
+                        a BinOpNode, a UnaryOpNode or the node of an operand.
         """
         res = ParseResult()
         tok = self.current_tok
 
-        if tok.type in (TT_PLUS, TT_MINUS):
+        if tok.type == TT_PLUS or tok.type == TT_MINUS:
             res.register_advance()
             self.advance()
 
-            factor = res.register(self.factor())
-
+            node = res.register(self.binary_expr(POW_PRECEDENCE))
             if res.error:
                 return res
 
-            return res.success(UnaryOpNode(tok, factor))
+            left = UnaryOpNode(tok, node)
 
-        return self.power()
-
-    def term(self) -> "ParseResult":
-        """
-        Parse a term in the Lunfardo language.
+        elif min_prec <= COMPARISON_PRECEDENCE and tok.matches(TT_KEYWORD, "truchar"):
+            res.register_advance()
+            self.advance()
 
-        This method handles multiplication and division operations.
-        It uses the binary operation parsing method with multiplication
-        and division tokens, calling the 'factor' method for each operand.
+            node = res.register(self.binary_expr(COMPARISON_PRECEDENCE))
+            if res.error:
+                return res
 
-        Returns:
-            ParseResult: The result of parsing the term.
-        """
-        return self.bin_op(self.factor, (TT_MUL, TT_DIV))
+            left = UnaryOpNode(tok, node)
 
-    # MARK: term | comp_expr
-    def comp_expr(self) -> "ParseResult":
-        """
-        Parse a comparison expression in the Lunfardo language.
+        else:
+            left = self.simple_operand()
+            if left is not None:
+                res.register_advance()
+            else:
+                left = res.register(self.call())
 
-        This method handles comparison operations and the 'truchar' (not) operation.
-        It processes expressions involving equality, inequality, less than, greater than,
-        less than or equal to, and greater than or equal to operators.
+            if res.error:
+                if min_prec == COMPARISON_PRECEDENCE:
+                    return res.failure(
+                        InvalidSyntaxBardo(
+                            self.current_tok.pos_start,
+                            self.current_tok.pos_end,
+                            "Se esperaba numero, identificador, '+', '-', '(', '[' ó truchar'",
+                        )
+                    )
+                return res
 
-        The method also handles the 'truchar' keyword for logical negation.
+        while True:
+            op_tok = self.current_tok
+            if op_tok.type == TT_KEYWORD:
+                prec = KEYWORD_PRECEDENCE.get(op_tok.value)
+            else:
+                prec = BINARY_PRECEDENCE.get(op_tok.type)
 
-        Returns:
-            ParseResult: The result of parsing the comparison expression.
-        """
-        res = ParseResult()
+            if prec is None or prec < min_prec:
+                break
 
-        if self.current_tok.matches(TT_KEYWORD, "truchar"):
-            op_tok = self.current_tok
             res.register_advance()
             self.advance()
 
-            node = res.register(self.comp_expr())
+            # A plain right operand followed by an operator that does not bind
+            # tighter needs no recursion.
+            right = self.simple_operand(prec)
+            if right is not None:
+                res.register_advance()
+                left = BinOpNode(left, op_tok, right)
+                continue
+
+            right = res.register(self.binary_expr(prec if prec == POW_PRECEDENCE else prec + 1))
             if res.error:
                 return res
 
-            return res.success(UnaryOpNode(op_tok, node))
-
-        node = res.register(
-            self.bin_op(self.arith_expr, (TT_EE, TT_NE, TT_LT, TT_GT, TT_LTE, TT_GTE))
-        )
-
-        if res.error:
-            return res.failure(
-                InvalidSyntaxBardo(
-                    self.current_tok.pos_start,
-                    self.current_tok.pos_end,
-                    "Se esperaba numero, identificador, '+', '-', '(', '[' ó truchar'",
-                )
-            )
-
-        return res.success(node)
-
-    def arith_expr(self) -> "ParseResult":
-        """
-        Parse an arithmetic expression in the Lunfardo language.
-
-        This method handles addition and subtraction operations.
-        It uses the binary operation parsing method with addition
-        and subtraction tokens, calling the 'term' method for each operand.
+            left = BinOpNode(left, op_tok, right)
 
-        Returns:
-            ParseResult: The result of parsing the arithmetic expression.
-        """
-        return self.bin_op(self.term, (TT_PLUS, TT_MINUS))
+        return res.success(left)
 
     # MARK: arith | list_expr
     def list_expr(self) -> "ParseResult":
@@ -654,7 +856,7 @@ class Parser:
         res = ParseResult()
 
         element_nodes = []
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
         if self.current_tok.type != TT_LSQUARE:
             return res.failure(
@@ -715,7 +917,7 @@ class Parser:
             self.advance()
 
         return res.success(
-            CosoNode(element_nodes, pos_start, self.current_tok.pos_end.copy())
+            CosoNode(element_nodes, pos_start, self.current_tok.pos_end)
         )
 
     def dict_expr(self) -> "ParseResult":
@@ -742,7 +944,7 @@ class Parser:
         res = ParseResult()
 
         pairs = [] # lista de pares (key_node, value_node)
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
         if self.current_tok.type != TT_LCURLY:
             return res.failure(
@@ -883,7 +1085,7 @@ class Parser:
             self.advance()
 
         return res.success(
-            MataburrosNode(pairs, pos_start, self.current_tok.pos_end.copy())
+            MataburrosNode(pairs, pos_start, self.current_tok.pos_end)
         )
 
     # MARK: Parse.if_expr
@@ -1115,10 +1317,12 @@ class Parser:
         Parse a 'para' (for) loop expression in the Lunfardo language.
 
         This method handles the parsing of for loop constructs with the following structure:
-        para <identifier> = <start_value> hasta <end_value> [entre <step_value>] entonces
+        para [paralelo] <identifier> = <start_value> hasta <end_value> [entre <step_value>] entonces
             <body>
 
         Key components:
+        - Optional 'paralelo' (only a keyword here, so it can still name a
+          variable) to run the iterations in parallel
         - Loop variable declaration and initialization
         - Range specification with 'hasta' (to) keyword
         - Optional step value with 'entre' keyword
@@ -1144,6 +1348,15 @@ class Parser:
         res.register_advance()
         self.advance()
 
+        parallel = False
+        if self.current_tok.type == TT_IDENTIFIER and self.current_tok.value == "paralelo":
+            next_tok = self.peek_next_token()
+            parallel = next_tok is not None and next_tok.type == TT_IDENTIFIER
+
+        if parallel:
+            res.register_advance()
+            self.advance()
+
         if self.current_tok.type != TT_IDENTIFIER:
             return res.failure(
                 InvalidSyntaxBardo(
@@ -1158,6 +1371,9 @@ class Parser:
         res.register_advance()
         self.advance()
 
+        if not parallel and self.current_tok.type == TT_IDENTIFIER and self.current_tok.value == "en":
+            return self.for_each_expr(res, var_name)
+
         if self.current_tok.type != TT_EQ:
             return res.failure(
                 InvalidSyntaxBardo(
@@ -1238,7 +1454,7 @@ class Parser:
             self.advance()
 
             return res.success(
-                ParaNode(var_name, start_value, end_value, step_value, body, True)
+                ParaNode(var_name, start_value, end_value, step_value, body, True, parallel)
             )
 
         body = res.register(self.statement())
@@ -1247,9 +1463,68 @@ class Parser:
             return res
 
         return res.success(
-            ParaNode(var_name, start_value, end_value, step_value, body, False)
+            ParaNode(var_name, start_value, end_value, step_value, body, False, parallel)
         )
 
+    def for_each_expr(self, res: "ParseResult", var_name) -> "ParseResult":
+        """
+        Parse the rest of a 'para ... en' loop, from 'en':
+        para <identifier> en <expr> entonces <body>
+
+        Args:
+            res (ParseResult): The result of the loop parsed so far.
+            var_name (Token): The name of the loop variable.
+
+        Returns:
+            ParseResult: The result of parsing the loop, containing a ParaEnNode if successful.
+        """
+        res.register_advance()
+        self.advance()
+
+        iterable = res.register(self.expr())
+        if res.error:
+            return res
+
+        if not self.current_tok.matches(TT_KEYWORD, "entonces"):
+            return res.failure(
+                InvalidSyntaxBardo(
+                    self.current_tok.pos_start,
+                    self.current_tok.pos_end,
+                    "Se esperaba 'entonces'",
+                )
+            )
+
+        res.register_advance()
+        self.advance()
+
+        if self.current_tok.type == TT_NEWLINE:
+            res.register_advance()
+            self.advance()
+
+            body = res.register(self.statements())
+            if res.error:
+                return res
+
+            if not self.current_tok.matches(TT_KEYWORD, "chau"):
+                return res.failure(
+                    InvalidSyntaxBardo(
+                        self.current_tok.pos_start,
+                        self.current_tok.pos_end,
+                        "Se esperaba 'chau'",
+                    )
+                )
+
+            res.register_advance()
+            self.advance()
+
+            return res.success(ParaEnNode(var_name, iterable, body, True))
+
+        body = res.register(self.statement())
+        if res.error:
+            return res
+
+        return res.success(ParaEnNode(var_name, iterable, body, False))
+
     # MARK: Parse.while_expr
     def while_expr(self) -> "ParseResult":
         """
@@ -1485,7 +1760,7 @@ class Parser:
         self.advance()
 
         return res.success(
-            LaburoDefNode(var_name_tok, arg_name_and_values, body, False)
+            LaburoDefNode(var_name_tok, arg_name_and_values, body, False, is_generator = produces(body))
         )
 
     def instance_expr(self) -> "ParseResult":
@@ -1683,9 +1958,9 @@ class Parser:
 
             if self.current_tok.matches(TT_KEYWORD, "laburo"):
                 method = res.register(self.func_def())
-                method.is_method = True
                 if res.error:
                     return res
+                method.is_method = True
                 if method.var_name_tok.value == "arranque":
                     arranque_method = method
                 else:
@@ -1893,7 +2168,7 @@ class Parser:
         if res.error:
             return res
         
-        if not self.except_keyword_seen:
+        if not self.current_tok.matches(TT_KEYWORD, "sibardea"):
             return res.failure(
                 InvalidSyntaxBardo(
                     self.current_tok.pos_start,
@@ -1901,9 +2176,7 @@ class Parser:
                     "Se esperaba 'sibardea'"
                 )
             )
-        
-        self.except_keyword_seen = False
-        
+
         res.register_advance()
         self.advance()
 
@@ -1916,7 +2189,8 @@ class Parser:
             'division_por_cero',
             'bardo_de_clave',
             'bardo_de_indice',
-            'archivo_no_encontrado'
+            'archivo_no_encontrado',
+            'limite_de_memoria'
         )):
             return res.failure(
                 InvalidSyntaxBardo(
@@ -1984,7 +2258,7 @@ class Parser:
                         the appropriate node type if successful.
         """
         res = ParseResult()
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
         res.register_advance()
         self.advance()
 
@@ -2024,7 +2298,7 @@ class Parser:
 
         if self.current_tok.type != TT_STRING:
             return res.failure(
-                InvalidTypeBardo(
+                InvalidSyntaxBardo(
                     self.current_tok.pos_start,
                     self.current_tok.pos_end,
                     "Se esperaba un chamuyo"
@@ -2207,9 +2481,7 @@ class Parser:
                 
             
 
-        node = res.register(
-            self.bin_op(self.comp_expr, ((TT_KEYWORD, "y"), (TT_KEYWORD, "o")))
-        )
+        node = res.register(self.binary_expr())
 
         if res.error:
             # MARK: me parece que aca solamente deberia retornar "res"
@@ -2223,54 +2495,6 @@ class Parser:
 
         return res.success(node)
 
-    # MARK: Parse.bin_op
-    def bin_op(
-        self, func_a: Callable, ops: Tuple[Token], func_b: Optional[Callable] = None
-    ) -> "ParseResult":
-        """
-        Parse binary operations in the Lunfardo language.
-
-        This method is a generic parser for binary operations, handling various
-        operator types based on the provided parameters.
-
-        Args:
-            func_a (function): The parsing function for the left operand.
-            ops (tuple): A tuple of valid operator tokens for this binary operation.
-            func_b (function, optional): The parsing function for the right operand.
-                                        If None, func_a is used for both operands.
-
-        The method creates a BinOpNode for each binary operation encountered,
-        chaining multiple operations if present.
-
-        Returns:
-            ParseResult: The result of parsing the binary operation(s),
-                        containing a BinOpNode or chain of BinOpNodes if successful.
-        """
-        if func_b is None:
-            func_b = func_a
-
-        res = ParseResult()
-        left = res.register(func_a())
-
-        if res.error:
-            return res
-
-        while (
-            self.current_tok.type in ops
-            or (self.current_tok.type, self.current_tok.value) in ops
-        ):
-            op_tok = self.current_tok
-            res.register_advance()
-            self.advance()
-            right = res.register(func_b())
-
-            if res.error:
-                return res
-
-            left = BinOpNode(left, op_tok, right)
-
-        return res.success(left)
-
 
 # MARK: ParseResult
 class ParseResult:
@@ -2286,8 +2510,6 @@ class ParseResult:
         self.node = None
         self.last_registered_advance_count = 0
         self.advance_count = 0
-        self.to_reverse_count = 0
-        self.no_result = False
 
     def register_advance(self) -> None:
         self.last_registered_advance_count = 1
@@ -2301,26 +2523,19 @@ class ParseResult:
 
         return res.node
 
-    def try_register(self, res) -> LunfardoNode:
-        if res.error:
-            self.to_reverse_count = res.advance_count
-            return res.error
-        
-        if not res.node:
-            self.no_result = True
-            self.to_reverse_count = res.advance_count
-            return None
-
-        return self.register(res)
-
     def success(self, node) -> Self:
         self.node = node
         return self
 
+    def copy(self) -> "ParseResult":
+        copy = ParseResult()
+        copy.error = self.error
+        copy.node = self.node
+        copy.last_registered_advance_count = self.last_registered_advance_count
+        copy.advance_count = self.advance_count
+        return copy
+
     def failure(self, error) -> Self:
         if not self.error or self.last_registered_advance_count == 0:
             self.error = error
         return self
-    
-    def reset_no_result(self):
-        self.no_result = False
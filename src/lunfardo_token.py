@@ -3,33 +3,139 @@ Token and Position classes for the Lunfardo programming language.
 
 This module defines the Token class for representing lexical tokens and
 the Position class for tracking positions within the source code.
+
+Tokens only keep integer offsets into a shared Source. Line and column
+numbers are computed on demand from the Source's line-start index, which
+in practice only happens when an error is rendered.
 """
 
-from typing import Self
+from bisect import bisect_right
+from typing import Optional, Self
+
+class Source:
+    """
+    A source text shared by every token and position that points into it.
+    """
+
+    __slots__ = ('fn', 'first_line', '_chunks', '_text', '_line_starts')
+
+    def __init__(self, fn, text, first_line = 0) -> None:
+        """
+        Initialize a Source object.
+
+        Args:
+            fn (str): Filename.
+            text (str): Full text of the source code, or its first part when
+                the rest is read later with `extend`.
+            first_line (int, optional): Line number of the first line of `text`,
+                when it is a fragment of a larger document. Defaults to 0.
+        """
+        self.fn = fn
+        self.first_line = first_line
+        self._chunks = [text]
+        self._text = text
+        self._line_starts = None
+
+    @property
+    def text(self) -> str:
+        """
+        Full text read so far.
+        """
+        if self._text is None:
+            self._text = ''.join(self._chunks)
+            self._chunks = [self._text]
+
+        return self._text
+
+    def extend(self, chunk) -> None:
+        """
+        Append more text to the source, as it is read from a stream.
+
+        Args:
+            chunk (str): The text to append.
+        """
+        self._chunks.append(chunk)
+        self._text = None
+        self._line_starts = None
+
+    @property
+    def line_starts(self) -> list:
+        """
+        Offsets of the first character of every line, built on first use.
+        """
+        if self._line_starts is None:
+            text = self.text
+            find = text.find
+            starts = [0]
+            idx = find('\n')
+            while idx != -1:
+                starts.append(idx + 1)
+                idx = find('\n', idx + 1)
+            self._line_starts = starts
+
+        return self._line_starts
+
+    def line_col(self, idx) -> tuple:
+        """
+        Compute the line and column numbers of an offset.
+
+        Args:
+            idx (int): Index in the source text.
+
+        Returns:
+            tuple: The line and column numbers, both zero-based.
+        """
+        line_starts = self.line_starts
+        ln = max(bisect_right(line_starts, idx) - 1, 0)
+        return ln + self.first_line, idx - line_starts[ln]
 
 class Position:
     """
     Represents a position in the source code.
 
-    Keeps track of line number, column number, and index in the source text.
+    Keeps track of the index in the source text; the line and column numbers
+    are derived from it. An end position (`is_end`) belongs to the line of the
+    character right before it, so the end of a token that finishes with a
+    newline stays on that token's line.
     """
 
-    def __init__(self, idx, ln, col, fn, ftxt) -> None:
+    __slots__ = ('idx', 'source', 'is_end')
+
+    def __init__(self, idx, source, is_end = False) -> None:
         """
         Initialize a Position object.
 
         Args:
             idx (int): Index in the source text.
-            ln (int): Line number.
-            col (int): Column number.
-            fn (str): Filename.
-            ftxt (str): Full text of the source code.
+            source (Source): The source text the index points into.
+            is_end (bool, optional): Whether this position closes a span.
         """
         self.idx = idx
-        self.ln = ln
-        self.col = col
-        self.fn = fn
-        self.ftxt = ftxt
+        self.source = source
+        self.is_end = is_end
+
+    @property
+    def ln(self) -> int:
+        return self._line_col()[0]
+
+    @property
+    def col(self) -> int:
+        return self._line_col()[1]
+
+    @property
+    def fn(self) -> str:
+        return self.source.fn
+
+    @property
+    def ftxt(self) -> str:
+        return self.source.text
+
+    def _line_col(self) -> tuple:
+        if self.is_end and self.idx > 0:
+            ln, col = self.source.line_col(self.idx - 1)
+            return ln, col + 1
+
+        return self.source.line_col(self.idx)
 
     def advance(self, current_char = None) -> Self:
         """
@@ -37,19 +143,15 @@ class Position:
 
         Args:
             current_char (str, optional): The current character being processed.
+                Advancing without one yields an end position.
 
         Returns:
             Position: The updated position.
         """
         self.idx += 1
-        self.col += 1
-
-        if current_char == '\n':
-            self.ln += 1
-            self.col = 0
-
+        self.is_end = current_char is None
         return self
-    
+
     def copy(self) -> "Position":
         """
         Create a copy of the current position.
@@ -57,13 +159,18 @@ class Position:
         Returns:
             Position: A new Position object with the same values.
         """
-        return Position(self.idx, self.ln, self.col, self.fn, self.ftxt)
-    
+        return Position(self.idx, self.source, self.is_end)
+
+    def __repr__(self) -> str:
+        return f'Position({self.idx}, {self.fn!r})'
+
 class Token:
     """
     Represents a lexical token in the Lunfardo language.
     """
-    
+
+    __slots__ = ('type', 'value', 'start', 'end', 'source')
+
     def __init__(self, type_, value = None, pos_start = None, pos_end = None) -> None:
         """
         Initialize a Token object.
@@ -76,14 +183,45 @@ class Token:
         """
         self.type = type_
         self.value = value
-        
+
         if pos_start is not None:
-            self.pos_start = pos_start.copy()
-            self.pos_end = pos_start.copy()
-            self.pos_end.advance()
+            self.start = pos_start.idx
+            self.end = pos_end.idx if pos_end is not None else pos_start.idx + 1
+            self.source = pos_start.source
+        else:
+            self.start = self.end = 0
+            self.source = None
+
+    @classmethod
+    def span(cls, type_, value, start, end, source) -> "Token":
+        """
+        Create a token straight from its offsets, without building any Position.
+
+        Args:
+            type_ (str): The type of the token.
+            value (Any): The value of the token.
+            start (int): Index of the first character of the token.
+            end (int): Index right after the last character of the token.
+            source (Source): The source text the offsets point into.
+
+        Returns:
+            Token: The new token.
+        """
+        tok = cls.__new__(cls)
+        tok.type = type_
+        tok.value = value
+        tok.start = start
+        tok.end = end
+        tok.source = source
+        return tok
+
+    @property
+    def pos_start(self) -> Position:
+        return Position(self.start, self.source)
 
-        if pos_end is not None:
-            self.pos_end = pos_end.copy()
+    @property
+    def pos_end(self) -> Position:
+        return Position(self.end, self.source, True)
 
     def matches(self, type_, value) -> bool:
         """
@@ -101,5 +239,79 @@ class Token:
     def __repr__(self) -> str:
         if self.value:
             return f'{self.type}: {self.value}'
-        
-        return f'{self.type}'
\ No newline at end of file
+
+        return f'{self.type}'
+
+class TokenStream:
+    """
+    A window over a sequence of tokens that are produced lazily.
+
+    The parser addresses tokens by absolute index. Tokens are pulled from the
+    underlying iterator as the parser looks ahead, and kept until `release` is
+    called, which the parser does after each top-level statement.
+    """
+
+    def __init__(self, tokens) -> None:
+        """
+        Initialize a TokenStream.
+
+        Args:
+            tokens (Iterable[Token]): The tokens, either a list or an iterator that
+                ends with an EOF token (such as `Lexer.iter_tokens()`).
+        """
+        # A list is already in memory, so it is used as is and never trimmed.
+        if isinstance(tokens, list):
+            self._buffer = tokens
+            self._iterator = None
+            self._owns_buffer = False
+        else:
+            self._buffer = []
+            self._iterator = iter(tokens)
+            self._owns_buffer = True
+
+        self._offset = 0
+
+    def get(self, idx) -> Optional[Token]:
+        """
+        Get the token at an absolute index, reading more tokens if needed.
+
+        Args:
+            idx (int): The index of the token since the start of the input.
+
+        Returns:
+            Optional[Token]: The token, or None if the input ends before it.
+        """
+        rel = idx - self._offset
+        buffer = self._buffer
+        if rel < len(buffer):
+            if rel < 0:
+                raise IndexError(f'Token {idx} was already released.')
+            return buffer[rel]
+
+        iterator = self._iterator
+        while iterator is not None and rel >= len(buffer):
+            tok = next(iterator, None)
+            if tok is None:
+                self._iterator = iterator = None
+            else:
+                buffer.append(tok)
+
+        return buffer[rel] if rel < len(buffer) else None
+
+    def release(self, idx) -> None:
+        """
+        Forget every token before an absolute index.
+
+        Args:
+            idx (int): The index of the first token that is still needed.
+        """
+        rel = idx - self._offset
+        if rel > 0 and self._owns_buffer:
+            del self._buffer[:rel]
+            self._offset = idx
+
+    def buffered(self) -> int:
+        """
+        Number of tokens currently held in memory.
+        """
+        return len(self._buffer)
@@ -6,3 +6,4 @@ from .chamuyo import Chamuyo
 from .coso import Coso
 from .mataburros import Mataburros
 from .cheto import Cheto
+from .generador import Generador
@@ -1,12 +1,19 @@
 from .value import Value
 from .numero import Numero
 from .boloodean import Boloodean
+from src.memory import track, reserve
+import sys
 
 class Chamuyo(Value):
 
     def __init__(self, value):
         super().__init__()
         self.value = value
+        track(self)
+
+    def heap_usage(self):
+        """The text, and its size in bytes (see src.memory)."""
+        return self.value, sys.getsizeof(self.value)
 
     def added_to(self, other):
         if isinstance(other, Chamuyo):
@@ -16,6 +23,7 @@ class Chamuyo(Value):
     
     def multiplied_by(self, other):
         if isinstance(other, Numero):
+            reserve(len(self.value) * max(other.value, 0), 'Chamuyo')
             return Chamuyo(self.value * other.value).set_context(self.context), None
         
         return None, Value.illegal_operation(self, other)
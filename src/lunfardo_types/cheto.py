@@ -4,6 +4,8 @@ from src.rtresult import RTResult
 from src.errors import RTError, UndefinedVarBardo
 from src.context import Context
 from src.symbol_table import SymbolTable
+from src.memory import VALUE_SIZE, track
+import sys
 
 class Cheto(Value):
     
@@ -75,7 +77,7 @@ class Cheto(Value):
             return res
 
         # Execute the method
-        return_value = res.register(method.execute([instance] + args, method_context, interpreter))
+        return_value = res.register(interpreter.call(method, [instance] + args, method_context))
         if res.should_return():
             return res
         
@@ -111,6 +113,15 @@ class ChetoInstance(Value):
         self.context = Context(f"<instancia de {cheto.name}>", parent=call_context)
         self.context.symbol_table = SymbolTable(call_context.symbol_table)
         self.set_pos(cheto.pos_start, cheto.pos_end)
+        track(self)
+
+    def heap_usage(self):
+        """
+        The instance variables, and their size in bytes with the instance, its
+        context and its symbol table (see src.memory).
+        """
+        instance_vars = self.instance_vars
+        return instance_vars, 3 * VALUE_SIZE + sys.getsizeof(instance_vars) + len(instance_vars) * VALUE_SIZE
 
     def get_instance_var(self, var_name):
         """
@@ -134,6 +145,7 @@ class ChetoInstance(Value):
         Sets an instance variable
         """
         self.instance_vars[var_name] = value
+        track(self)
 
         # Propagate the change to parent contexts
         current_context = self.context
@@ -175,6 +187,7 @@ class ChetoInstance(Value):
         """
         copy = ChetoInstance(self.cheto, self.context)
         copy.instance_vars = self.instance_vars.copy()
+        track(copy)
         copy.set_pos(self.pos_start, self.pos_end)
         copy.set_context(self.context)
         return copy
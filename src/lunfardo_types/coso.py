@@ -2,6 +2,8 @@ from .value import Value
 from .numero import Numero
 from .boloodean import Boloodean
 from src.errors import InvalidIndexBardo, InvalidTypeBardo
+from src.memory import VALUE_SIZE, track, reserve
+import sys
 
 from typing import List
 
@@ -11,12 +13,19 @@ class Coso(Value):
     def __init__(self, elements: List):
         super().__init__()
         self.elements = elements
+        track(self)
+
+    def heap_usage(self):
+        """The list of elements, and its size in bytes with a value per element (see src.memory)."""
+        elements = self.elements
+        return elements, VALUE_SIZE + sys.getsizeof(elements) + len(elements) * VALUE_SIZE
 
     def added_to(self, other):
         """with list -> extend original list. Returns new list"""
         if isinstance(other, Coso):
             new_list = self.copy()
             new_list.elements.extend(other.elements)
+            track(new_list)
 
             return new_list, None
 
@@ -27,10 +36,12 @@ class Coso(Value):
         if isinstance(other, Numero):
             if other.value < 0:
                 return None, Value.illegal_operation(self, other)
+            reserve(len(self.elements) * other.value * (VALUE_SIZE + 8), 'Coso')
             new_list = self.copy()
             new_list.elements.clear()
             for _ in range(other.value):
                 new_list.elements.extend(self.elements)
+            track(new_list)
             return new_list, None
 
         return None, Value.illegal_operation(self, other)
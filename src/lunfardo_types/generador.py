@@ -0,0 +1,66 @@
+from .value import Value
+from src.rtresult import RTResult
+from src.errors import InvalidValueBardo
+
+
+class Generador(Value):
+    """
+    What calling a laburo with 'producir' gives: the values it produces,
+    computed one at a time, as they are asked for.
+
+    The body of the laburo runs as a Python generator (see
+    `Interpreter.generate`), which suspends it at every 'producir' and resumes
+    it where it left off. Copies of a generador share it, so a value is only
+    produced once whichever copy asks for it.
+    """
+
+    def __init__(self, name, frames):
+        """
+        Initialize a Generador.
+
+        Args:
+            name (str): The name of the laburo.
+            frames (generator): The running body of the laburo.
+        """
+        super().__init__()
+        self.name = name
+        self.frames = frames
+
+    def advance(self, context) -> RTResult:
+        """
+        Run the laburo up to its next 'producir'.
+
+        Args:
+            context (Context): The context that asks for the value, for the bardos.
+
+        Returns:
+            RTResult: The value produced, None if the laburo already ended, or
+                the bardo the laburo ended with.
+        """
+        try:
+            return RTResult().success(next(self.frames))
+        except StopIteration as stop:
+            result = stop.value
+            if result is not None and result.error:
+                return RTResult().failure(result.error)
+            return RTResult().success(None)
+        except ValueError:
+            # The body of the laburo asked for its own next value.
+            return RTResult().failure(
+                InvalidValueBardo(self.pos_start, self.pos_end, f"el generador '{self.name}' no puede pedirse valores a sí mismo", context)
+            )
+
+    def copy(self):
+        copy = Generador(self.name, self.frames)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+    def is_true(self):
+        return True
+
+    def __str__(self):
+        return f"<generador {self.name}>"
+
+    def __repr__(self):
+        return f"<generador {self.name}>"
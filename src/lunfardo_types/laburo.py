@@ -4,6 +4,7 @@ from src.interpreter import Interpreter
 from src.symbol_table import SymbolTable
 from src.context import Context
 from src.errors import RTError, InvalidTypeBardo
+from src.memory import track
 import os
 
 
@@ -99,12 +100,13 @@ class BaseLaburo(Value):
 
 class Laburo(BaseLaburo):
 
-    def __init__(self, name, body_node, arg_names, arg_values, should_auto_return):
+    def __init__(self, name, body_node, arg_names, arg_values, should_auto_return, is_generator=False):
         super().__init__(name)
         self.body_node = body_node
         self.arg_names = arg_names
         self.arg_values = arg_values
         self.should_auto_return = should_auto_return
+        self.is_generator = is_generator
         self.global_context = None
         self.memory_address = id(self)
 
@@ -129,6 +131,11 @@ class Laburo(BaseLaburo):
         if res.should_return():
             return res
 
+        if self.is_generator:
+            # The body runs as the values are asked for.
+            from . import Generador
+            return res.success(Generador(self.name, interpreter.generate(self.body_node, execution_context)))
+
         value = res.register(interpreter.visit(self.body_node, execution_context))
         if res.should_return() and res.func_return_value is None:
             return res
@@ -147,6 +154,7 @@ class Laburo(BaseLaburo):
             self.arg_names,
             self.arg_values,
             self.should_auto_return,
+            self.is_generator,
         )
         if hasattr(self, "is_method"):
             copy.is_method = self.is_method
@@ -213,7 +221,7 @@ class Curro(BaseLaburo):
     #########################################
 
     def exec_chamu(self, exec_ctx):
-        from . import Chamuyo, Numero, Coso, Nada
+        from . import Chamuyo, Numero, Coso, Nada, Generador
         from errors import InvalidTypeBardo
 
         value = exec_ctx.symbol_table.get("value")
@@ -237,14 +245,14 @@ class Curro(BaseLaburo):
         if isinstance(value, Coso):
             return RTResult().success(Chamuyo(f"{value.elements}"))
 
-        if isinstance(value, BaseLaburo):
+        if isinstance(value, (BaseLaburo, Generador)):
             return RTResult().success(Chamuyo(str(value)))
         
         return RTResult().failure(
             InvalidTypeBardo(
                 value.pos_start,
                 value.pos_end,
-                "El valor del argumento solo puede ser numero, chamuyo, coso o laburo.",
+                "El valor del argumento solo puede ser numero, chamuyo, coso, laburo o generador.",
                 exec_ctx
             )
         )
@@ -397,6 +405,7 @@ class Curro(BaseLaburo):
             )
 
         list_.elements.append(value)
+        track(list_)
         return RTResult().success(Nada.nada)
 
     exec_guardar.arg_names = ["list", "value"]
@@ -431,6 +440,7 @@ class Curro(BaseLaburo):
 
         try:
             list_.elements.insert(index.value, value.value)
+            track(list_)
         except TypeError:
             return RTResult().failure(
                 InvalidTypeBardo(
@@ -569,6 +579,7 @@ class Curro(BaseLaburo):
             )
 
         listA.elements.extend(listB.elements)
+        track(listA)
 
         return RTResult().success(Nada.nada)
 
@@ -747,9 +758,66 @@ class Curro(BaseLaburo):
 
     exec_longitud.arg_names = ["arg"]
 
+    def exec_siguiente(self, exec_ctx):
+        from . import Generador, Nada
+        from errors import InvalidTypeBardo
+
+        generador = exec_ctx.symbol_table.get("generador")
+
+        if not isinstance(generador, Generador):
+            return RTResult().failure(
+                InvalidTypeBardo(
+                    generador.pos_start,
+                    generador.pos_end,
+                    "El argumento debe ser de tipo generador",
+                    exec_ctx
+                )
+            )
+
+        res = RTResult()
+        value = res.register(generador.advance(exec_ctx))
+        if res.should_return():
+            return res
+
+        return res.success(Nada.nada if value is None else value)
+
+    exec_siguiente.arg_names = ["generador"]
+
+    def exec_juntar(self, exec_ctx):
+        from . import Coso
+        from errors import InvalidTypeBardo
+
+        arg = exec_ctx.symbol_table.get("arg")
+        next_item = Interpreter.stepper(arg, exec_ctx)
+
+        if next_item is None:
+            return RTResult().failure(
+                InvalidTypeBardo(
+                    arg.pos_start,
+                    arg.pos_end,
+                    "El argumento debe ser de tipo generador, coso, chamuyo o mataburros",
+                    exec_ctx
+                )
+            )
+
+        res = RTResult()
+        elements = []
+        while True:
+            value = res.register(next_item())
+            if res.should_return():
+                return res
+            if value is None:
+                break
+            elements.append(value)
+
+        return res.success(Coso(elements))
+
+    exec_juntar.arg_names = ["arg"]
+
     def exec_ejecutar(self, exec_ctx):
         from . import Chamuyo
         from errors import InvalidTypeBardo, FileNotFoundBardo
+        from src.errors import BudgetExceededBardo
 
         fn = exec_ctx.symbol_table.get("fn")
 
@@ -773,11 +841,9 @@ class Curro(BaseLaburo):
             with open(file_path, "r", encoding='utf-8') as f:
                 script = f.read()
         except FileNotFoundError:
-            parent_dir = current_dir
-            while parent_dir.name != 'src':
-                parent_dir = parent_dir.parent
-            
-            file_path = os.path.join(parent_dir, 'builtin', fn)
+            # Not next to the script: look among the builtin modules. (Walking up
+            # from the script directory to 'src' never ends for scripts outside it.)
+            file_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'builtin', fn)
 
             try:
                 with open(file_path, "r", encoding='utf-8') as f:
@@ -792,9 +858,14 @@ class Curro(BaseLaburo):
                     )
                 )
 
-        from lunfardo import Lunfardo
+        from src.lunfardo import Lunfardo
+
+        # Lunfardo() starts from the shared builtins snapshot, so nested executions don't rebuild the globals.
+        result, error = Lunfardo().execute(file_path, script, current_dir, parent_context=exec_ctx)[:2]
 
-        result, error = Lunfardo().execute(file_path, script, current_dir, parent_context=exec_ctx)
+        if isinstance(error, BudgetExceededBardo):
+            # The module ran within the importer's budget, so the importer stops too.
+            return RTResult().failure(error)
 
         if error:
             return RTResult().failure(
@@ -874,6 +945,8 @@ Curro.cambiaso = Curro("cambiaso")
 Curro.sacar = Curro("sacar")
 Curro.extender = Curro("extender")
 Curro.longitud = Curro("longitud")
+Curro.siguiente = Curro("siguiente")
+Curro.juntar = Curro("juntar")
 # Mataburros related
 Curro.agarra_de = Curro("agarra_de")
 Curro.metele_en = Curro("metele_en")
@@ -1,5 +1,7 @@
 from .value import Value
 from .boloodean import Boloodean
+from src.memory import VALUE_SIZE, EMPTY_LIST_SIZE, ENTRY_SIZE, track
+import sys
 
 
 class Mataburros(Value):
@@ -9,6 +11,12 @@ class Mataburros(Value):
         self.size = size # tamaño inicial
         self.buckets = [[] for _ in range(size)] # lista de listas para manejar colisiones
         self.count = 0 # cantidad de elementos almacenados
+        track(self)
+
+    def heap_usage(self):
+        """ Los buckets, y su tamaño aproximado en bytes con las claves y valores (ver src.memory) """
+        size = sys.getsizeof(self.buckets) + self.size * EMPTY_LIST_SIZE + self.count * (ENTRY_SIZE + 2 * VALUE_SIZE)
+        return self.buckets, VALUE_SIZE + size
 
     def _hash(self, key):
         """ Genera un índice para una clave """
@@ -32,6 +40,8 @@ class Mataburros(Value):
         if self.count / self.size > 0.7:
             self._resize()
 
+        track(self)
+
     def get_value(self, key):
         """ Obtiene el valor asociado a una clave """
         index = self._hash(key.value)
@@ -52,6 +62,7 @@ class Mataburros(Value):
             if k.value == key.value:
                 del bucket[i]
                 self.count -= 1
+                track(self)
                 return True
         
         return False
@@ -63,7 +74,7 @@ class Mataburros(Value):
 
         for bucket in self.buckets:
             for key, value in bucket:
-                index = hash(key) % new_size
+                index = hash(key.value) % new_size
                 new_buckets[index].append((key, value))
         
         self.size = new_size
@@ -91,6 +102,7 @@ class Mataburros(Value):
         copy = Mataburros(self.size)
         copy.buckets = self.buckets
         copy.count = self.count
+        track(copy)
         copy.set_pos(self.pos_start, self.pos_end)
         copy.set_context(self.context)
         return copy
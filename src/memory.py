@@ -0,0 +1,244 @@
+"""
+Memory accounting for the Lunfardo programming language.
+
+A MemoryTracker keeps an approximate count of the bytes held by the values
+that can grow without bound: chamuyos, cosos, mataburros and cheto
+instances. Each of them reports what it holds with `heap_usage()` and calls
+`track` when it is created or grows, and the tracker stops counting it once
+it is garbage collected, so the count is of the bytes alive, not of every
+byte ever allocated.
+
+The values charged are estimates: a coso is charged its list plus a
+value-sized slot per element, and a chamuyo only its text, so the elements of
+a container are not counted twice. Copies of a value share what it holds (a
+coso copy shares its list), and what they share is only charged once.
+
+When a tracker has a limit, the allocation that goes over it raises
+HeapLimitExceeded, which the interpreter turns into a HeapLimitBardo the
+program can catch with 'sibardea limite_de_memoria'.
+
+The tracker of a run is found through `current_memory`. When there is none,
+tracking costs a context variable lookup per tracked value.
+"""
+
+import atexit
+import json
+import sys
+import weakref
+from contextvars import ContextVar
+from functools import partial
+from typing import Dict, Optional
+
+current_memory: ContextVar[Optional["MemoryTracker"]] = ContextVar("current_memory", default = None)
+
+def _sample_value_size() -> int:
+    sample = type('Sample', (), {})()
+    sample.pos_start = sample.pos_end = sample.context = sample.value = None
+    return sys.getsizeof(sample) + sys.getsizeof(sample.__dict__)
+
+# Approximate sizes, in bytes, of a value object (with its attribute dict), of
+# an empty list and of a mataburros entry (the tuple and its bucket slot).
+VALUE_SIZE = _sample_value_size()
+EMPTY_LIST_SIZE = sys.getsizeof([])
+ENTRY_SIZE = sys.getsizeof((None, None)) + 8
+
+class HeapLimitExceeded(Exception):
+    """
+    Raised by a MemoryTracker when an allocation would go over its limit.
+    """
+
+    def __init__(self, limit: int, type_name: str) -> None:
+        super().__init__(limit, type_name)
+        self.limit = limit
+        self.type_name = type_name
+
+    def __str__(self) -> str:
+        return f'el programa usa más de {format_bytes(self.limit)} ({self.type_name})'
+
+def format_bytes(size: int) -> str:
+    """
+    Format a number of bytes for people ('512 B', '3.5 KiB', '1.2 MiB').
+    """
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f'{size} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GiB'
+
+class MemoryTracker:
+    """
+    The bytes held by the values of a run, by type, and their peaks.
+    """
+
+    def __init__(self, limit: Optional[int] = None) -> None:
+        """
+        Initialize a MemoryTracker.
+
+        Args:
+            limit (int, optional): The maximum number of bytes the values may hold.
+
+        Raises:
+            ValueError: If the limit is not positive.
+        """
+        if limit is not None and limit <= 0:
+            raise ValueError(f'limit must be positive, got {limit}.')
+
+        self.limit = limit
+        self.current = 0
+        self.peak = 0
+        self.by_type: Dict[str, int] = {}
+        self.peak_by_type: Dict[str, int] = {}
+        # [type name, bytes, owners, holder] of everything charged, by the id of
+        # the object that holds it (a list, a dict, a string), which is kept
+        # alive so the id is not reused while charged; and the id of that
+        # object and a weak reference to the value, by the id of every value.
+        self._storage: Dict[int, list] = {}
+        self._owners: Dict[int, tuple] = {}
+        self._tokens = []
+
+    def __enter__(self) -> "MemoryTracker":
+        """
+        Make this the tracker of the code run in the block.
+        """
+        self._tokens.append(current_memory.set(self))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        current_memory.reset(self._tokens.pop())
+
+    def track(self, value) -> None:
+        """
+        Charge what a value holds, or update its charge after it grew or shrank.
+
+        Args:
+            value (Value): A value with a `heap_usage()` method.
+
+        Raises:
+            HeapLimitExceeded: If the value took the tracker over its limit.
+        """
+        storage, size = value.heap_usage()
+        key = id(storage)
+        value_id = id(value)
+        owner = self._owners.get(value_id)
+        if owner is None or owner[0] != key:
+            if owner is not None:
+                self._disown(value_id)
+            # Allocate before looking the entry up: a collection triggered
+            # here may run `_collected` and drop it.
+            self._owners[value_id] = (key, weakref.ref(value, partial(self._collected, value_id)))
+            entry = self._storage.get(key)
+            if entry is None:
+                entry = self._storage[key] = [type(value).__name__, 0, 0, storage]
+            entry[2] += 1
+        else:
+            entry = self._storage[key]
+
+        delta = size - entry[1]
+        if delta:
+            entry[1] = size
+            self._charge(entry[0], delta)
+
+    def reserve(self, size: int, type_name: str) -> None:
+        """
+        Check, before making it, that an allocation of `size` bytes fits in the limit.
+
+        Raises:
+            HeapLimitExceeded: If it does not.
+        """
+        if self.limit is not None and self.current + size > self.limit:
+            raise HeapLimitExceeded(self.limit, type_name)
+
+    def _charge(self, type_name: str, delta: int) -> None:
+        current = self.by_type.get(type_name, 0) + delta
+        self.by_type[type_name] = current
+        self.current += delta
+        if delta <= 0:
+            return
+
+        if current > self.peak_by_type.get(type_name, 0):
+            self.peak_by_type[type_name] = current
+        if self.current > self.peak:
+            self.peak = self.current
+        if self.limit is not None and self.current > self.limit:
+            raise HeapLimitExceeded(self.limit, type_name)
+
+    def _disown(self, value_id: int) -> None:
+        key, _ = self._owners.pop(value_id)
+        entry = self._storage[key]
+        entry[2] -= 1
+        if not entry[2]:
+            del self._storage[key]
+            self._charge(entry[0], -entry[1])
+
+    def _collected(self, value_id: int, ref: weakref.ref) -> None:
+        owner = self._owners.get(value_id)
+        if owner is not None and owner[1] is ref:
+            self._disown(value_id)
+
+    def report(self) -> str:
+        """
+        Render the current and peak bytes of each type as a table.
+        """
+        header = f"{'actual':>12} {'pico':>12}  tipo"
+        lines = [header, '-' * len(header)]
+        for name, peak in sorted(self.peak_by_type.items(), key = lambda item: item[1], reverse = True):
+            lines.append(f"{format_bytes(self.by_type.get(name, 0)):>12} {format_bytes(peak):>12}  {name}")
+        lines.append(f"{format_bytes(self.current):>12} {format_bytes(self.peak):>12}  total")
+        if self.limit is not None:
+            lines.append(f"límite: {format_bytes(self.limit)}")
+        return '\n'.join(lines)
+
+    def as_dict(self) -> Dict:
+        """
+        The counts as a JSON-serializable dict, in bytes.
+        """
+        return {
+            'limit': self.limit,
+            'current': self.current,
+            'peak': self.peak,
+            'types': {
+                name: {'current': self.by_type.get(name, 0), 'peak': peak}
+                for name, peak in self.peak_by_type.items()
+            },
+        }
+
+    def save(self, path) -> None:
+        """
+        Write the counts to a JSON file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, 'w', encoding = 'utf-8') as f:
+            json.dump(self.as_dict(), f, indent = 2)
+            f.write('\n')
+
+    def dump(self, path = None) -> None:
+        """
+        Print the counts to stderr and, if a path is given, save them as JSON.
+        """
+        print(self.report(), file = sys.stderr)
+        if path:
+            self.save(path)
+
+    def dump_at_exit(self, path = None) -> None:
+        """
+        Dump the counts when the process exits (see `dump`).
+        """
+        atexit.register(self.dump, path)
+
+def track(value) -> None:
+    """
+    Charge a value to the tracker of the current run, if there is one.
+    """
+    tracker = current_memory.get()
+    if tracker is not None:
+        tracker.track(value)
+
+def reserve(size: int, type_name: str) -> None:
+    """
+    Check that an allocation fits in the limit of the current run, if there is one.
+    """
+    tracker = current_memory.get()
+    if tracker is not None:
+        tracker.reserve(size, type_name)
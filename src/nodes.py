@@ -5,9 +5,86 @@ This module defines various node types that represent different syntactic constr
 in the Lunfardo language, forming the structure of the AST.
 """
 
-class NumeroNode:
+from .lunfardo_token import Position
+
+class Node:
+    """
+    Base class of every node in the AST.
+
+    A node keeps the offsets of the first and last characters it covers and
+    the Source they point into. Its `pos_start` and `pos_end` Positions are
+    only built the first time they are read, which for most nodes means when
+    they are evaluated or when an error points at them.
+    """
+
+    __slots__ = ('start', 'end', 'source', 'pos_start', 'pos_end')
+
+    def set_span(self, first, last) -> None:
+        """
+        Set the span of the node, from the first to the last token or node it covers.
+
+        Args:
+            first (Token | Node): The first token or node covered by this node.
+            last (Token | Node): The last token or node covered by this node.
+        """
+        self.start = first.start
+        self.end = last.end
+        self.source = first.source
+
+    def set_pos(self, pos_start, pos_end) -> None:
+        """
+        Set the span of the node from two positions.
+
+        Args:
+            pos_start (Position): Start position of the node.
+            pos_end (Position): End position of the node.
+        """
+        self.start = pos_start.idx
+        self.end = pos_end.idx
+        self.source = pos_start.source
+        self.pos_start = pos_start
+        self.pos_end = pos_end
+
+    def __getattr__(self, name):
+        # Only called while the `pos_start` or `pos_end` slot is still empty.
+        if name == 'pos_start':
+            self.pos_start = Position(self.start, self.source)
+            return self.pos_start
+
+        if name == 'pos_end':
+            self.pos_end = Position(self.end, self.source, True)
+            return self.pos_end
+
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+    def children(self):
+        """
+        Yield the nodes directly under this node, in the order of its fields.
+        """
+        for cls in type(self).__mro__:
+            if cls is Node:
+                break
+            for slot in cls.__dict__.get('__slots__', ()):
+                yield from _nodes_in(getattr(self, slot, None))
+
+def _nodes_in(value):
+    """
+    Yield the nodes in a field of a node: a node, or a list, tuple or dict of them.
+    """
+    if isinstance(value, Node):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _nodes_in(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _nodes_in(item)
+
+class NumeroNode(Node):
     """Represents a numeric literal in the AST."""
 
+    __slots__ = ('tok',)
+
     def __init__(self, tok) -> None:
         """
         Initialize a NumeroNode.
@@ -16,15 +93,16 @@ class NumeroNode:
             tok (Token): The token representing the numeric literal.
         """
         self.tok = tok
-        self.pos_start = self.tok.pos_start
-        self.pos_end = self.tok.pos_end
+        self.set_span(self.tok, self.tok)
 
     def __repr__(self) -> str:
         return f'NumeroNode({self.tok})'
 
-class ChamuyoNode:
+class ChamuyoNode(Node):
     """Represents a string literal in the AST."""
 
+    __slots__ = ('tok',)
+
     def __init__(self, tok) -> None:
         """
         Initialize a ChamuyoNode.
@@ -33,15 +111,16 @@ class ChamuyoNode:
             tok (Token): The token representing the string literal.
         """
         self.tok = tok
-        self.pos_start = self.tok.pos_start
-        self.pos_end = self.tok.pos_end
+        self.set_span(self.tok, self.tok)
 
     def __repr__(self) -> str:
         return f'ChamuyoNode({self.tok})'
     
-class CosoNode:
+class CosoNode(Node):
     """Represents a list (coso) in the AST."""
 
+    __slots__ = ('element_nodes',)
+
     def __init__(self, element_nodes, pos_start, pos_end) -> None:
         """
         Initialize a CosoNode.
@@ -52,15 +131,16 @@ class CosoNode:
             pos_end (Position): End position of the list.
         """
         self.element_nodes = element_nodes
-        self.pos_start = pos_start
-        self.pos_end = pos_end
+        self.set_pos(pos_start, pos_end)
 
     def __repr__(self) -> str:
         return f'CosoNode({self.element_nodes})'
     
-class MataburrosNode:
+class MataburrosNode(Node):
     """Represents a dictionary (mataburros) in the AST."""
 
+    __slots__ = ('pairs',)
+
     def __init__(self, pairs, pos_start, pos_end) -> None:
         """
         Initialize a MataburrosNode.
@@ -71,15 +151,16 @@ class MataburrosNode:
             pos_end (Position): End position of the dictionary.
         """
         self.pairs = pairs
-        self.pos_start = pos_start
-        self.pos_end = pos_end
+        self.set_pos(pos_start, pos_end)
 
     def __repr__(self) -> str:
         return f'MataburrosNode({self.pairs})'
     
-class PoneleQueAccessNode:
+class PoneleQueAccessNode(Node):
     """Represents a name of a variable to access its value in the AST."""
 
+    __slots__ = ('var_name_tok',)
+
     def __init__(self, var_name_tok) -> None:
         """
         Initialize a PoneleQueAccessNode.
@@ -88,15 +169,16 @@ class PoneleQueAccessNode:
             var_name_tok (Token): Token representing the name of the variable.
         """
         self.var_name_tok = var_name_tok
-        self.pos_start = self.var_name_tok.pos_start
-        self.pos_end = self.var_name_tok.pos_end
+        self.set_span(self.var_name_tok, self.var_name_tok)
 
     def __repr__(self) -> str:
         return f'PoneleQueAccessNode({self.var_name_tok})'
 
-class PoneleQueAssignNode:
+class PoneleQueAssignNode(Node):
     """Represents a name of a variable and its value in the AST."""
 
+    __slots__ = ('var_name_tok', 'value_node')
+
     def __init__(self, var_name_tok, value_node) -> None:
         """
         Initialize a PoneleQueAssignNode.
@@ -107,15 +189,16 @@ class PoneleQueAssignNode:
         """
         self.var_name_tok = var_name_tok
         self.value_node = value_node
-        self.pos_start = self.var_name_tok.pos_start
-        self.pos_end = self.value_node.pos_end
+        self.set_span(self.var_name_tok, self.value_node)
 
     def __repr__(self) -> str:
         return f'PoneleQueAssignNode({self.var_name_tok}, {self.value_node})'
 
-class AccessAndAssignNode:
+class AccessAndAssignNode(Node):
     """Represents a name of a declared variable and its value in the AST."""
 
+    __slots__ = ('var_name_tok', 'value_node')
+
     def __init__(self, var_name_tok, value_node) -> None:
         """
         Initialize an AccessAndAssignNode.
@@ -126,15 +209,16 @@ class AccessAndAssignNode:
         """
         self.var_name_tok = var_name_tok
         self.value_node = value_node
-        self.pos_start = self.var_name_tok.pos_start
-        self.pos_end = self.value_node.pos_end
+        self.set_span(self.var_name_tok, self.value_node)
 
     def __repr__(self) -> str:
         return f'AccessAndAssignNode({self.var_name_tok}, {self.value_node})'
     
-class InstanceVarAccessAndAssignNode:
+class InstanceVarAccessAndAssignNode(Node):
     """Represents a name of a declared instanced variable and its value in the AST."""
 
+    __slots__ = ('instance_var_name_tok', 'access_chain', 'value_node')
+
     def __init__(self, instance_var_name_tok, access_chain, value_node) -> None:
         """
         Initialize an InstanceVarAccessAndAssignNode.
@@ -147,16 +231,17 @@ class InstanceVarAccessAndAssignNode:
         self.instance_var_name_tok = instance_var_name_tok
         self.access_chain = access_chain
         self.value_node = value_node
-        self.pos_start = self.instance_var_name_tok.pos_start
-        self.pos_end = self.value_node.pos_end
+        self.set_span(self.instance_var_name_tok, self.value_node)
 
     def __repr__(self) -> str:
         return f'InstanceVarAccessAndAssignNode({self.instance_var_name_tok}, {self.access_chain}, {self.value_node})'
 
     
-class BinOpNode:
+class BinOpNode(Node):
     """Represents a Binary Operator in the AST."""
 
+    __slots__ = ('left_node', 'op_tok', 'right_node')
+
     def __init__(self, left_node, op_tok, right_node) -> None:
         """
         Initialize a PoneleQueAssignNode.
@@ -169,14 +254,15 @@ class BinOpNode:
         self.left_node = left_node
         self.op_tok = op_tok
         self.right_node = right_node
-        self.pos_start = self.left_node.pos_start
-        self.pos_end = self.right_node.pos_end
+        self.set_span(self.left_node, self.right_node)
 
     def __repr__(self) -> str:
         return f'BinOpNode({self.left_node}, {self.op_tok}, {self.right_node})'
     
-class UnaryOpNode:
+class UnaryOpNode(Node):
     """Represents a Unary Operator in the AST."""
+
+    __slots__ = ('op_tok', 'node')
     
     def __init__(self, op_tok, node) -> None:
         """
@@ -188,15 +274,16 @@ class UnaryOpNode:
         """
         self.op_tok = op_tok
         self.node = node
-        self.pos_start = self.op_tok.pos_start
-        self.pos_end = node.pos_end
+        self.set_span(self.op_tok, node)
 
     def __repr__(self) -> str:
         return f'UnaryOpNode({self.op_tok}, {self.node})'
     
-class SiNode:
+class SiNode(Node):
     """Represents a si (if) statement in the AST."""
 
+    __slots__ = ('cases', 'else_case')
+
     def __init__(self, cases, else_case) -> None:
         """
         Initialize a SiNode.
@@ -207,16 +294,17 @@ class SiNode:
         """
         self.cases = cases
         self.else_case = else_case
-        self.pos_start = self.cases[0][0].pos_start
-        self.pos_end = (self.else_case or self.cases[len(self.cases) -1])[0].pos_end
+        self.set_span(self.cases[0][0], (self.else_case or self.cases[len(self.cases) -1])[0])
 
     def __repr__(self) -> str:
         return f'SiNode({self.cases}, {self.else_case})'
     
-class ParaNode:
+class ParaNode(Node):
     """Represents a para (for) statement in the AST."""
 
-    def __init__(self, var_name_tok, start_value_node, end_value_node, step_value_node, body_node, should_return_null) -> None:
+    __slots__ = ('var_name_tok', 'start_value_node', 'end_value_node', 'step_value_node', 'body_node', 'should_return_null', 'parallel')
+
+    def __init__(self, var_name_tok, start_value_node, end_value_node, step_value_node, body_node, should_return_null, parallel = False) -> None:
         """
         Initialize a ParaNode.
 
@@ -227,6 +315,7 @@ class ParaNode:
             step_value_node (Node): Node representing the step value of the variable.
             body_node (Node): Node representing the body of the for loop.
             should_return_null (bool): True if the body of the for loop returns null.
+            parallel (bool, optional): True for a 'para paralelo', whose iterations run in parallel.
         """
         self.var_name_tok = var_name_tok
         self.start_value_node = start_value_node
@@ -234,16 +323,42 @@ class ParaNode:
         self.step_value_node = step_value_node
         self.body_node = body_node
         self.should_return_null = should_return_null
+        self.parallel = parallel
 
-        self.pos_start = self.var_name_tok.pos_start
-        self.pos_end = self.body_node.pos_end
+        self.set_span(self.var_name_tok, self.body_node)
 
     def __repr__(self) -> str:
         return f'ParaNode({self.var_name_tok}, {self.start_value_node}, {self.end_value_node}, {self.step_value_node}, {self.body_node})'
 
-class MientrasNode:
+class ParaEnNode(Node):
+    """Represents a para ... en (for each) statement in the AST."""
+
+    __slots__ = ('var_name_tok', 'iterable_node', 'body_node', 'should_return_null')
+
+    def __init__(self, var_name_tok, iterable_node, body_node, should_return_null) -> None:
+        """
+        Initialize a ParaEnNode.
+
+        Args:
+            var_name_tok (Token): Token representing the name of the variable.
+            iterable_node (Node): Node representing the coso or generador to go through.
+            body_node (Node): Node representing the body of the loop.
+            should_return_null (bool): True if the body of the loop returns null.
+        """
+        self.var_name_tok = var_name_tok
+        self.iterable_node = iterable_node
+        self.body_node = body_node
+        self.should_return_null = should_return_null
+        self.set_span(self.var_name_tok, self.body_node)
+
+    def __repr__(self) -> str:
+        return f'ParaEnNode({self.var_name_tok}, {self.iterable_node}, {self.body_node})'
+
+class MientrasNode(Node):
     """Represents a mientras (while) statement in the AST."""
 
+    __slots__ = ('condition_node', 'body_node', 'should_return_null')
+
     def __init__(self, condition_node, body_node, should_return_null) -> None:
         """
         Initialize a MientrasNode.
@@ -257,16 +372,17 @@ class MientrasNode:
         self.body_node = body_node
         self.should_return_null = should_return_null
 
-        self.pos_start = self.condition_node.pos_start
-        self.pos_end = self.body_node.pos_end
+        self.set_span(self.condition_node, self.body_node)
 
     def __repr__(self) -> str:
         return f'MientrasNode({self.condition_node}, {self.body_node})'
     
-class LaburoDefNode:
+class LaburoDefNode(Node):
     """Represents a laburo (function) definition in the AST."""
 
-    def __init__(self, var_name_tok, arg_name_toks, body_node, should_auto_return, is_method=False) -> None:
+    __slots__ = ('var_name_tok', 'arg_name_toks', 'body_node', 'should_auto_return', 'is_method', 'is_generator')
+
+    def __init__(self, var_name_tok, arg_name_toks, body_node, should_auto_return, is_method=False, is_generator=False) -> None:
         """
         Initialize a LaburoDefNode.
 
@@ -276,27 +392,29 @@ class LaburoDefNode:
             body_node (Node): Node representing the body of the laburo.
             should_auto_return (bool): True if the laburo should return null.
             is_method (bool): True if the laburo is a method.
+            is_generator (bool): True if the body has a 'producir', so calling the laburo makes a generador.
         """
         self.var_name_tok = var_name_tok
         self.arg_name_toks = arg_name_toks
         self.body_node = body_node
         self.should_auto_return = should_auto_return
         self.is_method = is_method
+        self.is_generator = is_generator
 
         if self.var_name_tok:
-            self.pos_start = self.var_name_tok.pos_start
+            self.set_span(self.var_name_tok, self.body_node)
         elif len(self.arg_name_toks) > 0:
-            self.pos_start = list(self.arg_name_toks.keys())[0].pos_start
+            self.set_span(list(self.arg_name_toks.keys())[0], self.body_node)
         else:
-            self.pos_start = self.body_node.pos_start
-
-        self.pos_end = self.body_node.pos_end
+            self.set_span(self.body_node, self.body_node)
 
     def __repr__(self) -> str:
         return f'LaburoDefNode({self.var_name_tok}, {self.arg_name_toks}, {self.body_node})'
     
-class ChetoDefNode:
+class ChetoDefNode(Node):
     """Represents a cheto (class) definition in the AST."""
+
+    __slots__ = ('var_name_tok', 'methods', 'arranque_method', 'parent_class')
     
     def __init__(self, var_name_tok, methods, arranque_method, parent_class = None) -> None:
         """
@@ -312,15 +430,16 @@ class ChetoDefNode:
         self.methods = methods
         self.arranque_method = arranque_method
         self.parent_class = parent_class
-        self.pos_start = self.var_name_tok.pos_start
-        self.pos_end = self.methods[-1].pos_end if self.methods else self.var_name_tok.pos_end
+        self.set_span(self.var_name_tok, self.methods[-1] if self.methods else self.var_name_tok)
 
     def __repr__(self):
         return f'ChetoDefNode({self.var_name_tok}, {self.methods})'
     
-class MethodCallNode:
+class MethodCallNode(Node):
     """Represents a method call in the AST."""
 
+    __slots__ = ('object_tok', 'access_chain', 'method_name_tok', 'arg_nodes')
+
     def __init__(self, object_tok, access_chain, method_name_tok, arg_nodes) -> None:
         """
         Initialize a MethodCallNode.
@@ -335,15 +454,16 @@ class MethodCallNode:
         self.method_name_tok = method_name_tok
         self.arg_nodes = arg_nodes
 
-        self.pos_start = self.object_tok.pos_start
-        self.pos_end = (self.arg_nodes[-1].pos_end if self.arg_nodes else self.method_name_tok.pos_end)
+        self.set_span(self.object_tok, self.arg_nodes[-1] if self.arg_nodes else self.method_name_tok)
 
     def __repr__(self) -> str:
         return f'MethodCallNode({self.object_tok}, {self.method_name_tok}, {self.arg_nodes})'
     
-class InstanceNode:
+class InstanceNode(Node):
     """Represents an instance in the AST."""
 
+    __slots__ = ('class_name_tok', 'arg_nodes')
+
     def __init__(self, class_name_tok, arg_nodes = None) -> None:
         """
         Initialize an InstanceNode.
@@ -354,15 +474,16 @@ class InstanceNode:
         """
         self.class_name_tok = class_name_tok
         self.arg_nodes = arg_nodes
-        self.pos_start = self.class_name_tok.pos_start
-        self.pos_end = self.arg_nodes[-1].pos_end if self.arg_nodes else self.class_name_tok.pos_end
+        self.set_span(self.class_name_tok, self.arg_nodes[-1] if self.arg_nodes else self.class_name_tok)
 
     def __repr__(self) -> str:
         return f'InstanceNode({self.class_name_tok}, {self.arg_nodes})'
     
-class InstanceVarAssignNode:
+class InstanceVarAssignNode(Node):
     """Represents an instance variable assignment in the AST."""
 
+    __slots__ = ('object_tok', 'var_name_tok', 'value_node')
+
     def __init__(self, object_tok, var_name_tok, value_node) -> None:
         """
         Initialize an InstanceVarAssignNode.
@@ -375,15 +496,16 @@ class InstanceVarAssignNode:
         self.object_tok = object_tok
         self.var_name_tok = var_name_tok
         self.value_node = value_node
-        self.pos_start = self.object_tok.pos_start
-        self.pos_end = self.value_node.pos_end
+        self.set_span(self.object_tok, self.value_node)
 
     def __repr__(self) -> str:
         return f'InstanceVarAssignNode({self.object_tok}, {self.var_name_tok}, {self.value_node})'
 
-class InstanceVarAccessNode:
+class InstanceVarAccessNode(Node):
     """Represents an instance variable access in the AST."""
 
+    __slots__ = ('object_tok', 'access_chain')
+
     def __init__(self, object_tok, access_chain) -> None:
         """
         Initialize an InstanceVarAccessNode.
@@ -394,15 +516,16 @@ class InstanceVarAccessNode:
         """
         self.object_tok = object_tok
         self.access_chain = access_chain
-        self.pos_start = self.object_tok.pos_start
-        self.pos_end = self.access_chain[-1].pos_end if access_chain else self.object_tok.pos_end
+        self.set_span(self.object_tok, self.access_chain[-1] if access_chain else self.object_tok)
 
     def __repr__(self) -> str:
         return f'InstanceVarAccessNode({self.object_tok}, {self.access_chain})'
     
-class CallNode:
+class CallNode(Node):
     """Represents a call in the AST."""
 
+    __slots__ = ('node_to_call', 'arg_nodes')
+
     def __init__(self, node_to_call, arg_nodes) -> None:
         """
         Initialize a CallNode.
@@ -414,19 +537,19 @@ class CallNode:
         self.node_to_call = node_to_call
         self.arg_nodes = arg_nodes
 
-        self.pos_start = self.node_to_call.pos_start
-
         if len(self.arg_nodes) > 0:
-            self.pos_end = self.arg_nodes[-1].pos_end
+            self.set_span(self.node_to_call, self.arg_nodes[-1])
         else:
-            self.pos_end = self.node_to_call.pos_end
+            self.set_span(self.node_to_call, self.node_to_call)
 
     def __repr__(self) -> str:
         return f'CallNode({self.node_to_call}, {self.arg_nodes})'
     
-class DevolverNode:
+class DevolverNode(Node):
     """Represents a devolver (return) in the AST."""
 
+    __slots__ = ('node_to_return',)
+
     def __init__(self, node_to_return, pos_start, pos_end) -> None:
         """
         Initialize a DevolverNode.
@@ -437,15 +560,36 @@ class DevolverNode:
             pos_end (int): Position of the last character of the node.
         """
         self.node_to_return = node_to_return
-        self.pos_start = pos_start
-        self.pos_end = pos_end
+        self.set_pos(pos_start, pos_end)
 
     def __repr__(self) -> str:
         return f'DevolverNode({self.node_to_return})'
     
-class ContinuarNode:
+class ProducirNode(Node):
+    """Represents a producir (yield) statement in the AST."""
+
+    __slots__ = ('node_to_produce',)
+
+    def __init__(self, node_to_produce, pos_start, pos_end) -> None:
+        """
+        Initialize a ProducirNode.
+
+        Args:
+            node_to_produce (Node): Node representing the value to producir.
+            pos_start (Position): Start position of the statement.
+            pos_end (Position): End position of the statement.
+        """
+        self.node_to_produce = node_to_produce
+        self.set_pos(pos_start, pos_end)
+
+    def __repr__(self) -> str:
+        return f'ProducirNode({self.node_to_produce})'
+
+class ContinuarNode(Node):
     """Represents a continuar (continue) in the AST."""
 
+    __slots__ = ()
+
     def __init__(self, pos_start, pos_end):
         """
         Initialize a ContinuarNode.
@@ -454,8 +598,7 @@ class ContinuarNode:
             pos_start (int): Position of the first character of the node.
             pos_end (int): Position of the last character of the node.
         """
-        self.pos_start = pos_start
-        self.pos_end = pos_end
+        self.set_pos(pos_start, pos_end)
 
     def __repr__(self) -> str:
         return f'ContinuarNode({self.pos_start, self.pos_end})'
@@ -463,9 +606,11 @@ class ContinuarNode:
     def __str__(self) -> str:
         return f'ContinuarNode({self.pos_start, self.pos_end})'
 
-class RajarNode:
+class RajarNode(Node):
     """Represents a rajar (break) statement in the AST."""
 
+    __slots__ = ()
+
     def __init__(self, pos_start, pos_end) -> None:
         """
         Initialize a RajarNode.
@@ -474,8 +619,7 @@ class RajarNode:
             pos_start (Position): Start position of the break statement.
             pos_end (Position): End position of the break statement.
         """
-        self.pos_start = pos_start
-        self.pos_end = pos_end
+        self.set_pos(pos_start, pos_end)
 
     def __repr__(self) -> str:
         return f'RajarNode({self.pos_start, self.pos_end})'
@@ -483,9 +627,11 @@ class RajarNode:
     def __str__(self) -> str:
         return f'RajarNode({self.pos_start, self.pos_end})'
     
-class ImportarNode:
+class ImportarNode(Node):
     """Represents an import statement in the AST."""
 
+    __slots__ = ('module_node',)
+
     def __init__(self, module_node: PoneleQueAccessNode) -> None:
         """
         Initialize an ImportarNode.
@@ -494,8 +640,7 @@ class ImportarNode:
             module_name_node (ChamuyoNode): Node representing the module name.
         """
         self.module_node = module_node
-        self.pos_start = self.module_node.pos_start
-        self.pos_end = self.module_node.pos_end
+        self.set_span(self.module_node, self.module_node)
 
     def __repr__(self) -> str:
         return f'ImportarNode({self.module_node})'
@@ -503,9 +648,11 @@ class ImportarNode:
     def __str__(self) -> str:
         return f'ImportarNode({self.module_node})'
     
-class ProbaSiBardeaNode:
+class ProbaSiBardeaNode(Node):
     """ Represents a try-except code block in the AST """
 
+    __slots__ = ('try_body_node', 'except_body_node', 'bardo_name')
+
     def __init__(self, try_body_node, bardo_name, except_body_node) -> None:
         """
         Initialize a ProbaSiBardeaNode.
@@ -518,8 +665,7 @@ class ProbaSiBardeaNode:
         self.try_body_node = try_body_node
         self.except_body_node = except_body_node
         self.bardo_name = bardo_name
-        self.pos_start = self.try_body_node.pos_start
-        self.pos_end = self.except_body_node.pos_end
+        self.set_span(self.try_body_node, self.except_body_node)
 
     def __repr__(self) -> str:
         return f'ProbaSiBardeaNode({self.try_body_node}, {self.except_body_node})'
@@ -527,9 +673,11 @@ class ProbaSiBardeaNode:
     def __str__(self) -> str:
         return f'ProbaSiBardeaNode({self.try_body_node}, {self.except_body_node})'
 
-class BardeaNode:
+class BardeaNode(Node):
     """ Represents a raise code expression in the AST """
 
+    __slots__ = ('bardo_name_tok', 'bardo_msg_node')
+
     def __init__(self, bardo_name_tok, bardo_msg_node) -> None:
         """
         Initialize a BardeaNode.
@@ -540,8 +688,7 @@ class BardeaNode:
         """
         self.bardo_name_tok = bardo_name_tok
         self.bardo_msg_node = bardo_msg_node
-        self.pos_start = self.bardo_name_tok.pos_start
-        self.pos_end = self.bardo_msg_node.pos_end
+        self.set_span(self.bardo_name_tok, self.bardo_msg_node)
 
     def __repr__(self) -> str:
         return f'BardeaNode({self.bardo_name_tok}, {self.bardo_msg_node})'
@@ -0,0 +1,557 @@
+"""
+Data-parallel loops for the Lunfardo programming language.
+
+A `para paralelo` runs the iterations of its body on a pool of worker
+processes, so loops that do heavy work per element use every core:
+
+    poneleque cuadrados = para paralelo i = 0 hasta 1000 entonces
+        cuenta_pesada(i)
+    chau
+
+The loop body is sent to the workers together with the values it reads
+from the enclosing scope, and the value of every iteration (the value of
+the last statement of the body) comes back into a coso, in the order of
+the iterations. What the iterations print is written in that order too.
+
+Every iteration runs in its own process, so the body cannot change the
+variables it did not define:
+
+    - It cannot assign to variables of the enclosing scope, other than the
+      loop variable.
+    - It cannot call 'guardar', 'insertar', 'sacar', 'extender', 'cambiaso',
+      'metele_en' or 'borra_de' on cosos or mataburros of the enclosing
+      scope (neither can the laburos it calls).
+    - It cannot 'rajar' out of the loop, nor 'devolver' or 'producir' from
+      the laburo the loop is in. 'continuar' skips the element of the iteration.
+    - The values it reads must be numbers, chamuyos, booleans, nada, cosos,
+      mataburros (of those), laburos or curros. Chetos and their instances
+      cannot be sent to the workers.
+
+A body that breaks these rules is a bardo, before any iteration runs.
+
+The pool is started the first time a `para paralelo` needs it, and has one
+worker per CPU (or LUNFARDO_WORKERS). The iterations run in this process,
+one after the other and with the same rules, when the loop has less than
+two of them, when the run has a Budget or a MemoryTracker (their counts
+cannot follow other processes), or when the loop is already running in a
+worker.
+"""
+
+import io
+import multiprocessing
+import os
+import pickle
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Dict, Iterator, List, Optional, Tuple
+from .lunfardo_types import Numero, Boloodean, Nada, Chamuyo, Coso, Mataburros, Laburo, Curro
+from .rtresult import RTResult
+from .context import Context
+from .symbol_table import SymbolTable
+from .interpreter import Interpreter
+from .budget import current_budget
+from .memory import current_memory
+from .errors.errors import ParallelBardo
+from .nodes import *
+
+# The curros that change the coso or mataburros they get as first argument.
+MUTATING_CURROS = frozenset(('guardar', 'insertar', 'sacar', 'extender', 'cambiaso', 'metele_en', 'borra_de'))
+# The curros that only make sense in the main process.
+SERIAL_CURROS = frozenset(('morfar', 'renuncio'))
+
+# The pool of worker processes, started on first use.
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+
+# In a worker process: its global environment, and the loop it last ran
+# (its key, body and context), so the chunks of a loop only set it up once.
+_worker_lunfardo = None
+_worker_loop: Tuple = (None, None, None)
+
+def worker_count() -> int:
+    """
+    The number of worker processes: LUNFARDO_WORKERS, or the number of CPUs this process can use.
+    """
+    try:
+        workers = int(os.environ.get('LUNFARDO_WORKERS', 0))
+    except ValueError:
+        workers = 0
+    if not workers and hasattr(os, 'sched_getaffinity'):
+        workers = len(os.sched_getaffinity(0))
+    return workers or os.cpu_count() or 1
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Return the pool of worker processes, starting it if needed.
+
+    The workers are spawned rather than forked, because the interpreter may be
+    running on one of several threads (e.g. in the execution server).
+    """
+    global _executor, _executor_workers
+    if _executor is None:
+        _executor_workers = worker_count()
+        _executor = ProcessPoolExecutor(
+            _executor_workers,
+            mp_context = multiprocessing.get_context('spawn'),
+            initializer = init_worker,
+        )
+    return _executor
+
+def shutdown() -> None:
+    """
+    Stop the worker processes. The next `para paralelo` starts them again.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures = True)
+        _executor = None
+
+def init_worker() -> None:
+    """
+    Build the global environment of a worker process.
+    """
+    global _worker_lunfardo
+    from .lunfardo import Lunfardo
+    sys.setrecursionlimit(12025)
+    _worker_lunfardo = Lunfardo()
+
+def iteration_values(start, end, step) -> List:
+    """
+    The values the loop variable takes, as in a sequential 'para'.
+    """
+    values = []
+    i = start
+    if step >= 0:
+        while i < end:
+            values.append(i)
+            i += step
+    else:
+        while i > end:
+            values.append(i)
+            i += step
+    return values
+
+def _child_nodes(node: Node) -> Iterator[Node]:
+    """
+    The nodes directly under a node.
+    """
+    if isinstance(node, ImportarNode):
+        # The module name is not a variable.
+        return iter(())
+    return node.children()
+
+def _referenced_name(node: Node) -> Optional[str]:
+    """
+    The variable a node reads, if it reads one.
+    """
+    if isinstance(node, PoneleQueAccessNode):
+        return node.var_name_tok.value
+    if isinstance(node, (MethodCallNode, InstanceVarAccessNode, InstanceVarAssignNode)):
+        return node.object_tok.value
+    if isinstance(node, InstanceVarAccessAndAssignNode):
+        return node.instance_var_name_tok.value
+    if isinstance(node, InstanceNode):
+        return node.class_name_tok.value
+    return None
+
+def _assigned_names(node: Node) -> set:
+    """
+    The names assigned in a laburo body (its local variables), not counting nested laburos.
+    """
+    names = set()
+    for child in _child_nodes(node):
+        if isinstance(child, (PoneleQueAssignNode, AccessAndAssignNode)):
+            names.add(child.var_name_tok.value)
+        if not isinstance(child, LaburoDefNode):
+            names |= _assigned_names(child)
+    return names
+
+def _laburo_locals(node: LaburoDefNode) -> set:
+    return {tok.value for tok in node.arg_name_toks} | _assigned_names(node.body_node)
+
+class _Scope:
+    """
+    What the checks of a loop body need to know about the enclosing scope.
+    """
+
+    def __init__(self, context: Context, var_name: str) -> None:
+        self.context = context
+        self.var_name = var_name
+
+    def lookup(self, name: str):
+        """
+        The value a name has in the enclosing scope, as the interpreter would find it.
+        """
+        context = self.context
+        value = context.symbol_table.get(name)
+        if value is None:
+            value = Interpreter.find_in_parent_module(name, context.parent if not context.modules else context)
+        return value
+
+    def is_outer(self, name: str, local_names: set) -> bool:
+        return name != self.var_name and name not in local_names and self.lookup(name) is not None
+
+def _problems(node: Node, scope: _Scope, local_names: set, loops: int = 0, in_laburo: bool = False) -> Iterator[Tuple[Node, str]]:
+    """
+    The nodes of a loop body (or of a laburo it calls) that cannot run in a
+    worker process, with the reason.
+
+    Args:
+        node (Node): The node to check.
+        scope (_Scope): The enclosing scope of the loop.
+        local_names (set): The names that are local where the node runs.
+        loops (int): How many loops inside the body the node is in.
+        in_laburo (bool): True if the node is inside a laburo.
+    """
+    if isinstance(node, (PoneleQueAssignNode, AccessAndAssignNode)) and not in_laburo:
+        name = node.var_name_tok.value
+        if scope.is_outer(name, local_names):
+            yield node, f"'{name}' es de afuera del para paralelo y cada vuelta corre en otro proceso, así que no la puede cambiar. Devolvé el valor y usá el coso que arma el para"
+
+    elif isinstance(node, CallNode) and isinstance(node.node_to_call, PoneleQueAccessNode):
+        name = node.node_to_call.var_name_tok.value
+        if name in MUTATING_CURROS and node.arg_nodes and isinstance(node.arg_nodes[0], PoneleQueAccessNode):
+            target = node.arg_nodes[0].var_name_tok.value
+            if scope.is_outer(target, local_names):
+                yield node, f"'{name}' cambiaría '{target}', que es de afuera del para paralelo, y cada vuelta corre en otro proceso"
+
+    elif isinstance(node, RajarNode) and not loops and not in_laburo:
+        yield node, "'rajar' no puede cortar un para paralelo, las vueltas corren todas a la vez"
+
+    elif isinstance(node, DevolverNode) and not in_laburo:
+        yield node, "'devolver' no puede salir desde adentro de un para paralelo"
+
+    elif isinstance(node, ProducirNode) and not in_laburo:
+        yield node, "'producir' no puede salir desde adentro de un para paralelo"
+
+    if isinstance(node, LaburoDefNode):
+        local_names = local_names | _laburo_locals(node)
+        in_laburo = True
+    elif isinstance(node, (ParaNode, ParaEnNode, MientrasNode)):
+        loops += 1
+
+    for child in _child_nodes(node):
+        yield from _problems(child, scope, local_names, loops, in_laburo)
+
+def _is_data(value) -> bool:
+    """
+    True if a value can be sent to another process and back as a Python value.
+    """
+    if isinstance(value, (Numero, Chamuyo, Boloodean, Nada)):
+        return True
+    if isinstance(value, Coso):
+        return all(_is_data(element) for element in value.elements)
+    if isinstance(value, Mataburros):
+        return all(_is_data(key) and _is_data(element) for bucket in value.buckets for key, element in bucket)
+    return False
+
+def _capture(node: Node, scope: _Scope, local_names: set, captured: Dict, in_laburo: bool = False) -> Optional[ParallelBardo]:
+    """
+    Check a loop body (or the body of a laburo it calls) and collect the values
+    it reads from the enclosing scope, following the laburos it calls.
+
+    Args:
+        node (Node): The body to check.
+        scope (_Scope): The enclosing scope of the loop.
+        local_names (set): The names that are local where the body runs.
+        captured (dict): The values collected so far, by name. Filled in place.
+        in_laburo (bool): True if the body is the body of a laburo.
+
+    Returns:
+        ParallelBardo: The first problem found, or None.
+    """
+    from .lunfardo import Lunfardo
+
+    for problem_node, details in _problems(node, scope, local_names, in_laburo = in_laburo):
+        return ParallelBardo(problem_node.pos_start, problem_node.pos_end, details, scope.context)
+
+    builtins = Lunfardo.default_snapshot().symbols
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        pending.extend(_child_nodes(current))
+        name = _referenced_name(current)
+        if name is None or name in captured or not scope.is_outer(name, local_names):
+            continue
+
+        value = scope.lookup(name)
+        if builtins.get(name) is value:
+            # Every worker has the builtins already.
+            if name in SERIAL_CURROS:
+                return ParallelBardo(current.pos_start, current.pos_end, f"'{name}' no se puede usar adentro de un para paralelo", scope.context)
+            continue
+
+        error = _capture_value(name, value, current, scope, local_names, captured)
+        if error:
+            return error
+
+    return None
+
+def _capture_value(name: str, value, node, scope: _Scope, local_names: set, captured: Dict) -> Optional[ParallelBardo]:
+    """
+    Collect a value read from the enclosing scope (see `_capture`).
+
+    Args:
+        name (str): The name the value is read by.
+        value (Value): The value.
+        node (Node | Value): Where the value is read, for the bardo.
+
+    Returns:
+        ParallelBardo: The problem found, or None.
+    """
+    from .embedding import to_python
+
+    if isinstance(value, Curro) and value.func is None and getattr(Curro, value.name, None) is not None:
+        if value.name in SERIAL_CURROS:
+            return ParallelBardo(node.pos_start, node.pos_end, f"'{name}' no se puede usar adentro de un para paralelo", scope.context)
+        captured[name] = ('curro', value.name)
+
+    elif isinstance(value, Laburo) and all(default is None or _is_data(default) for default in value.arg_values or ()):
+        defaults = None if value.arg_values is None else [None if default is None else to_python(default) for default in value.arg_values]
+        captured[name] = ('laburo', value.name, value.body_node, value.arg_names, defaults, value.should_auto_return, value.is_generator)
+        laburo_locals = set(value.arg_names) | _assigned_names(value.body_node)
+        return _capture(value.body_node, scope, local_names | laburo_locals, captured, in_laburo = True)
+
+    elif _is_data(value):
+        captured[name] = ('dato', to_python(value))
+
+    else:
+        return ParallelBardo(node.pos_start, node.pos_end, f"'{name}' es un {type(value).__name__} y no se puede mandar a otro proceso", scope.context)
+
+    return None
+
+def _load_captured(captured: Dict, context: Context) -> None:
+    """
+    Define the values collected by `_capture` in the symbol table of a context.
+    """
+    from .embedding import to_lunfardo
+    for name, (kind, *data) in captured.items():
+        if kind == 'curro':
+            value = getattr(Curro, data[0])
+        elif kind == 'laburo':
+            laburo_name, body_node, arg_names, defaults, should_auto_return, is_generator = data
+            arg_values = None if defaults is None else [None if default is None else to_lunfardo(default) for default in defaults]
+            value = Laburo(laburo_name, body_node, arg_names, arg_values, should_auto_return, is_generator)
+        else:
+            value = to_lunfardo(data[0])
+        context.symbol_table.set(name, value.set_context(context))
+
+def _iteration_context(context: Context) -> Context:
+    """
+    A context like `context`, with its own scope for the names an iteration defines.
+    """
+    iteration = Context(context.display_name, context.parent, context.parent_entry_pos, context.cwd, context.file)
+    iteration.symbol_table = SymbolTable(context.symbol_table)
+    iteration.modules = context.modules
+    return iteration
+
+def run_iteration(interpreter: Interpreter, node: ParaNode, context: Context, value) -> Tuple:
+    """
+    Run the body of a 'para paralelo' for one value of its variable.
+
+    Returns:
+        tuple: The value of the iteration (None if it was skipped with
+            'continuar') and the bardo it ended with, or None.
+    """
+    iteration = _iteration_context(context)
+    iteration.symbol_table.set(node.var_name_tok.value, Numero(value))
+
+    res = RTResult()
+    result = res.register(interpreter.visit(node.body_node, iteration))
+    if res.error:
+        return None, res.error
+    if res.loop_should_continue:
+        return None, None
+    if res.should_return():
+        return None, ParallelBardo(node.pos_start, node.pos_end, "una vuelta quiso cortar el para paralelo", context)
+
+    if node.should_return_null and isinstance(result, Coso):
+        # The body is a block: the value of the iteration is its last statement.
+        result = result.elements[-1] if result.elements else Nada.nada
+    return result, None
+
+def _worker_context(captured: Dict, display_name: str, cwd: Optional[str], file: Optional[str]) -> Context:
+    """
+    A context of a worker process, with the captured values on top of its global environment.
+    """
+    context = Context(display_name, cwd = cwd, file = file)
+    context.symbol_table = SymbolTable(_worker_lunfardo.global_symbol_table)
+    context.modules = _worker_lunfardo.modules
+    _load_captured(captured, context)
+    return context
+
+def run_chunk(key: str, payload: bytes, values: List) -> List[Tuple]:
+    """
+    Run iterations of a 'para paralelo'. Called in the worker processes.
+
+    Args:
+        key (str): Identifies the loop run, so its payload is only loaded once per worker.
+        payload (bytes): The pickled ParaNode, captured values, and the name,
+            directory and file of its context.
+        values (list): The values of the loop variable to run.
+
+    Returns:
+        list: For every iteration, what it printed, its kind ('valor', 'salto'
+            or 'bardo') and its value as a Python value, or its bardo. Stops
+            at the first bardo.
+    """
+    global _worker_loop
+    loop_key, node, context = _worker_loop
+    if loop_key != key:
+        node, captured, display_name, cwd, file = pickle.loads(payload)
+        context = _worker_context(captured, display_name, cwd, file)
+        _worker_loop = (key, node, context)
+
+    from .embedding import to_python
+    interpreter = Interpreter()
+    results = []
+    for value in values:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            element, error = run_iteration(interpreter, node, context, value)
+
+        if error is None and element is not None and not _is_data(element):
+            error = ParallelBardo(node.body_node.pos_start, node.body_node.pos_end, f"la vuelta dio un {type(element).__name__}, que no se puede traer de otro proceso", context)
+
+        if error:
+            # The context of the bardo belongs to the worker; the main process sets its own.
+            error.context = None
+            results.append((output.getvalue(), 'bardo', error))
+            break
+        if element is None:
+            results.append((output.getvalue(), 'salto', None))
+        else:
+            results.append((output.getvalue(), 'valor', to_python(element)))
+
+    return results
+
+def must_run_here() -> bool:
+    """
+    True if work cannot be sent to the worker processes: when the run has a
+    Budget or a MemoryTracker, or this process is a worker itself.
+    """
+    return (
+        current_budget.get() is not None
+        or current_memory.get() is not None
+        or _worker_lunfardo is not None
+        or multiprocessing.current_process().daemon
+    )
+
+def _runs_here(iterations: int) -> bool:
+    """
+    True if the iterations of a loop should run in this process.
+    """
+    return iterations < 2 or must_run_here() or worker_count() < 2
+
+def pack_call(laburo: Laburo, args: List, context: Context) -> Optional[bytes]:
+    """
+    Prepare a call to a laburo to run in a worker process (see `run_call`).
+
+    Args:
+        laburo (Laburo): The laburo to call.
+        args (list): The values of its arguments.
+        context (Context): The context the call is made from.
+
+    Returns:
+        bytes: The payload of the call, or None if the laburo, its arguments or
+            the values it reads cannot be sent to another process.
+    """
+    from .embedding import to_python
+    if not isinstance(laburo, Laburo) or not all(_is_data(arg) for arg in args):
+        return None
+
+    captured = {}
+    if _capture_value(laburo.name, laburo, laburo, _Scope(context, None), set(), captured):
+        return None
+    return pickle.dumps((laburo.name, captured, [to_python(arg) for arg in args], context.display_name, context.get_cwd(), context.file))
+
+def run_call(payload: bytes) -> Tuple:
+    """
+    Call a laburo prepared by `pack_call`. Called in the worker processes.
+
+    Returns:
+        tuple: What the call printed, its kind ('valor' or 'bardo') and the
+            value it returned as a Python value, or its bardo.
+    """
+    from .embedding import to_lunfardo, to_python
+    name, captured, args, display_name, cwd, file = pickle.loads(payload)
+    context = _worker_context(captured, display_name, cwd, file)
+    laburo = context.symbol_table.get(name)
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        res = Interpreter().call(laburo, [to_lunfardo(arg) for arg in args], context)
+
+    error = res.error
+    if error is None and not _is_data(res.value):
+        error = ParallelBardo(laburo.body_node.pos_start, laburo.body_node.pos_end, f"'{name}' devolvió un {type(res.value).__name__}, que no se puede traer de otro proceso", context)
+    if error:
+        error.context = None
+        return output.getvalue(), 'bardo', error
+    return output.getvalue(), 'valor', to_python(res.value)
+
+def run_parallel(interpreter: Interpreter, node: ParaNode, context: Context, start, end, step) -> RTResult:
+    """
+    Evaluate a 'para paralelo'.
+
+    Args:
+        interpreter (Interpreter): The interpreter running the loop.
+        node (ParaNode): The loop.
+        context (Context): The current execution context.
+        start, end, step: The values of the range of the loop variable.
+
+    Returns:
+        RTResult: A coso with the value of every iteration (except those that
+            'continuar'), in order, or the first bardo.
+    """
+    from .embedding import to_lunfardo
+    res = RTResult()
+
+    if step == 0 and start < end:
+        return res.failure(ParallelBardo(node.pos_start, node.pos_end, "el paso no puede ser 0", context))
+
+    scope = _Scope(context, node.var_name_tok.value)
+    captured = {}
+    error = _capture(node.body_node, scope, set(), captured)
+    if error:
+        return res.failure(error)
+
+    values = iteration_values(start, end, step)
+    elements = []
+    result = Coso(elements)
+
+    if _runs_here(len(values)):
+        memory = current_memory.get()
+        for value in values:
+            element, error = run_iteration(interpreter, node, context, value)
+            if error:
+                return res.failure(error)
+            if element is not None:
+                elements.append(element)
+                if memory is not None:
+                    memory.track(result)
+
+    else:
+        executor = get_executor()
+        key = uuid.uuid4().hex
+        payload = pickle.dumps((node, captured, context.display_name, context.get_cwd(), context.file))
+        size = max(1, -(-len(values) // (_executor_workers * 4)))
+        futures = [executor.submit(run_chunk, key, payload, values[i:i + size]) for i in range(0, len(values), size)]
+
+        try:
+            for future in futures:
+                for output, kind, item in future.result():
+                    if output:
+                        sys.stdout.write(output)
+                    if kind == 'bardo':
+                        item.context = context
+                        return res.failure(item)
+                    if kind == 'valor':
+                        elements.append(to_lunfardo(item).set_context(context))
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return res.success(result.set_context(context).set_pos(node.pos_start, node.pos_end))
@@ -0,0 +1,273 @@
+"""
+Call profiler for the Lunfardo programming language.
+
+The ProfilingInterpreter times every call a program makes to a laburo, a
+curro or a method of a cheto, and keeps, for each of them, how many times it
+was called and how much wall time was spent in it: inclusive (with the calls
+it made) and exclusive (without them). Laburos and methods are told apart by
+where they are defined, so two laburos with the same name in different files
+or scopes are reported separately.
+"""
+
+import json
+from time import perf_counter
+from typing import Dict, List, Optional
+from .interpreter import Interpreter
+from .context import Context
+from .rtresult import RTResult
+from .nodes import LaburoDefNode, ChetoDefNode
+from .lunfardo_types import Laburo, Curro
+
+SORT_KEYS = ('inclusive', 'exclusive', 'calls')
+
+class ProfileEntry:
+    """
+    The statistics of one laburo, curro or method.
+    """
+
+    __slots__ = ('kind', 'name', 'fn', 'line', 'calls', 'inclusive', 'exclusive')
+
+    def __init__(self, kind: str, name: str, fn: Optional[str] = None, line: Optional[int] = None) -> None:
+        """
+        Initialize a ProfileEntry.
+
+        Args:
+            kind (str): 'laburo', 'curro' or 'metodo'.
+            name (str): The name of the callable ('Cheto.metodo' for methods).
+            fn (str, optional): The file the callable is defined in. None for curros.
+            line (int, optional): The line (one-based) the callable is defined on. None for curros.
+        """
+        self.kind = kind
+        self.name = name
+        self.fn = fn
+        self.line = line
+        self.calls = 0
+        self.inclusive = 0.0
+        self.exclusive = 0.0
+
+    @property
+    def location(self) -> str:
+        """
+        Where the callable is defined, as 'file:line'.
+        """
+        if self.fn is None:
+            return '<curro>'
+
+        return f'{self.fn}:{self.line}'
+
+    def as_dict(self) -> Dict:
+        """
+        The entry as a JSON-serializable dict, with times in seconds.
+        """
+        return {
+            'kind': self.kind,
+            'name': self.name,
+            'file': self.fn,
+            'line': self.line,
+            'calls': self.calls,
+            'inclusive': self.inclusive,
+            'exclusive': self.exclusive,
+        }
+
+    def __repr__(self) -> str:
+        return f'ProfileEntry({self.name!r}, {self.location!r}, calls={self.calls})'
+
+class Profile:
+    """
+    The call statistics of a program run, by callable.
+
+    Calls are timed on a stack: the time of a call is added to the exclusive
+    time of its callee, minus the time of the calls it made in turn. Inclusive
+    time is only added when the outermost active call of a callable returns,
+    so recursive laburos are not counted more than once.
+    """
+
+    def __init__(self) -> None:
+        self.entries: Dict[tuple, ProfileEntry] = {}
+        self.total = 0.0
+        self._stack = []
+        self._active: Dict[tuple, int] = {}
+
+    def enter(self, key: tuple) -> None:
+        """
+        Start timing a call.
+
+        Args:
+            key (tuple): The (kind, name, file, line) of the callable.
+        """
+        self._stack.append([key, perf_counter(), 0.0])
+        self._active[key] = self._active.get(key, 0) + 1
+
+    def exit(self) -> None:
+        """
+        Stop timing the innermost call.
+        """
+        key, start, children = self._stack.pop()
+        elapsed = perf_counter() - start
+
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = ProfileEntry(*key)
+
+        entry.calls += 1
+        entry.exclusive += elapsed - children
+
+        active = self._active[key] - 1
+        self._active[key] = active
+        if not active:
+            entry.inclusive += elapsed
+
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def sorted_entries(self, sort: str = 'inclusive') -> List[ProfileEntry]:
+        """
+        The entries, from the most expensive to the cheapest.
+
+        Args:
+            sort (str, optional): 'inclusive', 'exclusive' or 'calls'.
+
+        Returns:
+            list: The sorted entries.
+
+        Raises:
+            ValueError: If the sort key is not valid.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Invalid sort key '{sort}', expected one of {', '.join(SORT_KEYS)}.")
+
+        return sorted(
+            self.entries.values(),
+            key = lambda entry: (getattr(entry, sort), entry.calls),
+            reverse = True,
+        )
+
+    def report(self, sort: str = 'inclusive', limit: Optional[int] = None) -> str:
+        """
+        Render the statistics as a table.
+
+        Args:
+            sort (str, optional): The column to sort by: 'inclusive', 'exclusive' or 'calls'.
+            limit (int, optional): The maximum number of rows.
+
+        Returns:
+            str: The table, with times in milliseconds.
+        """
+        entries = self.sorted_entries(sort)[:limit]
+        header = f"{'calls':>9} {'incl ms':>11} {'excl ms':>11} {'excl/call':>11}  name (location)"
+        lines = [header, '-' * len(header)]
+        for entry in entries:
+            per_call = entry.exclusive / entry.calls if entry.calls else 0.0
+            lines.append(
+                f"{entry.calls:>9} {entry.inclusive * 1000:>11.3f} {entry.exclusive * 1000:>11.3f} "
+                f"{per_call * 1000:>11.4f}  {entry.name} ({entry.location})"
+            )
+
+        lines.append(f"Total: {self.total * 1000:.3f} ms")
+        return '\n'.join(lines)
+
+    def as_dict(self, sort: str = 'inclusive') -> Dict:
+        """
+        The statistics as a JSON-serializable dict, with times in seconds.
+        """
+        return {
+            'total': self.total,
+            'entries': [entry.as_dict() for entry in self.sorted_entries(sort)],
+        }
+
+    def save(self, path, sort: str = 'inclusive') -> None:
+        """
+        Write the statistics to a JSON file.
+
+        Args:
+            path (str): The path of the file.
+            sort (str, optional): The order of the entries.
+        """
+        with open(path, 'w', encoding = 'utf-8') as f:
+            json.dump(self.as_dict(sort), f, indent = 2, ensure_ascii = False)
+            f.write('\n')
+
+class ProfilingInterpreter(Interpreter):
+    """
+    An interpreter that records a Profile of the calls the program makes.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.profile = Profile()
+        # The keys of the laburos and methods defined so far, by body node. A
+        # laburo's own position moves to wherever it is called or read from,
+        # but its body is shared by all of its copies.
+        self._keys = {}
+        self._depth = 0
+
+    def visit(self, node, context: Context) -> RTResult:
+        """
+        Visit a node, timing the whole program when it is the root of the run.
+        """
+        if self._depth:
+            return super().visit(node, context)
+
+        self._depth += 1
+        start = perf_counter()
+        try:
+            return super().visit(node, context)
+        finally:
+            self.profile.total += perf_counter() - start
+            self._depth -= 1
+
+    def visit_LaburoDefNode(self, node: LaburoDefNode, context: Context) -> RTResult:
+        res = super().visit_LaburoDefNode(node, context)
+        if not res.error:
+            name = res.value.name
+            self._keys[node.body_node] = ('laburo', name, *self.location(node))
+
+        return res
+
+    def visit_ChetoDefNode(self, node: ChetoDefNode, context: Context) -> RTResult:
+        res = super().visit_ChetoDefNode(node, context)
+        if not res.error:
+            cheto = res.value
+            for method in cheto.methods.values():
+                # Already registered as a laburo when its definition was visited.
+                _, name, fn, line = self._keys[method.body_node]
+                self._keys[method.body_node] = ('metodo', f'{cheto.name}.{name}', fn, line)
+
+        return res
+
+    @staticmethod
+    def location(node) -> tuple:
+        """
+        The file and one-based line a node starts on.
+        """
+        pos = node.pos_start
+        return str(pos.fn), pos.ln + 1
+
+    def key(self, value) -> Optional[tuple]:
+        """
+        The profile key of a callable, or None if it is not a laburo or a curro.
+        """
+        if isinstance(value, Laburo):
+            key = self._keys.get(value.body_node)
+            if key is None:
+                # Defined by another interpreter (e.g. in an imported module).
+                kind = 'metodo' if getattr(value, 'is_method', False) else 'laburo'
+                key = self._keys[value.body_node] = (kind, value.name, *self.location(value.body_node))
+            return key
+
+        if isinstance(value, Curro):
+            return ('curro', value.name, None, None)
+
+        return None
+
+    def call(self, value, args: list, context: Context) -> RTResult:
+        key = self.key(value)
+        if key is None:
+            return super().call(value, args, context)
+
+        profile = self.profile
+        profile.enter(key)
+        try:
+            return super().call(value, args, context)
+        finally:
+            profile.exit()
@@ -4,26 +4,111 @@ Lunfardo entry point.
 import argparse
 import os
 import sys
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
 from .lunfardo import Lunfardo
+from .interpreter import Interpreter
+from .profiler import ProfilingInterpreter, SORT_KEYS
+from .sampler import Sampler
+from .instrumentation import Instrumentation, InstrumentedInterpreter
+from .budget import Budget
+from .memory import MemoryTracker
 
 def main() -> None:
     """Main entry point of the Lunfardo interpreter."""
     parser = argparse.ArgumentParser(
         description="Execute Lunfardo code from a file or start the REPL."
     )
-    parser.add_argument("file", nargs="?", help="Path to the Lunfardo file to execute.")
+    parser.add_argument("file", nargs="?", help="Path to the Lunfardo file to execute, or '-' to read it from stdin.")
+    parser.add_argument("--stream", action="store_true", help="Run each statement as soon as it is read (always on for stdin).")
+    parser.add_argument("--profile", action="store_true", help="Time every laburo, curro and method call and print a table of the results.")
+    parser.add_argument("--profile-sort", choices=SORT_KEYS, default="inclusive", help="Column to sort the profile table by (default: inclusive).")
+    parser.add_argument("--profile-json", metavar="PATH", help="Also write the profile to a JSON file (implies --profile).")
+    parser.add_argument("--sample", action="store_true", help="Sample the Lunfardo call stack while the program runs and print the busiest lines.")
+    parser.add_argument("--sample-interval", type=float, default=5, metavar="MS", help="Milliseconds between samples (default: 5).")
+    parser.add_argument("--sample-output", metavar="PATH", help="Also write the samples as collapsed stacks for flamegraph tools (implies --sample).")
+    parser.add_argument("--instrument", action="store_true", help="Count node evaluations, operators and value allocations, and print them at exit.")
+    parser.add_argument("--instrument-json", metavar="PATH", help="Also write the counters to a JSON file at exit (implies --instrument).")
+    parser.add_argument("--max-steps", type=int, metavar="N", help="Stop the program after evaluating N nodes.")
+    parser.add_argument("--max-time", type=float, metavar="SECONDS", help="Stop the program after running for SECONDS.")
+    parser.add_argument("--max-depth", type=int, metavar="N", help="Stop the program when its calls nest more than N deep.")
+    parser.add_argument("--max-memory", type=float, metavar="MIB", help="Fail with a catchable limite_de_memoria when the program's values hold more than MIB mebibytes.")
+    parser.add_argument("--memory-report", action="store_true", help="Print the current and peak memory held by each value type at exit.")
+    parser.add_argument("--memory-json", metavar="PATH", help="Also write the memory report to a JSON file at exit (implies --memory-report).")
     args = parser.parse_args()
 
+    budget = None
+    if args.max_steps is not None or args.max_time is not None or args.max_depth is not None or args.max_memory is not None:
+        if not args.file:
+            parser.error("--max-steps, --max-time, --max-depth and --max-memory need a file to run")
+        max_memory = int(args.max_memory * 1024 * 1024) if args.max_memory is not None else None
+        try:
+            budget = Budget(args.max_steps, args.max_time, args.max_depth, max_memory)
+        except ValueError as e:
+            parser.error(str(e))
+
+    memory = None
+    if args.memory_report or args.memory_json:
+        memory = budget.memory if budget is not None and budget.memory is not None else MemoryTracker()
+        memory.dump_at_exit(args.memory_json)
+
+    profiling = args.profile or args.profile_json
+    sampling = args.sample or args.sample_output
+    interpreter_cls = Interpreter
+    if args.instrument or args.instrument_json:
+        if profiling:
+            parser.error("--instrument cannot be combined with --profile")
+        instrumentation = Instrumentation()
+        instrumentation.dump_at_exit(args.instrument_json)
+        interpreter_cls = partial(InstrumentedInterpreter, instrumentation)
+
     lunfardo = Lunfardo()  # Instance of the Lunfardo class
 
-    if args.file:
-        script_path = os.path.abspath(args.file)
-        if not os.path.isfile(script_path):
-            print(f"Error: File not found: {script_path}")
-            sys.exit(1)
-        lunfardo.execute_file(script_path)
-    else:
-        lunfardo.run_repl()
+    with memory or nullcontext():
+        if args.file == "-":
+            lunfardo.execute_stream_file(sys.stdin, fn="<stdin>", interpreter_cls=interpreter_cls, budget=budget)
+        elif args.file and args.stream:
+            script_path = os.path.abspath(args.file)
+            if not os.path.isfile(script_path):
+                print(f"Error: File not found: {script_path}")
+                sys.exit(1)
+            with open(script_path, "r", encoding="utf-8") as f:
+                lunfardo.execute_stream_file(f, fn=Path(script_path), interpreter_cls=interpreter_cls, budget=budget)
+        elif args.file:
+            script_path = os.path.abspath(args.file)
+            if not os.path.isfile(script_path):
+                print(f"Error: File not found: {script_path}")
+                sys.exit(1)
+            if profiling or sampling:
+                profile_file(lunfardo, script_path, args, interpreter_cls, budget)
+            else:
+                lunfardo.execute_file(script_path, interpreter_cls=interpreter_cls, budget=budget)
+        else:
+            lunfardo.run_repl(interpreter_cls=interpreter_cls)
+
+def profile_file(lunfardo: Lunfardo, script_path: str, args: argparse.Namespace, interpreter_cls=Interpreter, budget: Budget = None) -> None:
+    """Execute a Lunfardo file with the profiler and/or the sampler, and report what they saw."""
+    profiling = args.profile or args.profile_json
+    sampler = Sampler(args.sample_interval / 1000) if args.sample or args.sample_output else None
+
+    if sampler:
+        sampler.start()
+    try:
+        interpreter = lunfardo.execute_file(script_path, interpreter_cls=ProfilingInterpreter if profiling else interpreter_cls, budget=budget)
+    finally:
+        if sampler:
+            sampler.stop()
+
+    if profiling and interpreter is not None:
+        print(interpreter.profile.report(args.profile_sort), file=sys.stderr)
+        if args.profile_json:
+            interpreter.profile.save(args.profile_json, args.profile_sort)
+
+    if sampler:
+        print(sampler.line_report(), file=sys.stderr)
+        if args.sample_output:
+            sampler.save_collapsed(args.sample_output)
 
 if __name__ == "__main__":
     main()
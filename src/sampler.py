@@ -0,0 +1,178 @@
+"""
+Sampling profiler for the Lunfardo programming language.
+
+The Sampler looks at what a running program is doing at a fixed interval,
+from a background thread, instead of timing every call like the
+ProfilingInterpreter does. Each sample is the Lunfardo call stack at that
+moment: the chain of contexts (laburos and methods) being run, each with the
+line it is at. The samples are kept as collapsed stacks, the input format of
+flamegraph tools, and as a count of hits per source line.
+
+The interpreter itself is not changed: the stack is read from the Python
+frames of the thread running it, where every `Interpreter.visit` frame holds
+the node being run and its context.
+"""
+
+import sys
+import threading
+from collections import Counter
+from typing import List, Optional
+from .interpreter import Interpreter
+
+VISIT_CODE = Interpreter.visit.__code__
+
+class Sampler:
+    """
+    Samples the Lunfardo call stack of a thread at a fixed interval.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None) -> None:
+        """
+        Initialize a Sampler.
+
+        Args:
+            interval (float, optional): Seconds between samples. Python only switches
+                threads every `sys.getswitchinterval()` seconds (5 ms by default), so
+                shorter intervals do not give more samples.
+            thread_id (int, optional): The thread to sample. Defaults to the thread
+                that calls `start`.
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.samples = 0
+        self.stacks = Counter()
+        self.lines = Counter()
+        self._sources = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "Sampler":
+        """
+        Start sampling from a background thread.
+        """
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+
+        self._stop.clear()
+        self._thread = threading.Thread(target = self._run, name = "lunfardo-sampler", daemon = True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop sampling, waiting for the background thread to finish.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "Sampler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        """
+        Take one sample of the sampled thread. Samples taken while the thread is
+        not running Lunfardo code are not counted.
+        """
+        frame = sys._current_frames().get(self.thread_id)
+        stack = self.walk(frame)
+        if not stack:
+            return
+
+        labels = []
+        for context, node in stack:
+            pos = node.pos_start
+            labels.append(f'{context.display_name} ({pos.fn}:{pos.ln + 1})')
+
+        key = (str(pos.fn), pos.ln + 1)
+        if key not in self._sources:
+            self._sources[key] = pos.source
+
+        self.samples += 1
+        self.stacks[tuple(labels)] += 1
+        self.lines[key] += 1
+
+    @staticmethod
+    def walk(frame) -> List[tuple]:
+        """
+        Read the Lunfardo call stack from the Python frames of a thread.
+
+        Args:
+            frame (frame): The innermost Python frame of the thread.
+
+        Returns:
+            list: A (context, node) pair for every context in the stack, from
+                the outermost one, with the innermost node being run in it.
+        """
+        visits = []
+        while frame is not None:
+            if frame.f_code is VISIT_CODE:
+                f_locals = frame.f_locals
+                visits.append((f_locals['context'], f_locals['node']))
+            frame = frame.f_back
+
+        stack = []
+        for context, node in reversed(visits):
+            if stack and stack[-1][0] is context:
+                stack[-1] = (context, node)
+            else:
+                stack.append((context, node))
+
+        return stack
+
+    def collapsed(self) -> str:
+        """
+        The samples as collapsed stacks ('outer;inner count', one stack per line),
+        as read by flamegraph.pl, speedscope and similar tools.
+        """
+        return ''.join(
+            f"{';'.join(labels)} {count}\n"
+            for labels, count in sorted(self.stacks.items())
+        )
+
+    def save_collapsed(self, path) -> None:
+        """
+        Write the collapsed stacks to a file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, 'w', encoding = 'utf-8') as f:
+            f.write(self.collapsed())
+
+    def line_report(self, limit: Optional[int] = 20) -> str:
+        """
+        Render the source lines that were running in the most samples.
+
+        Args:
+            limit (int, optional): The maximum number of lines to show.
+
+        Returns:
+            str: A table with the hits, share of samples, location and text of each line.
+        """
+        header = f"{'hits':>7} {'%':>6}  line"
+        lines = [header, '-' * len(header)]
+        for (fn, line), hits in self.lines.most_common(limit):
+            share = hits * 100 / self.samples
+            lines.append(f"{hits:>7} {share:>6.1f}  {fn}:{line}  {self.source_line(fn, line)}")
+
+        lines.append(f"Samples: {self.samples} (every {self.interval * 1000:g} ms)")
+        return '\n'.join(lines)
+
+    def source_line(self, fn: str, line: int) -> str:
+        """
+        The text of a sampled line, without indentation.
+        """
+        source = self._sources[(fn, line)]
+        idx = line - 1 - source.first_line
+        starts = source.line_starts
+        end = starts[idx + 1] if idx + 1 < len(starts) else len(source.text)
+        return source.text[starts[idx]:end].strip()
@@ -0,0 +1,257 @@
+"""
+Execution server for the Lunfardo programming language.
+
+A long-running HTTP server, for localhost, that runs Lunfardo code sent to
+it. The global environment (the builtins and any preloaded modules) is built
+once when the server starts, and every request runs in a fresh copy of it, so
+requests cannot see each other's definitions. Programs are parsed once: the
+AST of every program is cached by a hash of its name and source, and sending
+the same program again skips the lexer and the parser.
+
+Endpoints:
+    POST /run    A JSON object with either "source" (and optionally "name"
+                 and "cwd") or "path", the path of a script. Answers with
+                 the result record: whether it ran without a bardo, what it
+                 printed, the bardo, the seconds it took and whether the
+                 program came from the cache.
+    GET /stats   The number of requests run and the cache hits and misses.
+
+Requests are accepted concurrently, but programs run one at a time, because
+what they print is captured by replacing sys.stdout.
+
+Usage:
+    python -m src.server [--host 127.0.0.1] [--port 8765] [--cache-size 256]
+                         [--preload MODULE ...] [--max-steps N] [--max-time S]
+                         [--max-depth N] [--max-memory MIB]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Dict, Optional, Sequence, Tuple
+from .lunfardo import Lunfardo
+from .budget import Budget
+from .batch import add_limit_arguments, error_record, limits_from_args
+
+class ProgramCache:
+    """
+    The ASTs of the programs run, by a hash of their name and source, keeping
+    the most recently used ones.
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        """
+        Initialize a ProgramCache.
+
+        Args:
+            max_size (int, optional): The maximum number of programs kept.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._programs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._programs)
+
+    @staticmethod
+    def key(fn: str, text: str) -> str:
+        return hashlib.sha256(f'{fn}\0{text}'.encode('utf-8')).hexdigest()
+
+    def get(self, fn: str, text: str) -> Tuple:
+        """
+        Return the parsed program, parsing it if it is not cached.
+
+        Args:
+            fn (str): The name of the program.
+            text (str): Its source.
+
+        Returns:
+            tuple: The AST (None if the program is empty or does not parse), the
+                lexing or syntax error, and whether it came from the cache.
+        """
+        key = self.key(fn, text)
+        with self._lock:
+            program = self._programs.get(key)
+            if program is not None:
+                self._programs.move_to_end(key)
+                self.hits += 1
+                return program + (True,)
+            self.misses += 1
+
+        program = Lunfardo.parse(fn, text)
+        with self._lock:
+            self._programs[key] = program
+            while len(self._programs) > self.max_size:
+                self._programs.popitem(last = False)
+
+        return program + (False,)
+
+class LunfardoServer(ThreadingHTTPServer):
+    """
+    An HTTP server that runs Lunfardo programs on a warm global environment.
+    """
+
+    daemon_threads = True
+    # Whether to log every request to stderr.
+    verbose = False
+
+    def __init__(self, address: Tuple[str, int], preload: Sequence[str] = (), cache_size: int = 256, **limits) -> None:
+        """
+        Initialize a LunfardoServer, building its global environment.
+
+        Args:
+            address (tuple): The (host, port) to listen on. Port 0 picks a free one.
+            preload (list, optional): Builtin modules every program starts with.
+            cache_size (int, optional): The maximum number of parsed programs kept.
+            limits: The Budget arguments (max_steps, max_time, max_depth, max_memory)
+                of every program.
+
+        Raises:
+            ValueError: If the limits are not valid Budget arguments, or a module
+                cannot be preloaded.
+        """
+        Budget(**limits)
+        lunfardo = Lunfardo()
+        lunfardo.preload(*preload)
+        self.snapshot = lunfardo.snapshot()
+        self.cache = ProgramCache(cache_size)
+        self.limits = limits
+        self.requests = 0
+        self._run_lock = threading.Lock()
+        super().__init__(address, RequestHandler)
+
+    def execute(self, fn: str, text: str, cwd: Optional[str] = None) -> Dict:
+        """
+        Run a program in a fresh copy of the global environment.
+
+        Args:
+            fn (str): The name of the program.
+            text (str): Its source.
+            cwd (str, optional): The directory its imports are relative to.
+
+        Returns:
+            dict: The result record (see `src.batch.run_script`), with 'cached'.
+        """
+        start = perf_counter()
+        output = io.StringIO()
+        error = None
+        node, bardo, cached = self.cache.get(fn, text)
+        if bardo:
+            error = error_record(bardo)
+        elif node is not None:
+            with self._run_lock:
+                self.requests += 1
+                try:
+                    with redirect_stdout(output):
+                        _, bardo, _ = Lunfardo(self.snapshot).run(fn, node, cwd = cwd, budget = Budget(**self.limits) if self.limits else None)
+                    if bardo:
+                        error = error_record(bardo)
+                except SystemExit:
+                    # 'renuncio()' ends the program, not the server.
+                    pass
+                except Exception as e:
+                    error = {'name': 'interno', 'type': type(e).__name__, 'details': str(e), 'file': fn, 'line': None}
+
+        return {
+            'ok': error is None,
+            'output': output.getvalue(),
+            'error': error,
+            'elapsed': perf_counter() - start,
+            'cached': cached,
+        }
+
+    def stats(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'cached_programs': len(self.cache),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses,
+        }
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the requests of a LunfardoServer.
+    """
+
+    server: LunfardoServer
+
+    def do_GET(self) -> None:
+        if self.path == '/stats':
+            self.send_json(200, self.server.stats())
+        else:
+            self.send_json(404, {'error': f'no existe {self.path}'})
+
+    def do_POST(self) -> None:
+        if self.path != '/run':
+            self.send_json(404, {'error': f'no existe {self.path}'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if 'path' in request:
+                path = os.path.abspath(request['path'])
+                with open(path, 'r', encoding = 'utf-8') as f:
+                    text = f.read()
+                fn, cwd = path, os.path.dirname(path)
+            else:
+                text = request['source']
+                fn, cwd = request.get('name', '<pedido>'), request.get('cwd')
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self.send_json(400, {'error': f'pedido inválido: {e}'})
+            return
+        except OSError as e:
+            self.send_json(404, {'error': f'no se pudo leer el script: {e}'})
+            return
+
+        self.send_json(200, self.server.execute(fn, text, cwd))
+
+    def send_json(self, status: int, body: Dict) -> None:
+        data = json.dumps(body, ensure_ascii = False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "Serve Lunfardo program execution over HTTP on localhost.")
+    parser.add_argument("--host", default = "127.0.0.1", help = "Address to listen on (default: 127.0.0.1).")
+    parser.add_argument("--port", type = int, default = 8765, help = "Port to listen on (default: 8765).")
+    parser.add_argument("--cache-size", type = int, default = 256, metavar = "N", help = "Parsed programs to keep (default: 256).")
+    parser.add_argument("--preload", nargs = "+", default = [], metavar = "MODULE", help = "Builtin modules every program starts with.")
+    add_limit_arguments(parser, "program")
+    parser.add_argument("--verbose", action = "store_true", help = "Log every request to stderr.")
+    args = parser.parse_args()
+    limits = limits_from_args(args)
+
+    try:
+        server = LunfardoServer((args.host, args.port), args.preload, args.cache_size, **limits)
+    except ValueError as e:
+        parser.error(str(e))
+    server.verbose = args.verbose
+
+    host, port = server.server_address[:2]
+    print(f"Escuchando en http://{host}:{port}", flush = True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
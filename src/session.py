@@ -0,0 +1,300 @@
+"""
+Incremental sessions for the Lunfardo programming language.
+
+A Session keeps a document (the text typed in a REPL or open in an editor)
+split into top-level statements, each one lexed and parsed on its own. When
+the document is edited, only the statements touched by the edit are lexed and
+parsed again, and every statement runs in the same interpreter and context,
+so the names defined by one are visible to the next.
+"""
+
+import sys
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterator, List, Optional, Tuple
+from .constants import TT_NEWLINE
+from .lexer import Lexer
+from .lunfardo_parser import Parser
+from .interpreter import Interpreter
+from .context import Context
+from .errors.errors import Bardo
+
+class Segment:
+    """
+    The top-level statements of a session's document that end on the same line
+    (usually just one), with the blank lines and comments before them.
+
+    Every segment is lexed from its own text, so its Source and the offsets in
+    its tokens and nodes do not change when the text around it is edited.
+    Segments always start at the beginning of a line, so the columns of their
+    positions are the same as in the document.
+    """
+
+    __slots__ = ('text', 'source', 'nodes', 'error', 'closed', 'executed')
+
+    def __init__(self, text, source, nodes, error = None, closed = True) -> None:
+        """
+        Initialize a Segment.
+
+        Args:
+            text (str): The text of the segment, ending with the newline after its statements.
+            source (Source): The Source the segment was lexed from.
+            nodes (list): The statements of the segment, in order.
+            error (Bardo, optional): The lexing or syntax error that ends the segment, if any.
+            closed (bool, optional): Whether the text after the segment cannot change
+                how it is parsed. False for a statement that is not followed by a
+                line break, or an error that reaches the end of the text.
+        """
+        self.text = text
+        self.source = source
+        self.nodes = nodes
+        self.error = error
+        self.closed = closed
+        self.executed = False
+
+    @property
+    def incomplete(self) -> bool:
+        """
+        Whether the segment only failed because its text ended too soon
+        (e.g. a 'laburo' still waiting for its 'chau').
+        """
+        return self.error is not None and self.error.pos_start.idx >= len(self.text)
+
+    def __repr__(self) -> str:
+        return f'Segment({self.text!r})'
+
+class Session:
+    """
+    A document that is parsed incrementally and run in a persistent context.
+    """
+
+    def __init__(self, lunfardo, fn = "<stdin>", cwd = None, file_path = None, interpreter_cls = Interpreter) -> None:
+        """
+        Initialize an empty Session.
+
+        Args:
+            lunfardo (Lunfardo): The instance whose global environment the session runs in.
+            fn (str, optional): The filename or source identifier of the document.
+            cwd (str, optional): The directory that imports are relative to.
+            file_path (str, optional): The path of the document, if it is a file.
+            interpreter_cls (type, optional): The interpreter to run the statements with.
+        """
+        self.fn = fn
+        self.segments: List[Segment] = []
+        self.offsets = [0]
+
+        self.interpreter = interpreter_cls()
+        self.context = Context(fn, cwd = cwd, file = file_path)
+        self.context.symbol_table = lunfardo.global_symbol_table
+        self.context.modules = lunfardo.modules
+
+    @property
+    def text(self) -> str:
+        """
+        The full text of the document.
+        """
+        return ''.join(segment.text for segment in self.segments)
+
+    def set_text(self, text: str) -> List[Segment]:
+        """
+        Replace the whole document.
+
+        Args:
+            text (str): The new text.
+
+        Returns:
+            list: The segments of the new text.
+        """
+        return self.edit(0, self.offsets[-1], text)
+
+    def append(self, text: str) -> List[Segment]:
+        """
+        Add text at the end of the document, as typed in a REPL.
+
+        Args:
+            text (str): The text to add.
+
+        Returns:
+            list: The segments that were parsed again.
+        """
+        end = self.offsets[-1]
+        return self.edit(end, end, text)
+
+    def edit(self, start: int, end: int, text: str) -> List[Segment]:
+        """
+        Replace a range of the document, parsing again only the statements it touches.
+
+        The statements around the edited range are parsed again together with it,
+        growing the range one statement at a time while the text after it could
+        still change how it is parsed (e.g. after deleting the 'chau' of a
+        'laburo'). The rest of the segments are kept as they are, only moving
+        their line numbers.
+
+        Args:
+            start (int): Offset of the first character to replace.
+            end (int): Offset right after the last character to replace.
+            text (str): The text to put in the range.
+
+        Returns:
+            list: The segments that were parsed again.
+
+        Raises:
+            ValueError: If the range is not inside the document.
+        """
+        segments = self.segments
+        offsets = self.offsets
+        count = len(segments)
+
+        if not 0 <= start <= end <= offsets[-1]:
+            raise ValueError(f'Invalid range {start}:{end} for a document of length {offsets[-1]}.')
+
+        first = bisect_right(offsets, start) - 1
+        if first == count and count and not (segments[-1].closed or segments[-1].executed):
+            # Text added at the end could continue the last statement.
+            first -= 1
+
+        if first == count:
+            last = count
+            region = text
+            first_line = segments[-1].source.first_line + segments[-1].text.count('\n') if count else 0
+        else:
+            last = max(bisect_right(offsets, end - 1) - 1, first) if end > start else first
+            region = (
+                segments[first].text[:start - offsets[first]]
+                + text
+                + segments[last].text[end - offsets[last]:]
+            )
+            last += 1
+            first_line = segments[first].source.first_line
+
+        while True:
+            new_segments = list(self.parse_region(region, first_line))
+            if last >= count or not new_segments or new_segments[-1].closed:
+                break
+
+            region += segments[last].text
+            last += 1
+
+        old_lines = sum(segment.text.count('\n') for segment in segments[first:last])
+        new_lines = region.count('\n')
+        if new_lines != old_lines:
+            for segment in segments[last:]:
+                segment.source.first_line += new_lines - old_lines
+
+        segments[first:last] = new_segments
+        self.offsets = [0, *accumulate(len(segment.text) for segment in segments)]
+        return new_segments
+
+    def parse_region(self, text: str, first_line: int) -> Iterator[Segment]:
+        """
+        Split a text into segments, lexing and parsing one statement at a time.
+
+        Args:
+            text (str): The text, which must start at the beginning of a statement.
+            first_line (int): Line number of the first line of the text.
+
+        Yields:
+            Segment: The segments of the text. After an error, the rest of the
+                text is part of the segment with the error.
+        """
+        pos = 0
+        while pos < len(text):
+            lexer = Lexer(self.fn, "", self.lines(text, pos), first_line)
+            parser = Parser(lexer.iter_tokens())
+            statements = parser.iter_statements()
+            rest = len(text) - pos
+            nodes = []
+
+            while True:
+                res = next(statements, None)
+                error = lexer.error or (res.error if res else None)
+                tok = parser.current_tok
+
+                if error:
+                    yield Segment(text[pos:], lexer.source, nodes, error, error.pos_end.idx < rest)
+                    return
+
+                if res is None:
+                    # Only blank lines and comments are left; they can be followed by
+                    # another segment if they end with a line break.
+                    yield Segment(text[pos:], lexer.source, nodes, closed = tok.start == rest and text.endswith('\n'))
+                    return
+
+                nodes.append(res.node)
+                if tok.type != TT_NEWLINE:
+                    yield Segment(text[pos:], lexer.source, nodes, closed = False)
+                    return
+
+                # A ';' does not end the line, so the next statement is part of the segment.
+                if text[pos + tok.start] == '\n':
+                    break
+
+            segment = Segment(text[pos:pos + tok.end], lexer.source, nodes)
+            yield segment
+            pos += tok.end
+            first_line += segment.text.count('\n')
+
+    @staticmethod
+    def lines(text: str, pos: int) -> Iterator[str]:
+        """
+        Read a text line by line, from an offset.
+        """
+        find = text.find
+        while pos < len(text):
+            end = find('\n', pos) + 1 or len(text)
+            yield text[pos:end]
+            pos = end
+
+    def diagnostics(self) -> List[Bardo]:
+        """
+        The lexing and syntax errors of the document, in order.
+        """
+        return [segment.error for segment in self.segments if segment.error]
+
+    @property
+    def incomplete(self) -> bool:
+        """
+        Whether the last statement of the document is still waiting for more text.
+        """
+        return bool(self.segments) and self.segments[-1].incomplete
+
+    def run(self) -> Tuple[list, Optional[Bardo]]:
+        """
+        Run the statements that have not run yet, in order.
+
+        Returns:
+            tuple: The values of the statements that ran, and the first error
+                found. None of the statements of a segment with a syntax error
+                run.
+        """
+        sys.setrecursionlimit(12025)
+
+        values = []
+        for segment in self.segments:
+            if segment.executed:
+                continue
+
+            if segment.error:
+                return values, segment.error
+
+            segment.executed = True
+            for node in segment.nodes:
+                result = self.interpreter.visit(node, self.context)
+                if result.error:
+                    return values, result.error
+
+                values.append(result.value)
+                if result.should_return():
+                    return values, None
+
+        return values, None
+
+    def discard_pending(self) -> None:
+        """
+        Remove the text of the statements that have not run yet (e.g. after a
+        syntax error in a REPL).
+        """
+        for idx, segment in enumerate(self.segments):
+            if not segment.executed:
+                self.edit(self.offsets[idx], self.offsets[-1], "")
+                return
@@ -52,4 +52,18 @@ class SymbolTable:
         Args:
             name (str): The name of the symbol to remove.
         """
-        del self.symbols[name]
\ No newline at end of file
+        del self.symbols[name]
+
+    def copy(self) -> "SymbolTable":
+        """
+        Create a shallow copy of this symbol table.
+
+        The copy gets its own dictionary of symbols, so setting or removing names
+        in it does not affect the original. Values and the parent table are shared.
+
+        Returns:
+            SymbolTable: The copied symbol table.
+        """
+        copy = SymbolTable(self.parent)
+        copy.symbols = self.symbols.copy()
+        return copy
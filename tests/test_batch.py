@@ -0,0 +1,46 @@
+import sys
+import pytest
+from src.batch import BatchRunner, find_scripts
+
+sys.path.append(".")
+
+@pytest.fixture
+def scripts(tmp_path):
+    (tmp_path / "hola.lunf").write_text('poneleque global = 1\nmatear("hola")\n', encoding = "utf-8")
+    (tmp_path / "aislado.lunf").write_text('matear(es_num(global))\n', encoding = "utf-8")
+    (tmp_path / "indefinida.lunf").write_text('poneleque x = 1\nx + z\n', encoding = "utf-8")
+    (tmp_path / "renuncia.lunf").write_text('matear("chau")\nrenuncio()\nmatear("nunca")\n', encoding = "utf-8")
+    (tmp_path / "colgado.lunf").write_text('mientras posta entonces\n    poneleque x = 1\nchau\n', encoding = "utf-8")
+    return tmp_path
+
+def test_batch_registros_por_script(scripts):
+    with BatchRunner(processes = 2, max_steps = 10_000) as runner:
+        records = {record['script'].rsplit('/', 1)[-1]: record for record in runner.run(find_scripts([str(scripts)]))}
+
+    assert set(records) == {"hola.lunf", "aislado.lunf", "indefinida.lunf", "renuncia.lunf", "colgado.lunf"}
+
+    assert records["hola.lunf"]['ok']
+    assert records["hola.lunf"]['output'] == "hola\n"
+
+    error = records["indefinida.lunf"]['error']
+    assert not records["indefinida.lunf"]['ok']
+    assert error['name'] == "variable_indefinida"
+    assert error['line'] == 2
+
+    assert records["renuncia.lunf"]['ok']
+    assert records["renuncia.lunf"]['output'] == "chau\n"
+
+    assert records["colgado.lunf"]['error']['name'] == "presupuesto_agotado"
+
+def test_batch_aisla_los_scripts(scripts):
+    # Both scripts run in the same (single) worker, one after the other.
+    with BatchRunner(processes = 1) as runner:
+        records = list(runner.run([scripts / "hola.lunf", scripts / "aislado.lunf"], chunksize = 2))
+
+    assert len({record['worker'] for record in records}) == 1
+    aislado = next(record for record in records if record['script'].endswith("aislado.lunf"))
+    assert aislado['error']['name'] == "variable_indefinida"
+
+def test_batch_limites_invalidos():
+    with pytest.raises(ValueError):
+        BatchRunner(max_steps = 0)
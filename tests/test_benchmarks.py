@@ -0,0 +1,27 @@
+import sys
+import pytest
+from benchmarks.suite import Workload, compare, load_workloads, measure
+
+sys.path.append(".")
+
+def test_benchmarks_mide_cada_etapa(tmp_path):
+    workload = Workload("chico", "<chico>", "poneleque x = 1\nx + 2\n", str(tmp_path))
+    result = measure(workload, repeat = 1)
+    assert set(result) == {"lex", "parse", "execute", "peak_memory"}
+    assert all(value > 0 for value in result.values())
+
+def test_benchmarks_importes_encadenados(tmp_path):
+    workloads = {workload.name: workload for workload in load_workloads(str(tmp_path), import_depth = 3, source_lines = 10)}
+    assert {"fibonacci", "para", "mataburros", "cheto_metodos", "chamuyos", "importes", "fuente_grande"} <= set(workloads)
+    assert measure(workloads["importes"], repeat = 1)["execute"] > 0
+    assert measure(workloads["fuente_grande"], repeat = 1)["execute"] is None
+
+def test_benchmarks_compara_con_base():
+    baseline = {"workloads": {"a": {"lex": 0.001, "execute": 1.0, "peak_memory": 1000}}}
+    results = {"workloads": {"a": {"lex": 0.003, "execute": 1.2, "peak_memory": 1050}, "b": {"execute": 1.0}}}
+    rows = compare(results, baseline, threshold = 0.1, min_time = 0.005)
+    assert [(name, metric, regressed) for name, metric, *_, regressed in rows] == [
+        ("a", "execute", True),
+        ("a", "peak_memory", False),
+    ]
+    assert rows[0][4] == pytest.approx(0.2)
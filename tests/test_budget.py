@@ -0,0 +1,84 @@
+import sys
+import pytest
+from src.lunfardo import Lunfardo
+from src.budget import Budget, current_budget
+from src.errors import BudgetExceededBardo, MaxRecursionBardo
+
+sys.path.append(".")
+
+BUCLE_INFINITO = """mientras posta entonces
+    poneleque x = 1
+chau
+"""
+
+RECURSION_MUTUA = """laburo par(n)
+    si n == 0 entonces
+        devolver posta
+    chau
+    devolver impar(n - 1)
+chau
+laburo impar(n)
+    si n == 0 entonces
+        devolver trucho
+    chau
+    devolver par(n - 1)
+chau
+"""
+
+@pytest.fixture
+def lunfardo_instance():
+    return Lunfardo()
+
+def test_budget_limite_de_pasos(lunfardo_instance: Lunfardo):
+    budget = Budget(max_steps = 500)
+    _, error, _ = lunfardo_instance.execute("<test>", BUCLE_INFINITO, budget = budget)
+    assert isinstance(error, BudgetExceededBardo)
+    assert error.name == "presupuesto_agotado"
+    assert budget.steps == 501
+    assert current_budget.get() is None
+
+def test_budget_limite_de_tiempo(lunfardo_instance: Lunfardo):
+    _, error, _ = lunfardo_instance.execute("<test>", BUCLE_INFINITO, budget = Budget(max_time = 0.05))
+    assert isinstance(error, BudgetExceededBardo)
+    assert "segundos" in error.details
+
+def test_budget_alcanza_para_terminar(lunfardo_instance: Lunfardo):
+    result, error, _ = lunfardo_instance.execute("<test>", "poneleque x = 2\nx * 3", budget = Budget(max_steps = 100, max_time = 5))
+    assert error is None
+    assert result.elements[-1].value == 6
+
+def test_budget_profundidad_de_llamadas(lunfardo_instance: Lunfardo):
+    code = RECURSION_MUTUA + "par(100)"
+    _, error, _ = lunfardo_instance.execute("<test>", code, budget = Budget(max_depth = 20))
+    assert isinstance(error, BudgetExceededBardo)
+
+    result, error, _ = Lunfardo().execute("<test>", code, budget = Budget(max_depth = 200))
+    assert error is None
+    assert result.elements[-1].value is True
+
+def test_recursion_mutua_tiene_limite(lunfardo_instance: Lunfardo):
+    _, error, _ = lunfardo_instance.execute("<test>", RECURSION_MUTUA + "par(5000)")
+    assert isinstance(error, MaxRecursionBardo)
+
+    result, error, _ = Lunfardo().execute("<test>", RECURSION_MUTUA + "par(900)")
+    assert error is None
+
+def test_budget_no_se_puede_atrapar(lunfardo_instance: Lunfardo):
+    code = "proba:\n" + "".join("    " + line + "\n" for line in BUCLE_INFINITO.splitlines()) + "sibardea limite_de_recursion:\n    poneleque z = 1\nchau\n"
+    _, error, _ = lunfardo_instance.execute("<test>", code, budget = Budget(max_steps = 200))
+    assert isinstance(error, BudgetExceededBardo)
+
+    _, error, _ = Lunfardo().execute("<test>", "proba:\n    poneleque z = 1\nsibardea presupuesto_agotado:\n    poneleque z = 2\nchau\n")
+    assert error.name == "sintaxis_invalida"
+    assert error.pos_start.ln == 2
+
+def test_budget_compartido_con_importar(lunfardo_instance: Lunfardo, tmp_path):
+    (tmp_path / "colgado.lunf").write_text(BUCLE_INFINITO, encoding = "utf-8")
+    _, error, _ = lunfardo_instance.execute("<test>", "importar colgado", cwd = str(tmp_path), budget = Budget(max_steps = 1000))
+    assert isinstance(error, BudgetExceededBardo)
+
+def test_budget_limites_invalidos():
+    with pytest.raises(ValueError):
+        Budget(max_steps = 0)
+    with pytest.raises(ValueError):
+        Budget(max_time = -1)
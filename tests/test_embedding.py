@@ -0,0 +1,61 @@
+import sys
+import pytest
+from src.lunfardo import Lunfardo
+from src.budget import Budget
+from src.embedding import CompileError, compile, to_lunfardo, to_python
+
+sys.path.append(".")
+
+REGLA = """poneleque total = precio * cantidad
+si total > limite entonces
+    poneleque estado = "revisar"
+sino
+    poneleque estado = "ok"
+chau
+total > limite
+"""
+
+def test_embedding_compila_una_vez_y_corre_muchas():
+    regla = compile(REGLA, "regla")
+    resultados = [regla.run(globals = {"precio": precio, "cantidad": 3, "limite": 100}) for precio in (10, 50)]
+
+    assert [resultado.ok for resultado in resultados] == [True, True]
+    assert [resultado.to_python() for resultado in resultados] == [False, True]
+    assert resultados[0]["total"] == 30
+    assert resultados[1]["estado"] == "revisar"
+
+def test_embedding_corridas_aisladas():
+    programa = compile("poneleque visto = 1\nexiste\n")
+    assert programa.run(globals = {"existe": True}).to_python() is True
+    resultado = programa.run()
+    assert not resultado.ok
+    assert resultado.error.name == "variable_indefinida"
+    assert resultado.to_python() is None
+
+def test_embedding_convierte_valores():
+    valor = {"nombres": ["ana", "beto"], "edad": 3.5, "activo": False, "nada": None}
+    assert to_python(to_lunfardo(valor)) == valor
+
+    resultado = compile('longitud(agarra_de(datos, "nombres"))').run(globals = {"datos": valor})
+    assert resultado.to_python() == 2
+
+    with pytest.raises(TypeError):
+        to_lunfardo(object())
+
+def test_embedding_bardo_de_compilacion():
+    with pytest.raises(CompileError) as error:
+        compile("poneleque = 1", "roto")
+    assert error.value.error.name == "sintaxis_invalida"
+
+def test_embedding_programa_vacio_y_presupuesto():
+    assert compile("").run().to_python() is None
+
+    colgado = compile("mientras posta entonces\n    poneleque x = 1\nchau\n")
+    resultado = colgado.run(budget = Budget(max_steps = 1000))
+    assert resultado.error.name == "presupuesto_agotado"
+
+def test_embedding_con_snapshot_precargado():
+    base = Lunfardo()
+    base.execute("<base>", "laburo doble(n)\n    devolver n * 2\nchau\n")
+    programa = compile("doble(x)", snapshot = base.snapshot())
+    assert programa.run(globals = {"x": 21}).to_python() == 42
@@ -0,0 +1,59 @@
+import json
+import sys
+from functools import partial
+import pytest
+from src.lunfardo import Lunfardo
+from src.instrumentation import Instrumentation, InstrumentedInterpreter
+from src.lunfardo_types.value import Value
+
+sys.path.append(".")
+
+PROGRAMA = """laburo suma(a, b)
+    devolver a + b
+chau
+poneleque x = suma(1, 2) * 3
+x == 9 y x > 1
+"""
+
+@pytest.fixture
+def instrumentation():
+    instrumentation = Instrumentation()
+    _, error, _ = Lunfardo().execute("<test>", PROGRAMA, interpreter_cls = partial(InstrumentedInterpreter, instrumentation))
+    assert error is None
+    return instrumentation
+
+def test_instrumentacion_cuenta_nodos(instrumentation: Instrumentation):
+    nodes = instrumentation.nodes
+    assert nodes['CallNode'].count == 1
+    assert nodes['LaburoDefNode'].count == 1
+    assert nodes['BinOpNode'].count == 5
+    assert nodes['NumeroNode'].count == 5
+    for stats in nodes.values():
+        assert stats.own <= stats.cumulative + 1e-9
+
+def test_instrumentacion_cuenta_operadores(instrumentation: Instrumentation):
+    counts = {name: stats.count for name, stats in instrumentation.operators.items()}
+    assert counts == {'PLUS': 1, 'MUL': 1, 'EE': 1, 'GT': 1, 'y': 1}
+
+def test_instrumentacion_cuenta_valores(instrumentation: Instrumentation):
+    allocations = instrumentation.allocations
+    assert allocations['Laburo'] >= 1
+    assert allocations['Numero'] >= 5
+    assert allocations['Boloodean'] >= 2
+
+def test_instrumentacion_sin_costo_al_terminar(instrumentation: Instrumentation):
+    # The allocation counter is only installed during instrumented runs.
+    assert Value.__init__ is Value.__dict__['__init__']
+    assert Value.__init__.__module__ == 'src.lunfardo_types.value'
+
+    before = dict(instrumentation.allocations)
+    Lunfardo().execute("<test>", PROGRAMA)
+    assert dict(instrumentation.allocations) == before
+
+def test_instrumentacion_json(instrumentation: Instrumentation, tmp_path):
+    path = tmp_path / "contadores.json"
+    instrumentation.save(path)
+    data = json.loads(path.read_text(encoding = 'utf-8'))
+    assert data['operators']['PLUS']['count'] == 1
+    assert 'BinOpNode' in data['nodes']
+    assert 'Numero' in instrumentation.report()
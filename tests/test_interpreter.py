@@ -140,3 +140,52 @@ def test_interpreter_expresion_mataburros(lunfardo_instance: Lunfardo):
     assert result.elements[0].count == 2
     assert result.elements[0].get_value(Chamuyo("a")).value == 1
     assert result.elements[0].get_value(Chamuyo("b")).value == 2
+
+def test_interpreter_snapshot_aisla_globales():
+    base = Lunfardo()
+    base.execute("<test>", "poneleque compartido = 1")
+    snapshot = base.snapshot()
+
+    primero = Lunfardo(snapshot)
+    primero.execute("<test>", "poneleque compartido = 2")
+    segundo = Lunfardo(snapshot)
+    result, error, _ = segundo.execute("<test>", "compartido")
+    assert error is None
+    assert result.elements[0].value == 1
+
+def test_interpreter_fork_no_modifica_original(lunfardo_instance: Lunfardo):
+    fork = lunfardo_instance.fork()
+    fork.execute("<test>", "poneleque solo_en_fork = 1")
+    result, error, _ = lunfardo_instance.execute("<test>", "solo_en_fork")
+    assert result is None
+    assert error is not None
+
+def test_interpreter_snapshot_con_modulos_precargados():
+    base = Lunfardo()
+    base.preload("lacompu")
+    result, error, _ = Lunfardo(base.snapshot()).execute("<test>", "separador()")
+    assert error is None
+    assert isinstance(result.elements[0].value, str)
+
+def test_interpreter_execute_stream(lunfardo_instance: Lunfardo):
+    chunks = ["poneleque total = 0\n", "para i = 1 hasta 4 entonces\n", "  total = total + i\n", "chau\n", "total\n"]
+    result, error, _ = lunfardo_instance.execute_stream("<test>", chunks)
+    assert error is None
+    assert result.value == 6
+
+def test_interpreter_execute_stream_ejecuta_antes_del_error(lunfardo_instance: Lunfardo):
+    result, error, _ = lunfardo_instance.execute_stream("<test>", ["poneleque antes = 1\n", "$\n"])
+    assert error is not None
+    result, error, _ = lunfardo_instance.execute("<test>", "antes")
+    assert result.elements[0].value == 1
+
+def test_interpreter_mataburros_despues_de_agrandarse(lunfardo_instance: Lunfardo):
+    code = """poneleque m = {}
+para i = 0 hasta 40 entonces
+    metele_en(m, "clave" + chamu(i), i)
+chau
+agarra_de(m, "clave3") + agarra_de(m, "clave39")
+"""
+    result, error, _ = lunfardo_instance.execute("<test>", code)
+    assert error is None
+    assert result.elements[-1].value == 42
@@ -1,7 +1,10 @@
 
 import sys
+import glob
 import pytest
 from src.lexer import Lexer
+from src.legacy_lexer import LegacyLexer
+from src.errors.errors import ExpectedCharBardo
 from src.lunfardo_token import Token
 from src.constants.tokens import *
 
@@ -172,3 +175,56 @@ def test_lexer_diferente_invalido():
     tokens, error = lexer.make_tokens()
     assert error is not None
     assert error.error_name == "\n[Carácter esperado] Flaco, fijate que te olvidaste de un carácter"
+
+def _token_key(tok):
+    return (
+        tok.type, tok.value,
+        tok.pos_start.idx, tok.pos_start.ln, tok.pos_start.col,
+        tok.pos_end.idx, tok.pos_end.ln, tok.pos_end.col,
+    )
+
+@pytest.mark.parametrize("path", sorted(glob.glob("src/examples/*.lunf") + glob.glob("src/builtin/*.lunf")))
+def test_lexer_equivale_al_legacy(path):
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    tokens, error = Lexer(path, text).make_tokens()
+    legacy_tokens, legacy_error = LegacyLexer(path, text).make_tokens()
+    assert error is None and legacy_error is None
+    assert [_token_key(t) for t in tokens] == [_token_key(t) for t in legacy_tokens]
+
+def test_lexer_string_sin_cerrar():
+    tokens, error = Lexer("<test>", 'a = "hola').make_tokens()
+    assert tokens == []
+    assert isinstance(error, ExpectedCharBardo)
+
+def test_lexer_posiciones_por_offset():
+    tokens, error = Lexer("<test>", "a = 1\n  chamu(a)").make_tokens()
+    assert error is None
+    newline, chamu = tokens[3], tokens[4]
+    assert (newline.start, newline.end) == (5, 6)
+    assert (newline.pos_start.ln, newline.pos_start.col) == (0, 5)
+    assert (newline.pos_end.ln, newline.pos_end.col) == (0, 6)
+    assert (chamu.pos_start.ln, chamu.pos_start.col) == (1, 2)
+    assert chamu.pos_start.fn == "<test>"
+
+def test_lexer_iter_tokens_por_partes():
+    text = 'poneleque s = "hola\\nche" # comentario\nsi s != "" entonces\n  matear(s)\nchau\n# fin'
+    tokens, error = Lexer("<test>", text).make_tokens()
+    assert error is None
+    for size in (1, 3, 7):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        streamed = list(Lexer("<test>", "", chunks).iter_tokens())
+        assert [_token_key(t) for t in streamed] == [_token_key(t) for t in tokens]
+
+def test_lexer_iter_tokens_error():
+    lexer = Lexer("<test>", "", ["a = 1\n", "b = $\n"])
+    tokens = list(lexer.iter_tokens())
+    assert tokens[-1].type == TT_EOF
+    assert lexer.error is not None
+    assert lexer.error.pos_start.ln == 1
+
+def test_lexer_identificadores_internados():
+    tokens, error = Lexer("<test>", "poneleque " + "nombre" + " = 1\nmatear(nom" + "bre)").make_tokens()
+    names = [tok.value for tok in tokens if tok.type == TT_IDENTIFIER and tok.value == "nombre"]
+    assert len(names) == 2
+    assert names[0] is names[1]
@@ -0,0 +1,110 @@
+import io
+import sys
+import pytest
+from src.lsp import LanguageServer, read_message, write_message
+
+sys.path.append(".")
+
+ANIMAL = """cheto Animal
+    laburo saludar(mi)
+        matear("Hola")
+    chau
+chau
+"""
+
+PERRO = """cheto Perro(Animal)
+    laburo ladrar(mi)
+        mi.saludar()
+    chau
+chau
+
+laburo crear()
+    devolver nuevo Perro()
+chau
+poneleque p = crear()
+p.ladrar()
+"""
+
+@pytest.fixture
+def server():
+    server = LanguageServer(io.BytesIO())
+    server.handle({"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}})
+    for name, text in (("animal", ANIMAL), ("perro", PERRO)):
+        server.handle({
+            "jsonrpc": "2.0",
+            "method": "textDocument/didOpen",
+            "params": {"textDocument": {"uri": f"file:///tmp/{name}.lunf", "version": 1, "text": text}},
+        })
+    return server
+
+def request(server, method, line, character, uri="file:///tmp/perro.lunf"):
+    response = server.handle({
+        "jsonrpc": "2.0",
+        "id": 2,
+        "method": method,
+        "params": {
+            "textDocument": {"uri": uri},
+            "position": {"line": line, "character": character},
+            "context": {"includeDeclaration": True},
+        },
+    })
+    return [(location["uri"].rsplit("/", 1)[1], location["range"]["start"]["line"], location["range"]["start"]["character"]) for location in response["result"]]
+
+def diagnostics(server):
+    server.output.seek(0)
+    messages = []
+    while (message := read_message(server.output)) is not None:
+        messages.append(message)
+    server.output.seek(0)
+    server.output.truncate()
+    return [message["params"]["diagnostics"] for message in messages if message["method"] == "textDocument/publishDiagnostics"]
+
+def test_lsp_mensajes():
+    stream = io.BytesIO()
+    write_message(stream, {"jsonrpc": "2.0", "id": 1, "method": "shutdown"})
+    write_message(stream, {"jsonrpc": "2.0", "method": "exit"})
+    stream.seek(0)
+
+    output = io.BytesIO()
+    assert LanguageServer(output).serve(stream) == 0
+    output.seek(0)
+    assert read_message(output) == {"jsonrpc": "2.0", "id": 1, "result": None}
+
+def test_lsp_definicion_entre_archivos(server):
+    # 'Animal' in 'cheto Perro(Animal)'
+    assert request(server, "textDocument/definition", 0, 14) == [("animal.lunf", 0, 6)]
+    # 'Perro' in 'nuevo Perro()'
+    assert request(server, "textDocument/definition", 7, 21) == [("perro.lunf", 0, 6)]
+    # 'saludar' in 'mi.saludar()' is a method
+    assert request(server, "textDocument/definition", 2, 12) == [("animal.lunf", 1, 11)]
+    assert request(server, "textDocument/definition", 10, 3) == [("perro.lunf", 1, 11)]
+    # 'mi' is not a laburo or a cheto
+    assert request(server, "textDocument/definition", 2, 9) == []
+
+def test_lsp_referencias(server):
+    assert request(server, "textDocument/references", 6, 8) == [("perro.lunf", 6, 7), ("perro.lunf", 9, 14)]
+
+def test_lsp_diagnosticos_incrementales(server):
+    diagnostics(server)
+    server.handle({
+        "jsonrpc": "2.0",
+        "method": "textDocument/didChange",
+        "params": {
+            "textDocument": {"uri": "file:///tmp/perro.lunf", "version": 2},
+            "contentChanges": [{"range": {"start": {"line": 8, "character": 0}, "end": {"line": 8, "character": 4}}, "text": ""}],
+        },
+    })
+    [errors] = diagnostics(server)
+    assert len(errors) == 1
+    assert "chau" in errors[0]["message"]
+
+    server.handle({
+        "jsonrpc": "2.0",
+        "method": "textDocument/didChange",
+        "params": {
+            "textDocument": {"uri": "file:///tmp/perro.lunf", "version": 3},
+            "contentChanges": [{"range": {"start": {"line": 8, "character": 0}, "end": {"line": 8, "character": 0}}, "text": "chau"}],
+        },
+    })
+    assert diagnostics(server) == [[]]
+    assert request(server, "textDocument/references", 6, 8) == [("perro.lunf", 6, 7), ("perro.lunf", 9, 14)]
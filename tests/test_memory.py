@@ -0,0 +1,105 @@
+import gc
+import json
+import sys
+import pytest
+from src.lunfardo import Lunfardo
+from src.budget import Budget
+from src.memory import MemoryTracker, current_memory
+from src.errors import HeapLimitBardo
+
+sys.path.append(".")
+
+ACUMULA = """poneleque texto = "abcdefghij" * 100
+para i = 0 hasta 100000000 entonces
+    texto + chamu(i)
+chau
+"""
+
+@pytest.fixture
+def lunfardo_instance():
+    return Lunfardo()
+
+def test_memoria_limite_corta_para_que_acumula(lunfardo_instance: Lunfardo):
+    budget = Budget(max_memory = 2 * 1024 * 1024)
+    _, error, _ = lunfardo_instance.execute("<test>", ACUMULA, budget = budget)
+    assert isinstance(error, HeapLimitBardo)
+    assert error.name == "limite_de_memoria"
+    assert error.pos_start.ln in (1, 2)
+    assert budget.memory.peak > 2 * 1024 * 1024
+    assert budget.memory.peak_by_type['Chamuyo'] > 512 * 1024
+    assert budget.memory.peak_by_type['Coso'] > 512 * 1024
+    assert current_memory.get() is None
+
+def test_memoria_limite_se_puede_atrapar(lunfardo_instance: Lunfardo):
+    code = "proba:\n" + "".join("    " + line + "\n" for line in ACUMULA.splitlines()) + \
+        "sibardea limite_de_memoria:\n    poneleque z = \"atrapado\"\nchau\nz\n"
+    budget = Budget(max_memory = 2 * 1024 * 1024)
+    result, error, _ = lunfardo_instance.execute("<test>", code, budget = budget)
+    assert error is None
+    assert result.elements[-1].value == "atrapado"
+    # What the loop accumulated was released when the bardo unwound it.
+    assert budget.memory.current < 1024 * 1024
+
+def test_memoria_multiplicacion_gigante_no_llega_a_reservarse(lunfardo_instance: Lunfardo):
+    _, error, _ = lunfardo_instance.execute("<test>", 'poneleque x = "a" * 100000000000', budget = Budget(max_memory = 1024 * 1024))
+    assert isinstance(error, HeapLimitBardo)
+
+def test_memoria_cuenta_por_tipo_y_libera(lunfardo_instance: Lunfardo):
+    code = """cheto Caja
+    laburo arranque(yo, n)
+        yo.n = n
+    chau
+chau
+poneleque lista = []
+poneleque dic = {}
+para i = 0 hasta 200 entonces
+    guardar(lista, nuevo Caja(i))
+    metele_en(dic, chamu(i), i)
+chau
+"""
+    with MemoryTracker() as memory:
+        _, error, _ = lunfardo_instance.execute("<test>", code)
+    assert error is None
+    assert {'Coso', 'Mataburros', 'ChetoInstance', 'Chamuyo'} <= set(memory.peak_by_type)
+    assert memory.peak_by_type['ChetoInstance'] > 200 * 3 * 100
+    assert memory.current > 0
+
+def test_memoria_libera_lo_que_se_recolecta(lunfardo_instance: Lunfardo):
+    with MemoryTracker() as memory:
+        lunfardo_instance.execute("<test>", 'poneleque x = "a" * 100000')
+        assert memory.by_type['Chamuyo'] >= 100000
+        lunfardo_instance.execute("<test>", 'poneleque x = 1')
+        gc.collect()
+    assert memory.by_type['Chamuyo'] < 1000
+    assert memory.peak_by_type['Chamuyo'] >= 100000
+
+def test_memoria_copias_comparten_lo_que_guardan(lunfardo_instance: Lunfardo):
+    code = """poneleque a = []
+para i = 0 hasta 1000 entonces
+    guardar(a, i)
+chau
+poneleque b = a
+poneleque c = a
+"""
+    with MemoryTracker() as memory:
+        lunfardo_instance.execute("<test>", code)
+    # One list of 1000 elements, not three.
+    assert memory.by_type['Coso'] < 2 * 1000 * 200
+
+def test_memoria_reporte_y_json(tmp_path):
+    with MemoryTracker(limit = 10 * 1024 * 1024) as memory:
+        Lunfardo().execute("<test>", 'poneleque x = "hola" * 1000')
+    assert 'Chamuyo' in memory.report()
+    assert 'límite' in memory.report()
+
+    path = tmp_path / "memoria.json"
+    memory.save(path)
+    data = json.loads(path.read_text(encoding = 'utf-8'))
+    assert data['types']['Chamuyo']['peak'] >= 4000
+    assert data['limit'] == 10 * 1024 * 1024
+
+def test_memoria_limites_invalidos():
+    with pytest.raises(ValueError):
+        Budget(max_memory = 0)
+    with pytest.raises(ValueError):
+        MemoryTracker(limit = -1)
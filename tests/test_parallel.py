@@ -0,0 +1,94 @@
+import sys
+import pytest
+from src.lunfardo import Lunfardo
+from src.budget import Budget
+from src.errors import ParallelBardo
+from src import parallel
+
+sys.path.append(".")
+
+@pytest.fixture
+def lunfardo_instance():
+    return Lunfardo()
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setenv("LUNFARDO_WORKERS", "2")
+    yield
+    parallel.shutdown()
+
+def ultimo(resultado):
+    return resultado.elements[-1]
+
+def test_paralelo_junta_los_resultados_en_orden(lunfardo_instance: Lunfardo, pool, capsys):
+    resultado, error, _ = lunfardo_instance.execute("<test>", """laburo cuadrado(n)
+    devolver n * n
+chau
+poneleque suma = 100
+para paralelo i = 0 hasta 10 entonces
+    matear("vuelta " + chamu(i))
+    cuadrado(i) + suma
+chau
+""")
+    assert error is None
+    assert [numero.value for numero in ultimo(resultado).elements] == [i * i + 100 for i in range(10)]
+    assert capsys.readouterr().out == "".join(f"vuelta {i}\n" for i in range(10))
+
+def test_paralelo_de_una_linea_y_continuar(lunfardo_instance: Lunfardo, pool):
+    resultado, error, _ = lunfardo_instance.execute("<test>", """poneleque dobles = para paralelo i = 10 hasta 0 entre -2 entonces i * 2
+poneleque pares = para paralelo i = 0 hasta 6 entonces
+    si i == 3 entonces
+        continuar
+    chau
+    [i, "x"]
+chau
+""")
+    assert error is None
+    assert [numero.value for numero in resultado.elements[0].elements] == [20, 16, 12, 8, 4]
+    assert [[par.elements[0].value, par.elements[1].value] for par in resultado.elements[1].elements] == [[i, "x"] for i in (0, 1, 2, 4, 5)]
+
+@pytest.mark.parametrize("cuerpo, detalle", [
+    ("poneleque total = total + i", "'total' es de afuera"),
+    ("guardar(lista, i)", "'guardar' cambiaría 'lista'"),
+    ("rajar", "'rajar'"),
+    ("matear(chamu(morfar()))", "'morfar'"),
+])
+def test_paralelo_no_deja_tocar_lo_de_afuera(lunfardo_instance: Lunfardo, cuerpo, detalle):
+    _, error, _ = lunfardo_instance.execute("<test>", f"""poneleque total = 0
+poneleque lista = []
+para paralelo i = 0 hasta 4 entonces
+    {cuerpo}
+chau
+""")
+    assert isinstance(error, ParallelBardo)
+    assert error.name == "bardo_de_paralelo"
+    assert detalle in error.details
+    assert error.pos_start.ln == 3
+
+def test_paralelo_bardo_de_una_vuelta(lunfardo_instance: Lunfardo, pool):
+    _, error, _ = lunfardo_instance.execute("<test>", """para paralelo i = 0 hasta 6 entonces
+    si i == 4 entonces
+        noexiste
+    chau
+    i
+chau
+""")
+    assert error.name == "variable_indefinida"
+    assert error.pos_start.ln == 2
+    assert error.context is not None
+    assert "<test>" in error.as_string()
+
+def test_paralelo_con_presupuesto_corre_aca(lunfardo_instance: Lunfardo):
+    budget = Budget(max_steps = 200)
+    _, error, _ = lunfardo_instance.execute("<test>", """para paralelo i = 0 hasta 1000 entonces
+    i + 1
+chau
+""", budget = budget)
+    assert error.name == "presupuesto_agotado"
+
+def test_paralelo_sigue_siendo_un_nombre(lunfardo_instance: Lunfardo):
+    resultado, error, _ = lunfardo_instance.execute("<test>", """poneleque paralelo = 3
+para paralelo = 0 hasta paralelo entonces paralelo
+""")
+    assert error is None
+    assert [numero.value for numero in resultado.elements[1].elements] == [0, 1, 2]
@@ -1,5 +1,6 @@
 
 import sys
+import pickle
 import pytest
 from src.lexer import Lexer
 from src.lunfardo_parser import Parser
@@ -136,3 +137,109 @@ def test_parser_dict_expression():
     ast, eof = parser.parse()
     assert isinstance(ast.node.element_nodes[0], MataburrosNode)
     assert len(ast.node.element_nodes[0].pairs) == 2
+
+def test_parser_iter_statements():
+    lexer = Lexer("<test>", "", ["poneleque a = 1\n", "\n", "laburo f(x)\n", "  devolver x\n", "chau\n", "f(a)"])
+    parser = Parser(lexer.iter_tokens())
+    nodes = []
+    for res in parser.iter_statements():
+        assert res.error is None
+        nodes.append(res.node)
+        assert parser.tokens.buffered() <= 3
+    assert [type(node) for node in nodes] == [PoneleQueAssignNode, LaburoDefNode, CallNode]
+
+def test_parser_iter_statements_error():
+    lexer = Lexer("<test>", "poneleque a = 1\na 2\n")
+    results = list(Parser(lexer.iter_tokens()).iter_statements())
+    assert results[0].error is None
+    assert results[-1].error is not None
+
+def _parse_expr(text):
+    lexer = Lexer("<test>", text)
+    ast, eof = Parser(lexer.make_tokens()[0]).parse()
+    assert ast.error is None
+    return ast.node.element_nodes[0]
+
+def test_parser_precedencia_aritmetica():
+    node = _parse_expr("1 + 2 * 3 - 4")
+    assert node.op_tok.type == 'MINUS'
+    assert node.left_node.op_tok.type == 'PLUS'
+    assert node.left_node.right_node.op_tok.type == 'MUL'
+
+def test_parser_potencia_asocia_a_derecha():
+    node = _parse_expr("2 ^ 3 ^ 2")
+    assert isinstance(node.left_node, NumeroNode)
+    assert node.right_node.op_tok.type == 'POW'
+
+def test_parser_unario_y_potencia():
+    node = _parse_expr("-2 ^ 2 * 3")
+    assert node.op_tok.type == 'MUL'
+    assert isinstance(node.left_node, UnaryOpNode)
+    assert node.left_node.node.op_tok.type == 'POW'
+
+def test_parser_truchar_y_logicos():
+    node = _parse_expr("truchar a == b y c o d")
+    assert node.op_tok.matches('KEYWORD', 'o')
+    assert node.left_node.op_tok.matches('KEYWORD', 'y')
+    truchar = node.left_node.left_node
+    assert isinstance(truchar, UnaryOpNode)
+    assert truchar.node.op_tok.type == 'EE'
+
+def test_parser_bloque_vacio():
+    lexer = Lexer("<test>", "si posta entonces\nchau")
+    ast, eof = Parser(lexer.make_tokens()[0]).parse()
+    assert ast.error is None
+    body, is_block = ast.node.element_nodes[0].cases[0][1:]
+    assert isinstance(body, CosoNode) and body.element_nodes == []
+
+def test_parser_devolver_sin_valor():
+    lexer = Lexer("<test>", "laburo f()\n    devolver\nchau")
+    ast, eof = Parser(lexer.make_tokens()[0]).parse()
+    assert ast.error is None
+    devolver = ast.node.element_nodes[0].body_node.element_nodes[0]
+    assert isinstance(devolver, DevolverNode)
+    assert devolver.node_to_return is None
+
+def test_parser_devolver_expresion_invalida():
+    lexer = Lexer("<test>", "laburo f()\n    devolver 1 +\nchau")
+    ast, eof = Parser(lexer.make_tokens()[0]).parse()
+    assert ast.error is not None
+
+def test_parser_memoizacion():
+    tokens = Lexer("<test>", "poneleque a = (1 + 2) * 3\nsi a > 2 entonces matear(a)").make_tokens()[0]
+    ast, eof = Parser(tokens, memoize=True).parse()
+    assert ast.error is None
+    assert len(ast.node.element_nodes) == 2
+
+    parser = Parser(tokens, memoize=True)
+    node = parser.expr().node
+    end_idx = parser.tok_idx
+
+    parser.tok_idx = 0
+    parser.update_current_tok()
+    assert parser.expr().node is node
+    assert parser.tok_idx == end_idx
+
+    report = parser.memo_report()
+    assert report["rules"]["expr"] == {"hits": 1, "misses": 3}
+    assert report["hit_lines"] == [("expr", 1, 1)]
+
+def test_parser_nodos_compactos():
+    lexer = Lexer("<test>", "poneleque x = 1\nmatear(x + 2)")
+    ast, eof = Parser(lexer.make_tokens()[0]).parse()
+    call = ast.node.element_nodes[1]
+    bin_op = call.arg_nodes[0]
+
+    assert not hasattr(bin_op, "__dict__")
+    assert (bin_op.start, bin_op.end) == (23, 28)
+    assert (bin_op.pos_start.ln, bin_op.pos_start.col) == (1, 7)
+    assert (bin_op.pos_end.ln, bin_op.pos_end.col) == (1, 12)
+    assert bin_op.pos_start is bin_op.pos_start
+    assert (ast.node.pos_start.ln, ast.node.pos_start.col) == (0, 0)
+
+def test_parser_nodos_pickle():
+    lexer = Lexer("<test>", "laburo doble(n)\n    devolver n * 2\nchau\nmatear(doble(3))")
+    ast, eof = Parser(lexer.make_tokens()[0]).parse()
+    copy = pickle.loads(pickle.dumps(ast.node))
+    assert repr(copy) == repr(ast.node)
+    assert copy.element_nodes[1].pos_end.col == ast.node.element_nodes[1].pos_end.col
@@ -0,0 +1,85 @@
+import json
+import sys
+import pytest
+from src.lunfardo import Lunfardo
+from src.profiler import ProfilingInterpreter
+
+sys.path.append(".")
+
+PROGRAMA = """laburo cuadrado(n)
+    devolver n * n
+chau
+
+laburo suma_de_cuadrados(n)
+    poneleque total = 0
+    para i = 0 hasta n entonces
+        total = total + cuadrado(i)
+    chau
+    devolver total
+chau
+
+laburo fact(n)
+    si n <= 1 entonces
+        devolver 1
+    chau
+    devolver n * fact(n - 1)
+chau
+
+cheto Contador
+    laburo arranque(mi)
+        mi.cuenta = 0
+    chau
+    laburo sumar(mi)
+        mi.cuenta = mi.cuenta + 1
+    chau
+chau
+
+poneleque c = nuevo Contador()
+c.sumar()
+c.sumar()
+suma_de_cuadrados(10)
+fact(5)
+"""
+
+@pytest.fixture
+def profile():
+    _, error, interpreter = Lunfardo().execute("<test>", PROGRAMA, interpreter_cls = ProfilingInterpreter)
+    assert error is None
+    return interpreter.profile
+
+def entries(profile):
+    return {entry.name: entry for entry in profile.entries.values()}
+
+def test_profiler_cuenta_llamadas(profile):
+    por_nombre = entries(profile)
+    assert por_nombre['cuadrado'].calls == 10
+    assert por_nombre['suma_de_cuadrados'].calls == 1
+    assert por_nombre['fact'].calls == 5
+    assert por_nombre['Contador.arranque'].calls == 1
+    assert por_nombre['Contador.sumar'].calls == 2
+
+def test_profiler_posicion_de_definicion(profile):
+    por_nombre = entries(profile)
+    assert (por_nombre['cuadrado'].fn, por_nombre['cuadrado'].line) == ('<test>', 1)
+    assert por_nombre['Contador.sumar'].line == 24
+    assert por_nombre['cuadrado'].kind == 'laburo'
+    assert por_nombre['Contador.sumar'].kind == 'metodo'
+
+def test_profiler_tiempo_inclusivo_y_exclusivo(profile):
+    por_nombre = entries(profile)
+    externo, interno = por_nombre['suma_de_cuadrados'], por_nombre['cuadrado']
+    assert externo.exclusive < externo.inclusive
+    assert externo.inclusive >= interno.inclusive
+    # A recursive laburo is only counted once in its inclusive time.
+    assert por_nombre['fact'].inclusive == pytest.approx(por_nombre['fact'].exclusive)
+    assert profile.total >= externo.inclusive
+
+def test_profiler_reporte_y_json(profile, tmp_path):
+    tabla = profile.report(sort = 'calls')
+    assert tabla.splitlines()[2].split()[-2] == 'cuadrado'
+
+    path = tmp_path / "perfil.json"
+    profile.save(path)
+    data = json.loads(path.read_text(encoding = 'utf-8'))
+    assert {entry['name'] for entry in data['entries']} >= {'cuadrado', 'fact', 'Contador.sumar'}
+    assert data['entries'][0]['inclusive'] >= data['entries'][-1]['inclusive']
@@ -0,0 +1,73 @@
+import sys
+import threading
+import pytest
+from src.lunfardo import Lunfardo
+from src.interpreter import Interpreter
+from src.sampler import Sampler
+
+sys.path.append(".")
+
+PROGRAMA = """laburo hoja()
+    devolver 42
+chau
+
+laburo rama()
+    poneleque x = hoja()
+    devolver x
+chau
+
+rama()
+"""
+
+class InterpreterMuestreado(Interpreter):
+    """Takes a sample, synchronously, every time it runs the number 42."""
+
+    sampler = None
+
+    def visit_NumeroNode(self, node, context):
+        if node.tok.value == 42:
+            self.sampler.sample()
+        return super().visit_NumeroNode(node, context)
+
+@pytest.fixture
+def sampler():
+    sampler = Sampler(thread_id = threading.get_ident())
+    InterpreterMuestreado.sampler = sampler
+    return sampler
+
+def test_sampler_pila_de_contextos(sampler: Sampler):
+    _, error, _ = Lunfardo().execute("<test>", PROGRAMA, interpreter_cls = InterpreterMuestreado)
+    assert error is None
+    assert sampler.samples == 1
+    assert list(sampler.stacks) == [(
+        "<test> (<test>:10)",
+        "rama (<test>:6)",
+        "hoja (<test>:2)",
+    )]
+    assert sampler.lines == {("<test>", 2): 1}
+
+def test_sampler_salida_colapsada_y_lineas(sampler: Sampler):
+    Lunfardo().execute("<test>", PROGRAMA, interpreter_cls = InterpreterMuestreado)
+    Lunfardo().execute("<test>", PROGRAMA, interpreter_cls = InterpreterMuestreado)
+    assert sampler.collapsed() == "<test> (<test>:10);rama (<test>:6);hoja (<test>:2) 2\n"
+
+    report = sampler.line_report()
+    assert "<test>:2  devolver 42" in report
+    assert "100.0" in report
+
+def test_sampler_en_segundo_plano():
+    code = """laburo fib(n)
+    si n < 2 entonces
+        devolver n
+    chau
+    devolver fib(n - 1) + fib(n - 2)
+chau
+fib(17)
+"""
+    with Sampler(interval = 0.001) as sampler:
+        _, error, _ = Lunfardo().execute("<fib>", code)
+
+    assert error is None
+    assert sampler.samples > 0
+    assert all(fn == "<fib>" for fn, _ in sampler.lines)
+    assert all(stack[0].startswith("<fib> (<fib>:7)") for stack in sampler.stacks)
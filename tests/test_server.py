@@ -0,0 +1,60 @@
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from src.server import LunfardoServer
+
+sys.path.append(".")
+
+@pytest.fixture
+def server():
+    server = LunfardoServer(("127.0.0.1", 0), max_steps = 10_000)
+    thread = threading.Thread(target = server.serve_forever, daemon = True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def pedir(server, path, body = None):
+    host, port = server.server_address[:2]
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(f"http://{host}:{port}{path}", data = data, method = "POST" if data else "GET")
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+def test_servidor_ejecuta_y_cachea(server):
+    programa = {"source": 'poneleque x = 2\nmatear(chamu(x * 21))\n', "name": "cuenta"}
+    primero = pedir(server, "/run", programa)
+    assert primero["ok"]
+    assert primero["output"] == "42\n"
+    assert not primero["cached"]
+
+    segundo = pedir(server, "/run", programa)
+    assert segundo["output"] == "42\n"
+    assert segundo["cached"]
+
+    stats = pedir(server, "/stats")
+    assert stats["cache_hits"] == 1
+    assert stats["cache_misses"] == 1
+    assert stats["requests"] == 2
+
+def test_servidor_aisla_los_pedidos(server):
+    assert pedir(server, "/run", {"source": "poneleque global = 1\n"})["ok"]
+    respuesta = pedir(server, "/run", {"source": "global + 1\n"})
+    assert respuesta["error"]["name"] == "variable_indefinida"
+
+def test_servidor_bardos_y_limites(server, tmp_path):
+    respuesta = pedir(server, "/run", {"source": "poneleque = \n", "name": "roto"})
+    assert respuesta["error"]["name"] == "sintaxis_invalida"
+
+    script = tmp_path / "colgado.lunf"
+    script.write_text("mientras posta entonces\n    poneleque x = 1\nchau\n", encoding = "utf-8")
+    respuesta = pedir(server, "/run", {"path": str(script)})
+    assert respuesta["error"]["name"] == "presupuesto_agotado"
+    assert respuesta["error"]["file"] == str(script)
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        pedir(server, "/run", {"nada": 1})
+    assert error.value.code == 400
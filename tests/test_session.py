@@ -0,0 +1,84 @@
+import sys
+import pytest
+from src.lunfardo import Lunfardo
+from src.session import Session
+
+sys.path.append(".")
+
+PROGRAMA = """poneleque x = 1
+
+laburo doble(n)
+    devolver n * 2
+chau
+matear(doble(x))
+"""
+
+@pytest.fixture
+def session():
+    return Session(Lunfardo(), fn="<test>")
+
+def test_session_segmentos(session: Session):
+    segments = session.set_text(PROGRAMA)
+    assert [segment.text for segment in segments] == [
+        "poneleque x = 1\n",
+        "\nlaburo doble(n)\n    devolver n * 2\nchau\n",
+        "matear(doble(x))\n",
+    ]
+    assert session.text == PROGRAMA
+    assert session.diagnostics() == []
+
+def test_session_edicion_reparsea_solo_lo_tocado(session: Session):
+    session.set_text(PROGRAMA)
+    laburo, matear = session.segments[1], session.segments[2]
+
+    # 'x = 1' becomes 'x = 10', followed by two more lines.
+    changed = session.edit(15, 15, "0\n\n")
+    assert [segment.text for segment in changed] == ["poneleque x = 10\n", "\n\n"]
+    assert session.segments[2] is laburo
+    assert session.segments[3] is matear
+    assert matear.nodes[0].pos_start.ln == 7
+    assert session.text == PROGRAMA.replace("x = 1\n", "x = 10\n\n\n")
+
+def test_session_borrar_chau_junta_segmentos(session: Session):
+    session.set_text(PROGRAMA)
+    start = PROGRAMA.index("chau")
+    session.edit(start, start + 5, "")
+
+    assert len(session.segments) == 2
+    error = session.diagnostics()[0]
+    assert error.pos_start.ln == 5
+    assert session.incomplete
+
+def test_session_columnas_despues_de_punto_y_coma(session: Session):
+    session.set_text("poneleque a = 1; poneleque b = )\n")
+    error = session.diagnostics()[0]
+    assert (error.pos_start.ln, error.pos_start.col) == (0, 31)
+
+def test_session_repl_multilinea(session: Session):
+    session.append("poneleque x = 3\n")
+    assert session.run()[0][0].value == 3
+
+    session.append("laburo triple(n)\n")
+    assert session.incomplete
+    session.append("    devolver n * x\n")
+    assert session.incomplete
+    session.append("chau\n")
+    assert not session.incomplete
+    session.run()
+
+    session.append("triple(2)\n")
+    values, error = session.run()
+    assert error is None
+    assert [value.value for value in values] == [6]
+
+def test_session_descarta_error_de_sintaxis(session: Session):
+    session.append("poneleque x = 3\n")
+    session.run()
+    session.append("x = )\n")
+    values, error = session.run()
+    assert values == [] and error is not None
+
+    session.discard_pending()
+    assert session.text == "poneleque x = 3\n"
+    session.append("x + 1\n")
+    assert session.run()[0][0].value == 4
@@ -0,0 +1,71 @@
+import sys
+import pytest
+from src.lunfardo import Lunfardo
+from src.budget import Budget
+from src import parallel
+
+sys.path.append(".")
+
+CUENTA = """importar tareas
+
+laburo cuenta(n)
+    poneleque total = 0
+    para j = 0 hasta n entonces
+        poneleque total = total + j
+    chau
+    matear("listo " + chamu(n))
+    devolver total
+chau
+
+"""
+
+@pytest.fixture
+def lunfardo_instance():
+    return Lunfardo()
+
+@pytest.fixture(params = ["1", "2"], ids = ["hilos", "procesos"])
+def workers(request, monkeypatch):
+    monkeypatch.setenv("LUNFARDO_WORKERS", request.param)
+    yield
+    parallel.shutdown()
+
+def test_tareas_lanzar_y_esperar_todos(lunfardo_instance: Lunfardo, workers, tmp_path, capsys):
+    resultado, error, _ = lunfardo_instance.execute("<test>", CUENTA + """poneleque tareas_ = [lanzar(cuenta, [10]), lanzar(cuenta, [100]), lanzar(longitud, ["hola"])]
+esperar_todos(tareas_)
+""", cwd = str(tmp_path))
+    assert error is None
+    assert [numero.value for numero in resultado.elements[-1].elements] == [45, 4950, 4]
+    assert sorted(capsys.readouterr().out.splitlines()) == ["listo 10", "listo 100"]
+
+def test_tareas_esperar_devuelve_el_bardo(lunfardo_instance: Lunfardo, workers, tmp_path):
+    _, error, _ = lunfardo_instance.execute("<test>", CUENTA + """laburo rompe(n)
+    devolver n + noexiste
+chau
+
+poneleque tarea = lanzar(rompe, [1])
+esperar(tarea)
+""", cwd = str(tmp_path))
+    assert error.name == "variable_indefinida"
+    assert error.context is not None
+    assert "noexiste" in error.details
+
+def test_tareas_esperar_dos_veces_y_termino(lunfardo_instance: Lunfardo, tmp_path):
+    resultado, error, _ = lunfardo_instance.execute("<test>", CUENTA + """poneleque tarea = lanzar(cuenta, [5])
+esperar(tarea) + esperar(tarea)
+termino(tarea)
+""", cwd = str(tmp_path))
+    assert error is None
+    assert resultado.elements[-2].value == 20
+    assert resultado.elements[-1].value is True
+
+def test_tareas_con_presupuesto_corren_en_el_momento(lunfardo_instance: Lunfardo, tmp_path):
+    resultado, error, _ = lunfardo_instance.execute("<test>", CUENTA + """termino(lanzar(cuenta, [3]))
+""", cwd = str(tmp_path), budget = Budget(max_steps = 100_000))
+    assert error is None
+    assert resultado.elements[-1].value is True
+
+def test_tareas_tipos_invalidos(lunfardo_instance: Lunfardo, tmp_path):
+    _, error, _ = lunfardo_instance.execute("<test>", "importar tareas\n\nlanzar(3)\n", cwd = str(tmp_path))
+    assert error.name == "bardo_de_tipo"
+    _, error, _ = lunfardo_instance.execute("<test>", "importar tareas\n\nesperar(3)\n", cwd = str(tmp_path))
+    assert error.name == "bardo_de_tipo"